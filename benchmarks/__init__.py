@@ -0,0 +1,10 @@
+"""Benchmarks of pyhocon
+
+The suite times parsing, includes, substitution resolution, lookups, merges and conversions of generated configs and
+can save the results as JSON to compare two commits:
+
+    python -m benchmarks -o before.json
+    python -m benchmarks --compare before.json
+
+Each bench_ module can also be run on its own, e.g.: python -m benchmarks.bench_merge
+"""
@@ -0,0 +1,35 @@
+"""Benchmark of the HOCONConverter output formats on a large synthetic config"""
+from pyhocon import ConfigTree, HOCONConverter
+
+from benchmarks.common import bench
+
+
+def large_config(width=200, depth=4, leaves=20):
+    """Config of width subtrees nested depth levels deep with strings needing escapes, numbers, lists and periods"""
+    from datetime import timedelta
+
+    config = ConfigTree(root=True)
+    for index in range(width):
+        node = config
+        for level in range(depth):
+            child = ConfigTree()
+            node['level{level}'.format(level=level) if level else 'node{index}'.format(index=index)] = child
+            node = child
+            for leaf in range(leaves):
+                node['str{leaf}'.format(leaf=leaf)] = u'value {leaf}'.format(leaf=leaf)
+                node['int{leaf}'.format(leaf=leaf)] = leaf
+            node['escaped'] = u'quote " tab \t a=b\nsecond line'
+            node['list'] = [1.5, True, None, u'item', [1, 2]]
+            node['period'] = timedelta(milliseconds=index)
+    return config
+
+
+def main():
+    config = large_config()
+    for output_format in ['json', 'hocon', 'yaml', 'properties']:
+        bench('to_{format} (~35000 values)'.format(format=output_format),
+              lambda: getattr(HOCONConverter, 'to_' + output_format)(config))
+
+
+if __name__ == '__main__':
+    main()
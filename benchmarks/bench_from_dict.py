@@ -0,0 +1,21 @@
+"""Benchmark of ConfigFactory.from_dict with and without literal_keys"""
+from pyhocon import ConfigFactory
+
+from benchmarks.common import bench
+
+
+def large_dict(width=5000, leaves=100):
+    return dict(('node{index}'.format(index=index), dict(('key{leaf}'.format(leaf=leaf), leaf) for leaf in range(leaves)))
+                for index in range(width))
+
+
+def main():
+    dictionary = large_dict()
+    assert ConfigFactory.from_dict(dictionary, literal_keys=True) == ConfigFactory.from_dict(dictionary)
+    bench('from_dict (500000 keys)', lambda: ConfigFactory.from_dict(dictionary), repeat=1)
+    bench('from_dict root (500000 keys)', lambda: ConfigFactory.from_dict(dictionary, root=True), repeat=1)
+    bench('from_dict literal_keys (500000 keys)', lambda: ConfigFactory.from_dict(dictionary, literal_keys=True))
+
+
+if __name__ == '__main__':
+    main()
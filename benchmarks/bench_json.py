@@ -0,0 +1,27 @@
+"""Benchmark of HOCONConverter.to_json against the json module based to_json_fast"""
+from pyhocon import ConfigTree, HOCONConverter
+
+from benchmarks.common import bench
+
+
+def large_config(width=500, leaves=100):
+    config = ConfigTree(root=True)
+    for index in range(width):
+        node = ConfigTree()
+        for leaf in range(leaves):
+            node['int{leaf}'.format(leaf=leaf)] = leaf
+            node['str{leaf}'.format(leaf=leaf)] = u'value "{leaf}" é'.format(leaf=leaf)
+        node['list'] = [1.5, True, None, u'item']
+        config['node{index}'.format(index=index)] = node
+    return config
+
+
+def main():
+    config = large_config()
+    assert HOCONConverter.to_json_fast(config) == HOCONConverter.to_json(config)
+    bench('to_json (100000 values)', lambda: HOCONConverter.to_json(config))
+    bench('to_json_fast (100000 values)', lambda: HOCONConverter.to_json_fast(config))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark of ConfigTree.merge_configs on wide, deep and many-fragment configs"""
+from pyhocon import ConfigTree
+
+from benchmarks.common import bench
+
+
+def wide_config(width, prefix='key'):
+    config = ConfigTree(root=True)
+    for index in range(width):
+        config['{prefix}{index}'.format(prefix=prefix, index=index)] = ConfigTree([('value', index)])
+    return config
+
+
+def deep_config(depth):
+    config = root = ConfigTree(root=True)
+    for _ in range(depth):
+        child = ConfigTree()
+        config['k'] = child
+        config = child
+    config['value'] = depth
+    return root
+
+
+def fragments(count, width=10):
+    result = []
+    for index in range(count):
+        fragment = ConfigTree(root=True)
+        for key in range(width):
+            fragment['key{key}'.format(key=key)] = index
+        result.append(fragment)
+    return result
+
+
+def main():
+    state = {}
+
+    def setup_wide():
+        state['a'] = wide_config(50000)
+        state['b'] = wide_config(1000)
+
+    bench('merge wide (50000 keys <- 1000 keys)', lambda: ConfigTree.merge_configs(state['a'], state['b']), setup_wide)
+    bench('merge wide, copy_trees', lambda: ConfigTree.merge_configs(state['a'], state['b'], copy_trees=True),
+          setup_wide)
+
+    def setup_deep():
+        state['a'] = deep_config(5000)
+        state['b'] = deep_config(5000)
+
+    bench('merge deep (5000 levels)', lambda: ConfigTree.merge_configs(state['a'], state['b']), setup_deep)
+
+    def setup_fragments():
+        state['a'] = ConfigTree(root=True)
+        state['fragments'] = fragments(5000)
+
+    def merge_fragments(history):
+        for fragment in state['fragments']:
+            ConfigTree.merge_configs(state['a'], fragment, history=history)
+
+    bench('merge 5000 fragments', lambda: merge_fragments(True), setup_fragments)
+    bench('merge 5000 fragments, no history', lambda: merge_fragments(False), setup_fragments)
+
+
+if __name__ == '__main__':
+    main()
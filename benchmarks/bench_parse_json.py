@@ -0,0 +1,16 @@
+"""Benchmark of parsing a JSON document with the HOCON grammar against ConfigFactory.parse_json"""
+from pyhocon import ConfigFactory, HOCONConverter
+
+from benchmarks.bench_json import large_config
+from benchmarks.common import bench
+
+
+def main():
+    content = HOCONConverter.to_json(large_config(width=50))
+    assert ConfigFactory.parse_json(content) == ConfigFactory.parse_string(content)
+    bench('parse_string (10000 values)', lambda: ConfigFactory.parse_string(content), repeat=1)
+    bench('parse_json (10000 values)', lambda: ConfigFactory.parse_json(content))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark of the period matcher (a regex with a unit lookup) against the previous pyparsing Or over all the units"""
+import itertools
+
+from pyparsing import Combine, Literal, Or, Word, WordEnd, ZeroOrMore, alphanums, nums
+
+from pyhocon import ConfigFactory
+from pyhocon.period_parser import get_period_expr, parse_period, period, period_type_map
+
+from benchmarks.common import bench
+
+VALUES = ['10 seconds', '5ms', '3 weeks', '250 millis', '12 h', '1024', '3.5', 'true', 'value', '7 mo']
+
+
+def or_period_expr():
+    # matcher used before the regex: the longest unit of an Or, looked up in period_type_map
+    def convert_period(tokens):
+        unit = next(unit for unit, aliases in period_type_map.items() if tokens.unit in aliases)
+        return period(int(tokens.value), unit)
+
+    units = Or(list(itertools.chain(*period_type_map.values())))
+    expr = Word(nums)('value') + ZeroOrMore(Literal(' ')).suppress() + units('unit') + WordEnd(alphanums).suppress()
+    return Combine(expr).setParseAction(convert_period)
+
+
+def dense_config(entries=2000):
+    return '\n'.join('key{index} = {value}'.format(index=index, value=VALUES[index % len(VALUES)])
+                     for index in range(entries))
+
+
+def match_all(expr, values):
+    for value in values:
+        try:
+            expr.parseString(value)
+        except Exception:
+            pass
+
+
+def main():
+    values = VALUES * 100
+    regex_expr, or_expr = get_period_expr(), or_period_expr()
+    for value in VALUES[:5]:
+        assert regex_expr.parseString(value)[0] == or_expr.parseString(value)[0] == parse_period(value)
+    bench('Or matcher (1000 values)', lambda: match_all(or_expr, values))
+    bench('regex matcher (1000 values)', lambda: match_all(regex_expr, values))
+    bench('parse_period (1000 periods)', lambda: [parse_period(value) for value in VALUES[:5] * 200])
+
+    content = dense_config()
+    bench('parse_string (2000 numbers and durations)', lambda: ConfigFactory.parse_string(content))
+
+
+if __name__ == '__main__':
+    main()
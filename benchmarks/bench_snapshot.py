@@ -0,0 +1,32 @@
+"""Benchmark of loading a config from HOCON text against loading it from a snapshot"""
+import os
+import tempfile
+
+from pyhocon import ConfigFactory, HOCONConverter
+
+from benchmarks.bench_json import large_config
+from benchmarks.common import bench
+
+
+def main():
+    config = large_config(width=100)
+    directory = tempfile.mkdtemp()
+    hocon_file = os.path.join(directory, 'config.conf')
+    snapshot_file = os.path.join(directory, 'config.snapshot')
+    try:
+        with open(hocon_file, 'w') as fd:
+            fd.write(HOCONConverter.to_hocon(config))
+        HOCONConverter.to_snapshot(config, snapshot_file)
+
+        bench('parse_file + get (20000 values)', lambda: ConfigFactory.parse_file(hocon_file).get('node50.int50'),
+              repeat=1)
+        bench('load_snapshot + get (20000 values)', lambda: ConfigFactory.load_snapshot(snapshot_file).get('node50.int50'))
+        bench('load_snapshot + materialize (20000 values)', lambda: ConfigFactory.load_snapshot(snapshot_file).materialize())
+    finally:
+        os.remove(hocon_file)
+        os.remove(snapshot_file)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""Benchmark of the time to import pyhocon and start the tool (in a new interpreter) and of parsing small configs"""
+import subprocess
+import sys
+
+from pyhocon import ConfigFactory
+
+from benchmarks.common import bench
+
+SMALL_CONFIG = 'a { b = 1, c = [1, 2], d = ${a.b} }'
+
+
+def run(code):
+    subprocess.check_call([sys.executable, '-c', code], stdout=subprocess.PIPE)
+
+
+def main():
+    bench('python (baseline)', lambda: run('pass'), repeat=10)
+    bench('import pyhocon', lambda: run('import pyhocon'), repeat=10)
+    bench('import pyhocon and parse a small config', lambda: run(
+        'from pyhocon import ConfigFactory; ConfigFactory.parse_string("a = 1")'), repeat=10)
+    bench('pyhocon --help', lambda: run('import sys; sys.argv[1:] = ["--help"]; from pyhocon.tool import main; main()'),
+          repeat=10)
+    bench('parse_string (small config)', lambda: ConfigFactory.parse_string(SMALL_CONFIG), number=100)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+import timeit
+
+
+def measure(func, setup=None, number=1, repeat=5):
+    """Time func and return the time in seconds of a single call for each repetition
+
+    :param func: callable to time
+    :param setup: callable run before each repetition (not timed)
+    :param number: number of calls per repetition
+    :param repeat: number of repetitions
+    :return: time of a single call for each repetition
+    :type return: list
+    """
+    timer = timeit.Timer(func, setup or (lambda: None))
+    return [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+
+
+def bench(name, func, setup=None, number=1, repeat=5):
+    """Time func and print the best time of a single call
+
+    :param name: name of the benchmark
+    :param func: callable to time
+    :param setup: callable run before each repetition (not timed)
+    :param number: number of calls per repetition
+    :param repeat: number of repetitions
+    :return: best time in seconds of a single call
+    """
+    best = min(measure(func, setup, number, repeat))
+    print('{name:<50} {time:12.3f} ms'.format(name=name, time=best * 1000))
+    return best
@@ -0,0 +1,92 @@
+"""Synthetic HOCON configs for the benchmarks
+
+Each generator returns the HOCON source of a config whose size is set by its arguments (includes() writes files).
+"""
+import os
+
+# scalar values cycled through by the generators, one of each kind the parser handles
+VALUES = ['42', '3.14', 'true', 'null', '"quoted string"', 'unquoted string', '10 seconds', '250 ms']
+
+
+def deep_nesting(depth=30, leaves=5):
+    """Objects nested depth levels deep with a few values at each level (the grammar recurses up to ~50 levels)"""
+    lines = []
+    for level in range(depth):
+        indent = '  ' * level
+        lines.append(indent + 'level{level} {{'.format(level=level))
+        for leaf in range(leaves):
+            lines.append(indent + '  value{leaf} = {value}'.format(leaf=leaf, value=VALUES[leaf % len(VALUES)]))
+    lines.extend('  ' * level + '}' for level in reversed(range(depth)))
+    return '\n'.join(lines)
+
+
+def wide_object(width=1000):
+    """One object with width keys of all kinds of values"""
+    return '\n'.join('key{index} = {value}'.format(index=index, value=VALUES[index % len(VALUES)])
+                     for index in range(width))
+
+
+def large_list(length=2000, per_line=10):
+    """A list of length values written per_line values per line"""
+    lines = ['items = [']
+    for start in range(0, length, per_line):
+        lines.append('  ' + ', '.join(VALUES[index % len(VALUES)] for index in range(start, min(start + per_line, length))))
+    lines.append(']')
+    return '\n'.join(lines)
+
+
+def dense_substitutions(count=500, bases=50):
+    """Values referring to other values: plain references, string concatenations, chains and object merges"""
+    lines = ['template { enabled = true, retries = 3 }']
+    lines.extend('base{index} = {index}'.format(index=index) for index in range(bases))
+    lines.append('chain0 = ${base0}')
+    chain = 0
+    for index in range(count):
+        base = index % bases
+        kind = index % 4
+        if kind == 0:
+            lines.append('ref{index} = ${{base{base}}}'.format(index=index, base=base))
+        elif kind == 1:
+            lines.append('concat{index} = "prefix-"${{base{base}}}"-suffix"'.format(index=index, base=base))
+        elif kind == 2:
+            chain += 1
+            lines.append('chain{chain} = ${{chain{previous}}}'.format(chain=chain, previous=chain - 1))
+        else:
+            lines.append('object{index} = ${{template}} {{ id = {index} }}'.format(index=index))
+    return '\n'.join(lines)
+
+
+def append_chain(length=200):
+    """A list and a string extended by length += and self-referential assignments"""
+    lines = ['items = []', 'path = "/usr/bin"']
+    for index in range(length):
+        lines.append('items += [{index}]'.format(index=index))
+        lines.append('path = ${{path}}":/opt/tool{index}/bin"'.format(index=index))
+    return '\n'.join(lines)
+
+
+def multiline_strings(count=200, lines=50):
+    """count multiline strings of lines lines each"""
+    text = '\n'.join('line {line} of a "long" text with some = signs, # and // in it'.format(line=line)
+                     for line in range(lines))
+    return '\n'.join('text{index} = """{text}"""'.format(index=index, text=text) for index in range(count))
+
+
+def includes(directory, count=50, width=20):
+    """Write a main file including count files (one object each, referring to a value of the main file)
+
+    :return: path of the main file
+    """
+    main_lines = ['shared = "shared value"']
+    for index in range(count):
+        name = 'part{index}.conf'.format(index=index)
+        with open(os.path.join(directory, name), 'w') as fd:
+            fd.write('part{index} {{\n'.format(index=index))
+            for key in range(width):
+                fd.write('  key{key} = {value}\n'.format(key=key, value=VALUES[key % len(VALUES)]))
+            fd.write('  ref = ${shared}\n}\n')
+        main_lines.append('include "{name}"'.format(name=name))
+    main_file = os.path.join(directory, 'main.conf')
+    with open(main_file, 'w') as fd:
+        fd.write('\n'.join(main_lines))
+    return main_file
@@ -0,0 +1,131 @@
+"""Run the benchmark suite, save the results as JSON and compare them with the results of another run"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import measure
+from benchmarks.scenarios import get_scenarios
+
+# version of the layout of the JSON results
+RESULTS_FORMAT = 1
+
+
+def _pyhocon_version():
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution('pyhocon').version
+    except Exception:
+        return None
+
+
+def _git_commit():
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                         stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def run(scale=1.0, repeat=5, keyword=None, verbose=True):
+    """Run the scenarios
+
+    :param scale: factor applied to the size of the generated configs
+    :param repeat: number of repetitions of each scenario
+    :param keyword: only run the scenarios whose id (group.name) contains keyword
+    :param verbose: print the best time of each scenario
+    :return: results with the environment they were measured in
+    :type return: dict
+    """
+    directory = tempfile.mkdtemp(prefix='pyhocon-bench-')
+    try:
+        results = []
+        for scenario in get_scenarios(directory, scale):
+            if keyword and keyword not in scenario.id:
+                continue
+            times = sorted(measure(scenario.func, scenario.setup, scenario.number, repeat))
+            results.append({
+                'group': scenario.group,
+                'name': scenario.name,
+                'number': scenario.number,
+                'best': times[0],
+                'median': times[len(times) // 2],
+                'times': times,
+            })
+            if verbose:
+                print('{id:<50} {time:12.3f} ms'.format(id=scenario.id, time=times[0] * 1000))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        'format': RESULTS_FORMAT,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'pyhocon': _pyhocon_version(),
+        'commit': _git_commit(),
+        'scale': scale,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """Compare the best times of two runs
+
+    :param baseline: results of the reference run (returned by run())
+    :param current: results of the run to compare
+    :param threshold: relative change under which times are considered equal (0.1 is 10%)
+    :return: (id, baseline time, current time, ratio) of the scenarios of both runs, and the ids of the regressions
+    :type return: tuple
+    """
+    baseline_times = dict(('{group}.{name}'.format(**result), result['best']) for result in baseline['results'])
+    rows = []
+    regressions = []
+    for result in current['results']:
+        id = '{group}.{name}'.format(**result)
+        if id not in baseline_times:
+            continue
+        ratio = result['best'] / baseline_times[id] if baseline_times[id] else float('inf')
+        rows.append((id, baseline_times[id], result['best'], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(id)
+    return rows, regressions
+
+
+def main(argv=None):  # pragma: no cover
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='pyhocon benchmark suite')
+    parser.add_argument('-k', '--keyword', help='only run the scenarios whose id (group.name) contains keyword')
+    parser.add_argument('-s', '--scale', type=float, default=1.0, help='factor applied to the size of the configs')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of repetitions of each scenario')
+    parser.add_argument('-o', '--output', help='file where the results are saved as JSON')
+    parser.add_argument('-c', '--compare', help='JSON results of a previous run to compare with')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='relative slowdown reported as a regression (default is 0.1)')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare) as fd:
+            baseline = json.load(fd)
+    results = run(args.scale, args.repeat, args.keyword)
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(results, fd, indent=2)
+
+    if args.compare:
+        rows, regressions = compare(baseline, results, args.threshold)
+        print('')
+        print('{id:<50} {baseline:>12} {current:>12} {ratio:>8}'.format(
+            id='compared with ' + (baseline.get('commit') or args.compare)[:12], baseline='baseline ms',
+            current='current ms', ratio='ratio'))
+        for id, baseline_time, current_time, ratio in rows:
+            print('{id:<50} {baseline:12.3f} {current:12.3f} {ratio:8.2f}{mark}'.format(
+                id=id, baseline=baseline_time * 1000, current=current_time * 1000, ratio=ratio,
+                mark=' slower' if id in regressions else ''))
+        if regressions:
+            sys.exit(1)
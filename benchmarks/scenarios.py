@@ -0,0 +1,149 @@
+"""Timed scenarios of the benchmark suite (python -m benchmarks)
+
+A scenario times one operation on generated configs, scenarios are grouped by operation: parse, resolve, lookup,
+merge and convert.
+"""
+import copy
+
+from pyhocon import ConfigFactory, ConfigParser, ConfigTree, HOCONConverter
+
+from benchmarks import generators
+
+# configs generated as HOCON source, in the order of the parse scenarios
+SOURCES = ['deep', 'wide', 'list', 'substitutions', 'append', 'multiline']
+
+
+class Scenario(object):
+
+    def __init__(self, group, name, func, setup=None, number=1):
+        """
+        :param group: operation timed (parse, resolve, lookup, merge or convert)
+        :param name: name of the scenario in its group
+        :param func: callable to time
+        :param setup: callable run before each repetition (not timed)
+        :param number: number of calls per repetition
+        """
+        self.group = group
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.number = number
+
+    @property
+    def id(self):
+        return self.group + '.' + self.name
+
+
+def generate_sources(scale=1.0):
+    """Return the HOCON source of the generated configs by name"""
+    def size(value):
+        return max(1, int(value * scale))
+
+    return {
+        # the grammar recurses for each level of nesting, it fails above ~50 levels
+        'deep': generators.deep_nesting(min(size(30), 40)),
+        'wide': generators.wide_object(size(1000)),
+        'list': generators.large_list(size(2000)),
+        'substitutions': generators.dense_substitutions(size(500)),
+        'append': generators.append_chain(size(200)),
+        'multiline': generators.multiline_strings(size(200)),
+    }
+
+
+def get_scenarios(directory, scale=1.0):
+    """Return all the scenarios
+
+    :param directory: directory where the included files are written
+    :param scale: factor applied to the size of the generated configs
+    :return: scenarios in the order they should be run
+    :type return: list
+    """
+    sources = generate_sources(scale)
+    configs = dict((name, ConfigFactory.parse_string(source)) for name, source in sources.items())
+    include_file = generators.includes(directory, max(1, int(50 * scale)))
+    scenarios = _parse_scenarios(sources, configs, include_file)
+    scenarios.extend(_resolve_scenarios(sources))
+    scenarios.extend(_lookup_scenarios(configs))
+    scenarios.extend(_merge_scenarios(sources, configs))
+    scenarios.extend(_convert_scenarios(configs))
+    return scenarios
+
+
+def _parse_scenarios(sources, configs, include_file):
+    def parse_string(source):
+        return lambda: ConfigFactory.parse_string(source)
+
+    scenarios = [Scenario('parse', 'parse_string_' + name, parse_string(sources[name])) for name in SOURCES]
+    scenarios.append(Scenario('parse', 'parse_file_includes', lambda: ConfigFactory.parse_file(include_file)))
+    json_source = HOCONConverter.to_json(configs['wide'])
+    scenarios.append(Scenario('parse', 'parse_json_wide', lambda: ConfigFactory.parse_json(json_source), number=10))
+    return scenarios
+
+
+def _resolve_scenarios(sources):
+    def resolve(name):
+        # resolve_substitutions changes the config, a new unresolved config is parsed before each repetition
+        state = {}
+
+        def setup():
+            state['config'] = ConfigFactory.parse_string(sources[name], resolve=False)
+
+        return Scenario('resolve', 'resolve_substitutions_' + name,
+                        lambda: ConfigParser.resolve_substitutions(state['config']), setup)
+
+    return [resolve('substitutions'), resolve('append')]
+
+
+def _lookup_scenarios(configs):
+    wide, deep = configs['wide'], configs['deep']
+    keys = list(wide)
+    int_keys = [key for key in keys if type(wide[key]) is int]
+    path = []
+    node = deep
+    while 'level{level}'.format(level=len(path)) in node:
+        path.append('level{level}'.format(level=len(path)))
+        node = node[path[-1]]
+    deep_path = '.'.join(path)
+
+    return [
+        Scenario('lookup', 'get_wide', lambda: [wide.get(key) for key in keys], number=10),
+        Scenario('lookup', 'get_string_wide', lambda: [wide.get_string(key) for key in keys], number=10),
+        Scenario('lookup', 'get_int_wide', lambda: [wide.get_int(key) for key in int_keys], number=10),
+        Scenario('lookup', 'get_deep', lambda: deep.get(deep_path + '.value0'), number=1000),
+        Scenario('lookup', 'get_config_deep', lambda: deep.get_config(deep_path), number=1000),
+        Scenario('lookup', 'get_list', lambda: configs['list'].get_list('items'), number=100),
+        Scenario('lookup', 'getitem_missing_default', lambda: [wide.get(key + '.missing', None) for key in keys],
+                 number=10),
+    ]
+
+
+def _merge_scenarios(sources, configs):
+    overrides = ConfigFactory.parse_string(sources['wide'].replace('key', 'key1'))
+    state = {}
+
+    def merge(name):
+        # merge_configs changes the first config, a copy is made before each repetition
+        def setup():
+            state['config'] = copy.deepcopy(configs[name])
+
+        return Scenario('merge', 'merge_configs_' + name,
+                        lambda: ConfigTree.merge_configs(state['config'], overrides), setup)
+
+    return [
+        merge('wide'),
+        merge('deep'),
+        Scenario('merge', 'with_fallback_wide', lambda: overrides.with_fallback(configs['wide'])),
+        Scenario('merge', 'with_fallback_persistent_wide',
+                 lambda: overrides.with_fallback(configs['wide'], persistent=True), number=10),
+    ]
+
+
+def _convert_scenarios(configs):
+    config = ConfigTree(root=True)
+    for name in SOURCES:
+        config.put(name, configs[name])
+
+    def convert(output_format):
+        return Scenario('convert', 'to_' + output_format, lambda: HOCONConverter.convert(config, output_format))
+
+    return [convert(output_format) for output_format in ['json', 'hocon', 'yaml', 'properties']]
@@ -1,5 +1,55 @@
-from pyhocon.config_parser import ConfigParser, ConfigFactory, ConfigSubstitutionException  # noqa
-from pyhocon.config_tree import ConfigTree, ConfigList, UndefinedKey  # noqa
-from pyhocon.config_tree import ConfigInclude, ConfigSubstitution, ConfigUnquotedString, ConfigValues  # noqa
-from pyhocon.config_tree import ConfigMissingException, ConfigException, ConfigWrongTypeException  # noqa
-from pyhocon.converter import HOCONConverter  # noqa
+import importlib
+import pkgutil
+import sys
+
+# public names and the module defining them, the modules are only imported when one of their names is used so that
+# importing pyhocon does not import the parser (and pyparsing) for programs that only build or convert configs
+_exports = {
+    'ConfigParser': 'pyhocon.config_parser',
+    'ConfigFactory': 'pyhocon.config_parser',
+    'ConfigSubstitutionException': 'pyhocon.config_parser',
+    'ConfigTree': 'pyhocon.config_tree',
+    'ConfigList': 'pyhocon.config_tree',
+    'UndefinedKey': 'pyhocon.config_tree',
+    'ConfigInclude': 'pyhocon.config_tree',
+    'ConfigSubstitution': 'pyhocon.config_tree',
+    'ConfigUnquotedString': 'pyhocon.config_tree',
+    'ConfigValues': 'pyhocon.config_tree',
+    'ConfigMissingException': 'pyhocon.config_tree',
+    'ConfigException': 'pyhocon.config_tree',
+    'ConfigWrongTypeException': 'pyhocon.config_tree',
+    'ConfigMapping': 'pyhocon.config_tree',
+    'ConfigReadOnlyException': 'pyhocon.config_tree',
+    'ConfigView': 'pyhocon.config_tree',
+    'ConfigStack': 'pyhocon.config_stack',
+    'ConfigHolder': 'pyhocon.config_holder',
+    'HOCONConverter': 'pyhocon.converter',
+    'SharedConfig': 'pyhocon.shared_config',
+    'SharedConfigPublisher': 'pyhocon.shared_config',
+    'ConfigServer': 'pyhocon.server',
+    'ConfigClient': 'pyhocon.server',
+}
+
+__all__ = list(_exports)
+
+if sys.version_info >= (3, 7):
+    def _submodules():
+        return set(module.name for module in pkgutil.iter_modules(__path__))
+
+    def __getattr__(name):
+        module = _exports.get(name)
+        if module is not None:
+            value = globals()[name] = getattr(importlib.import_module(module), name)
+        elif name in _submodules():
+            # submodules were attributes of the package when they were imported eagerly
+            value = importlib.import_module(__name__ + '.' + name)
+        else:
+            raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_exports) | _submodules())
+else:  # pragma: no cover
+    # module __getattr__ is not supported
+    for _name, _module in _exports.items():
+        globals()[_name] = getattr(importlib.import_module(_module), _name)
@@ -0,0 +1,201 @@
+"""Cache of the configs parsed by ConfigFactory.parse_string, opt-in and process-wide
+
+Configs are cached by content hash and parse options (base directory, resolve and unresolved value) and evicted in
+least recently used order once the estimated memory retained by the cached configs exceeds the size limit. Files are
+parsed with parse_string once read, so parse_file and with_fallback(filename) reuse the configs of unchanged files:
+
+    set_parse_cache(ParseCache(max_size=32 * 1024 * 1024))
+    config = ConfigFactory.parse_string(DEFAULTS)  # parsed
+    config = ConfigFactory.parse_string(DEFAULTS)  # copied from the cache
+
+The cached configs are never given to the callers: parse_string returns a deep copy that can be modified, and
+ParseCache.parse_string can return a read-only ConfigView of the cached config to avoid the copy. A cached config
+whose included files changed (modification time or size) or whose substitutions read environment variables that
+changed since is parsed again, included URLs are not checked.
+"""
+import contextlib
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from pyhocon.config_tree import ConfigTree, ConfigView
+
+try:
+    unicode
+except NameError:  # pragma: no cover
+    unicode = str
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+class _Entry(object):
+    __slots__ = ('config', 'size', 'files', 'variables')
+
+    def __init__(self, config, size, files, variables):
+        self.config = config
+        self.size = size
+        # (path, signature) of the files read by the includes, the signature is None for missing files
+        self.files = files
+        # values of the environment variables read by the substitutions, None for undefined variables
+        self.variables = variables
+
+    def is_valid(self):
+        return all(os.environ.get(name) == value for name, value in self.variables.items()) and \
+            all(_file_signature(path) == signature for path, signature in self.files)
+
+
+class ParseCache(object):
+    """Bounded LRU cache of parsed configs keyed by content hash and parse options"""
+
+    def __init__(self, max_size=64 * 1024 * 1024, max_entries=None):
+        """
+        :param max_size: highest estimated memory retained by the cached configs (bytes)
+        :param max_entries: highest number of cached configs, unbounded if None
+        """
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):  # pragma: no cover
+        return '[ParseCache: entries={entries} size={size} hits={hits} misses={misses} evictions={evictions}]'.format(
+            entries=len(self), size=self.size, hits=self.hits, misses=self.misses, evictions=self.evictions)
+
+    @staticmethod
+    def key(content, basedir=None, resolve=True, unresolved_value=None):
+        """Return the key of a content parsed with some options
+
+        :return: key or None if the options cannot be part of a key (unhashable unresolved value)
+        """
+        data = content.encode('utf-8') if isinstance(content, unicode) else content
+        key = (hashlib.sha256(data).hexdigest(), basedir, bool(resolve), unresolved_value)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def parse_string(self, content, basedir=None, resolve=True, unresolved_value=None, readonly=False):
+        """Parse a content or get its config from the cache
+
+        :param content: content to parse
+        :type content: basestring
+        :param basedir: directory of the included files
+        :param resolve: if true, resolve substitutions
+        :param unresolved_value: assigned value to unresolved substitution (see ConfigFactory.parse_string)
+        :param readonly: return a read-only view of the cached config instead of a copy (lists are always copied)
+        :return: config
+        :type return: ConfigTree, ConfigView or list
+        """
+        from pyhocon.config_parser import (DEFAULT_SUBSTITUTION, ConfigFactory, ConfigParser, _record_environment,
+                                           _recorded_files)
+
+        if unresolved_value is None:
+            unresolved_value = DEFAULT_SUBSTITUTION
+        key = self.key(content, basedir, resolve, unresolved_value)
+        if key is None:
+            return ConfigParser().parse(content, basedir, resolve, unresolved_value)
+
+        entry = self._get(key)
+        if entry is None:
+            with ConfigFactory.record_files() as files, _record_environment() as variables:
+                config = ConfigParser().parse(content, basedir, resolve, unresolved_value)
+            entry = _Entry(config, self._estimate_size(config), [(path, _file_signature(path)) for path in files],
+                           variables)
+            self._put(key, entry)
+        else:
+            # the included files are still read by this parse for ConfigFactory.record_files
+            recorded_files = getattr(_recorded_files, 'files', None)
+            if recorded_files is not None:
+                recorded_files.extend(path for path, _ in entry.files)
+
+        if readonly and isinstance(entry.config, ConfigTree):
+            return ConfigView(entry.config)
+        return copy.deepcopy(entry.config)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.is_valid():
+                # most recently used last
+                del self._entries[key]
+                self._entries[key] = entry
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[key]
+                self.size -= entry.size
+            self.misses += 1
+            return None
+
+    def _put(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            if entry.size > self.max_size:
+                return
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_size or self.max_entries is not None and len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+    @staticmethod
+    def _estimate_size(config):
+        from pyhocon.profiling import retained_objects
+
+        return sum(size for _, size in retained_objects(config).values())
+
+    def clear(self):
+        """Remove all the cached configs, the counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_parse_cache = None
+
+
+def get_parse_cache():
+    """Return the cache used by ConfigFactory.parse_string, None if configs are not cached"""
+    return _parse_cache
+
+
+def set_parse_cache(cache):
+    """Set the cache used by ConfigFactory.parse_string in all the threads
+
+    :param cache: cache, None to stop caching
+    :type cache: ParseCache
+    :return: previous cache
+    """
+    global _parse_cache
+    previous = _parse_cache
+    _parse_cache = cache
+    return previous
+
+
+@contextlib.contextmanager
+def parse_cache(cache):
+    """Set the cache for a block and restore the previous one after"""
+    previous = set_parse_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_parse_cache(previous)
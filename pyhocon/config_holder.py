@@ -0,0 +1,114 @@
+import logging
+import threading
+
+from pyhocon.exceptions import ConfigException
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigHolder(object):
+    """Hold the current version of a config that is reloaded while it is being read
+
+    New configs are loaded and resolved off to the side and then published by replacing a single reference, so
+    readers always get a complete config without taking any lock. Readers should take a snapshot once per unit of
+    work (e.g., per request) and must not modify it.
+    """
+
+    def __init__(self, loader, load=True):
+        """
+        :param loader: function returning a new resolved config each time it is called
+        :type loader: function
+        :param load: if true, load the first config right away
+        :type load: boolean
+        """
+        self._loader = loader
+        self._config = None
+        self._generation = 0
+        self._hooks = []
+        self._reload_lock = threading.RLock()
+        if load:
+            self.reload()
+
+    @classmethod
+    def from_file(cls, filename, **kwargs):
+        """Hold the config parsed from a file, reloading parses the file again
+
+        :param filename: filename
+        :type filename: basestring
+        :param kwargs: extra arguments of ConfigFactory.parse_file
+        :return: config holder
+        :type return: ConfigHolder
+        """
+        from pyhocon.config_parser import ConfigFactory
+        return cls(lambda: ConfigFactory.parse_file(filename, **kwargs))
+
+    @property
+    def generation(self):
+        """Number of configs published so far"""
+        return self._generation
+
+    def snapshot(self):
+        """Return the current config
+
+        :return: current config, it must not be modified
+        :type return: ConfigTree
+        """
+        return self._config
+
+    def view(self, key=None):
+        """Return a read-only view of the current config
+
+        A ConfigException is raised if no config was loaded yet (holder created with load=False).
+
+        :param key: key of the subtree to view. If not specified, view of the whole config
+        :type key: basestring
+        :type return: ConfigView
+        """
+        config = self._config
+        if config is None:
+            raise ConfigException(u"No config was loaded yet, call reload() or publish() first")
+        return config.get_view(key)
+
+    def add_reload_hook(self, hook):
+        """Register a function called with (old_config, new_config) after each reload
+
+        Hooks are called in the reloading thread once the new config is published, they must not reload the holder.
+
+        :param hook: function to call
+        :type hook: function
+        """
+        self._hooks.append(hook)
+
+    def remove_reload_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def reload(self):
+        """Load a new config and publish it
+
+        If the loader raises an exception, the current config is kept and the exception is propagated.
+
+        :return: new config
+        :type return: ConfigTree
+        """
+        with self._reload_lock:
+            return self.publish(self._loader())
+
+    def publish(self, config):
+        """Publish a config that was loaded outside of the holder
+
+        :param config: resolved config
+        :type config: ConfigTree
+        :return: published config
+        :type return: ConfigTree
+        """
+        with self._reload_lock:
+            old_config = self._config
+            # assigning a single reference is atomic, readers get either the old or the new config
+            self._config = config
+            self._generation += 1
+            for hook in list(self._hooks):
+                try:
+                    hook(old_config, config)
+                except Exception:
+                    logger.exception('Config reload hook %r failed', hook)
+        return config
@@ -1,11 +1,13 @@
 import codecs
 import contextlib
 import copy
+import json
 import logging
 import os
 import re
-import socket
 import sys
+import threading
+from collections import OrderedDict
 
 import pyparsing
 from pyparsing import (Forward, Group, Keyword, Literal, Optional,
@@ -14,7 +16,9 @@ from pyparsing import (Forward, Group, Keyword, Literal, Optional,
                        Word, ZeroOrMore, alphanums, alphas8bit, col, lineno,
                        replaceWith)
 
+from pyhocon.cache import _file_signature, get_parse_cache
 from pyhocon.period_parser import get_period_expr
+from pyhocon.tracing import span
 
 # Fix deepcopy issue with pyparsing
 if sys.version_info >= (3, 8):
@@ -29,22 +33,17 @@ if sys.version_info >= (3, 8):
 
     pyparsing.ParseResults.__getattr__ = fixed_get_attr
 
-from pyhocon.config_tree import (ConfigInclude, ConfigList, ConfigQuotedString,
+from pyhocon.config_tree import (ConfigGetterMixin, ConfigInclude, ConfigList, ConfigQuotedString,
                                  ConfigSubstitution, ConfigTree,
-                                 ConfigUnquotedString, ConfigValues, NoneValue)
+                                 ConfigUnquotedString, ConfigValues, NoneValue, is_sequence)
 from pyhocon.exceptions import (ConfigException, ConfigMissingException,
                                 ConfigSubstitutionException)
 
-use_urllib2 = False
 try:
-    # For Python 3.0 and later
-    from urllib.request import urlopen
-    from urllib.error import HTTPError, URLError
+    from collections.abc import Mapping
 except ImportError:  # pragma: no cover
-    # Fall back to Python 2's urllib2
-    from urllib2 import urlopen, HTTPError, URLError
+    from collections import Mapping
 
-    use_urllib2 = True
 try:
     basestring
 except NameError:  # pragma: no cover
@@ -114,10 +113,177 @@ U_KEY_SEP = unicode('.')
 U_KEY_FMT = unicode('"{0}"')
 
 
+# files read by ConfigFactory.parse_file while ConfigFactory.record_files is active (per thread)
+_recorded_files = threading.local()
+
+# unresolved configs of the included files reused while ConfigFactory.reuse_included_files is active (per thread)
+_included_files = threading.local()
+
+# environment variables read by the substitutions while _record_environment is active (per thread)
+_recorded_environment = threading.local()
+
+# HOCON grammar, built by ConfigParser._get_grammar on the first parse
+_grammar = None
+_grammar_lock = threading.Lock()
+
+# (parser class, base directory) of the parses in progress in the current thread, the innermost last
+_parse_context = threading.local()
+
+
+def _parse_contexts():
+    contexts = getattr(_parse_context, 'contexts', None)
+    if contexts is None:
+        contexts = _parse_context.contexts = []
+    return contexts
+
+
+@contextlib.contextmanager
+def _record_environment():
+    """Record the environment variables read by the substitutions in the current thread
+
+    :return: context manager giving a dict of the values read by variable name (None for undefined variables)
+    """
+    outer_variables = getattr(_recorded_environment, 'variables', None)
+    variables = _recorded_environment.variables = {}
+    try:
+        yield variables
+    finally:
+        _recorded_environment.variables = outer_variables
+        if outer_variables is not None:
+            outer_variables.update(variables)
+
+
+def _getenv(name):
+    value = os.environ.get(name)
+    variables = getattr(_recorded_environment, 'variables', None)
+    if variables is not None:
+        variables[name] = value
+    return value
+
+
+def _add_size_attributes(attributes, config):
+    """Add the number of keys (or items of a list) of a loaded config to the attributes of a traced phase"""
+    if attributes is not None:
+        if isinstance(config, ConfigTree):
+            attributes['keys'] = len(config)
+        elif isinstance(config, list):
+            attributes['items'] = len(config)
+
+
+class _PendingSubstitutions(object):
+    """Substitutions left to resolve by ConfigParser.resolve_substitutions
+
+    The substitutions are indexed by the values containing them and by the values these values override, so that
+    checking whether a value is still being resolved does not scan the whole list for each substitution.
+    """
+
+    def __init__(self, substitutions):
+        self.substitutions = []
+        self._parents = {}
+        self._overriding = {}
+        self.extend(substitutions)
+
+    def __len__(self):
+        return len(self.substitutions)
+
+    def __iter__(self):
+        return iter(self.substitutions)
+
+    def __contains__(self, substitution):
+        return substitution in self._parents.get(substitution.parent, [])
+
+    def extend(self, substitutions):
+        for substitution in substitutions:
+            self.substitutions.append(substitution)
+            self._parents.setdefault(substitution.parent, []).append(substitution)
+            overridden_value = substitution.parent.overridden_value
+            if isinstance(overridden_value, ConfigValues):
+                self._overriding.setdefault(overridden_value, []).append(substitution)
+
+    def remove(self, substitution):
+        self.substitutions.remove(substitution)
+        for index, key in [(self._parents, substitution.parent),
+                           (self._overriding, substitution.parent.overridden_value)]:
+            if isinstance(key, ConfigValues) and key in index:
+                index[key].remove(substitution)
+                if not index[key]:
+                    del index[key]
+
+    def is_parent(self, value):
+        """Return True if value contains substitutions left to resolve"""
+        return isinstance(value, ConfigValues) and value in self._parents
+
+    def overriding(self, value):
+        """Return the substitutions left to resolve in the values overriding value"""
+        return list(self._overriding.get(value, [])) if isinstance(value, ConfigValues) else []
+
+
 class ConfigFactory(object):
 
     @classmethod
-    def parse_file(cls, filename, encoding='utf-8', required=True, resolve=True, unresolved_value=DEFAULT_SUBSTITUTION):
+    @contextlib.contextmanager
+    def record_files(cls):
+        """Record the files read (or attempted to be read) by parse_file in the current thread, including includes
+
+        with ConfigFactory.record_files() as files:
+            config = ConfigFactory.parse_file('app.conf')
+
+        :return: context manager giving the list of filenames, filled as files are read
+        """
+        outer_files = getattr(_recorded_files, 'files', None)
+        files = _recorded_files.files = []
+        try:
+            yield files
+        finally:
+            _recorded_files.files = outer_files
+            if outer_files is not None:
+                outer_files.extend(files)
+
+    @classmethod
+    @contextlib.contextmanager
+    def reuse_included_files(cls, fragments):
+        """Reuse the configs of the included files that did not change since they were parsed in the current thread
+
+        with ConfigFactory.reuse_included_files(fragments):
+            config = ConfigFactory.parse_file('app.conf')
+
+        A file is parsed again if it or one of the files it includes changed (modification time or size), the
+        included files that did not change are copied from fragments instead of being parsed.
+
+        :param fragments: dict kept between the blocks, filled with the unresolved configs of the included files
+        :type fragments: dict
+        :return: context manager
+        """
+        outer_fragments = getattr(_included_files, 'fragments', None)
+        _included_files.fragments = fragments
+        try:
+            yield fragments
+        finally:
+            _included_files.fragments = outer_fragments
+
+    @classmethod
+    def _parse_included_file(cls, path, required):
+        fragments = getattr(_included_files, 'fragments', None)
+        if fragments is None:
+            return cls.parse_file(path, resolve=False, required=required, unresolved_value=NO_SUBSTITUTION)
+
+        fragment = fragments.get(path)
+        if fragment is not None and fragment[0] == required \
+                and all(_file_signature(filename) == signature for filename, signature in fragment[2]):
+            recorded_files = getattr(_recorded_files, 'files', None)
+            if recorded_files is not None:
+                recorded_files.extend(filename for filename, _ in fragment[2])
+            return copy.deepcopy(fragment[1])
+
+        with cls.record_files() as files:
+            obj = cls.parse_file(path, resolve=False, required=required, unresolved_value=NO_SUBSTITUTION)
+        # the including config is merged with the returned config, keep a copy that is not modified
+        fragments[path] = (required, copy.deepcopy(obj), [(filename, _file_signature(filename)) for filename in files])
+        return obj
+
+    @classmethod
+    def parse_file(cls, filename, encoding='utf-8', required=True, resolve=True, unresolved_value=DEFAULT_SUBSTITUTION,
+                   json_fast_path=False):
         """Parse file
 
         :param filename: filename
@@ -132,13 +298,36 @@ class ConfigFactory(object):
         If overridden with a default value, it will replace all unresolved values by the default value.
         If it is set to pyhocon.STR_SUBSTITUTION then it will replace the value by its substitution expression (e.g., ${x})
         :type unresolved_value: class
+        :param json_fast_path: parse .json files with parse_json, falling back to the HOCON grammar if they are not
+            plain JSON. Some documents are parsed differently (see parse_json)
+        :type json_fast_path: boolean
         :return: Config object or []
         :type return: Config or list
         """
+        recorded_files = getattr(_recorded_files, 'files', None)
+        if recorded_files is not None:
+            recorded_files.append(filename)
+
+        with span('parse_file', path=filename) as attributes:
+            config = cls._parse_file(filename, encoding, required, resolve, unresolved_value, json_fast_path)
+            _add_size_attributes(attributes, config)
+        return config
+
+    @classmethod
+    def _parse_file(cls, filename, encoding, required, resolve, unresolved_value, json_fast_path):
         try:
-            with codecs.open(filename, 'r', encoding=encoding) as fd:
-                content = fd.read()
-                return cls.parse_string(content, os.path.dirname(filename), resolve, unresolved_value)
+            with span('read', path=filename) as attributes:
+                with codecs.open(filename, 'r', encoding=encoding) as fd:
+                    content = fd.read()
+                if attributes is not None:
+                    attributes['bytes'] = os.path.getsize(filename)
+            if json_fast_path and filename.endswith('.json'):
+                try:
+                    return cls.parse_json(content)
+                except (ValueError, ConfigException):
+                    # not plain JSON (e.g., comments or substitutions), parse it as HOCON
+                    pass
+            return cls.parse_string(content, os.path.dirname(filename), resolve, unresolved_value)
         except IOError as e:
             if required:
                 raise e
@@ -160,12 +349,35 @@ class ConfigFactory(object):
         :return: Config object or []
         :type return: Config or list
         """
+        with span('parse_url', url=url) as attributes:
+            config = cls._parse_URL(url, timeout, resolve, required, unresolved_value)
+            _add_size_attributes(attributes, config)
+        return config
+
+    @classmethod
+    def _parse_URL(cls, url, timeout, resolve, required, unresolved_value):
+        # imported here as few configs are loaded from URLs
+        import socket
+        try:
+            # For Python 3.0 and later
+            from urllib.request import urlopen
+            from urllib.error import HTTPError, URLError
+            use_urllib2 = False
+        except ImportError:  # pragma: no cover
+            # Fall back to Python 2's urllib2
+            from urllib2 import urlopen, HTTPError, URLError
+            use_urllib2 = True
+
         socket_timeout = socket._GLOBAL_DEFAULT_TIMEOUT if timeout is None else timeout
 
         try:
-            with contextlib.closing(urlopen(url, timeout=socket_timeout)) as fd:
-                content = fd.read() if use_urllib2 else fd.read().decode('utf-8')
-                return cls.parse_string(content, os.path.dirname(url), resolve, unresolved_value)
+            with span('read', url=url) as attributes:
+                with contextlib.closing(urlopen(url, timeout=socket_timeout)) as fd:
+                    data = fd.read()
+                content = data if use_urllib2 else data.decode('utf-8')
+                if attributes is not None:
+                    attributes['bytes'] = len(data)
+            return cls.parse_string(content, os.path.dirname(url), resolve, unresolved_value)
         except (HTTPError, URLError) as e:
             logger.warn('Cannot include url %s. Resource is inaccessible.', url)
             if required:
@@ -188,16 +400,85 @@ class ConfigFactory(object):
         :return: Config object
         :type return: Config
         """
+        cache = get_parse_cache()
+        # includes are parsed with the including content
+        if cache is not None and not _parse_contexts():
+            return cache.parse_string(content, basedir, resolve, unresolved_value)
         return ConfigParser().parse(content, basedir, resolve, unresolved_value)
 
     @classmethod
-    def from_dict(cls, dictionary, root=False):
+    def parse_json(cls, content):
+        """Parse a plain JSON document with the json module instead of the HOCON grammar
+
+        Keys are quoted the same way as by the HOCON parser and duplicate objects are merged. JSON has no
+        substitutions so the config is returned resolved.
+
+        The result follows the JSON specification and differs from the HOCON parser for some documents:
+
+        - a duplicate key overrides the previous value whatever its type (e.g., {"a": 1, "a": {"b": 2}}) while the
+          HOCON parser raises a ConfigWrongTypeException when an object follows a value of another type
+        - all the JSON escape sequences are decoded (e.g., \\u00e9 and \\/) while the HOCON parser keeps them as is
+        - escaped quotes in keys are part of the key (e.g., "a\\"b") while the HOCON parser ends the key at the quote
+
+        :param content: JSON document
+        :type content: basestring
+        :return: Config object or list
+        :type return: Config or list
+        """
+        config = json.loads(content, object_pairs_hook=cls._json_tree, parse_constant=cls._json_constant)
+        if isinstance(config, ConfigTree):
+            config.root = True
+            config.history = dict((key, [value]) for key, value in OrderedDict.items(config))
+            return config
+        elif isinstance(config, list):
+            return ConfigList(config)
+        raise ConfigException(u"JSON document must be an object or an array, got {type}".format(
+            type=type(config).__name__))
+
+    @staticmethod
+    def _json_tree(pairs):
+        tree = ConfigTree()
+        for key, value in pairs:
+            key = ConfigTree.quote_key(key)
+            if isinstance(value, ConfigTree) and isinstance(OrderedDict.get(tree, key), ConfigTree):
+                ConfigTree.merge_configs(OrderedDict.get(tree, key), value, history=False)
+            else:
+                tree[key] = value
+        return tree
+
+    @staticmethod
+    def _json_constant(name):
+        raise ValueError(u"{name} is not supported".format(name=name))
+
+    @classmethod
+    def load_snapshot(cls, filename):
+        """Load a snapshot written by HOCONConverter.to_snapshot
+
+        The file is mapped in memory and only the values that are accessed are decoded.
+
+        :param filename: snapshot filename
+        :type filename: basestring
+        :return: read-only config
+        :type return: SnapshotTree
+        """
+        from pyhocon.snapshot import load_snapshot
+
+        return load_snapshot(filename)
+
+    @classmethod
+    def from_dict(cls, dictionary, root=False, literal_keys=False):
         """Convert dictionary (and ordered dictionary) into a ConfigTree
         :param dictionary: dictionary to convert
         :type dictionary: dict
+        :param literal_keys: if true, keys are not split on dots and the tree is built directly (much faster for
+        large dictionaries), keys containing special characters are quoted as the parser does except the keys of
+        config objects (ConfigTree, ConfigView, ...) which are already quoted
+        :type literal_keys: boolean
         :return: Config object
         :type return: Config
         """
+        if literal_keys:
+            return cls._from_dict_literal(dictionary, root)
 
         def create_tree(value):
             if isinstance(value, dict):
@@ -212,6 +493,40 @@ class ConfigFactory(object):
 
         return create_tree(dictionary)
 
+    @classmethod
+    def _from_dict_literal(cls, dictionary, root=False):
+        def new_container(value):
+            return ConfigTree() if isinstance(value, Mapping) else []
+
+        if not isinstance(dictionary, Mapping) and not is_sequence(dictionary):
+            return dictionary
+
+        result = ConfigTree(root=root) if isinstance(dictionary, Mapping) else []
+        # containers are created before their children are filled, using an explicit stack instead of recursion
+        stack = [(dictionary, result)]
+        while stack:
+            source, target = stack.pop()
+            if isinstance(source, Mapping):
+                # the keys of config objects are already quoted
+                quote_key = (lambda key: key) if isinstance(source, ConfigGetterMixin) else ConfigTree.quote_key
+                for key, value in source.items():
+                    if isinstance(value, Mapping) or is_sequence(value):
+                        child = new_container(value)
+                        stack.append((value, child))
+                        value = child
+                    target[quote_key(key)] = value
+            else:
+                for value in source:
+                    if isinstance(value, Mapping) or is_sequence(value):
+                        child = new_container(value)
+                        stack.append((value, child))
+                        value = child
+                    target.append(value)
+
+        if root and isinstance(result, ConfigTree):
+            result.history = dict((key, [value]) for key, value in OrderedDict.items(result))
+        return result
+
 
 class ConfigParser(object):
     """
@@ -244,12 +559,52 @@ class ConfigParser(object):
         :type unresolved_value: boolean
         :return: a ConfigTree or a list
         """
+        contexts = _parse_contexts()
+        contexts.append((cls, basedir))
+        try:
+            with span('parse', length=len(content)) as attributes:
+                config = cls._get_grammar().parseString(content, parseAll=True)[0]
+                _add_size_attributes(attributes, config)
+        finally:
+            contexts.pop()
+
+        if resolve:
+            allow_unresolved = resolve and unresolved_value is not DEFAULT_SUBSTITUTION \
+                               and unresolved_value is not MANDATORY_SUBSTITUTION
+            has_unresolved = cls.resolve_substitutions(config, allow_unresolved)
+            if has_unresolved and unresolved_value is MANDATORY_SUBSTITUTION:
+                raise ConfigSubstitutionException(
+                    'resolve cannot be set to True and unresolved_value to MANDATORY_SUBSTITUTION')
+
+        if unresolved_value is not NO_SUBSTITUTION and unresolved_value is not DEFAULT_SUBSTITUTION:
+            cls.unresolve_substitutions_to_value(config, unresolved_value)
+        return config
+
+    @classmethod
+    def _get_grammar(cls):
+        """Return the HOCON grammar, built on first use and shared by all the parses"""
+        global _grammar
+        if _grammar is None:
+            with _grammar_lock:
+                if _grammar is None:
+                    grammar = cls._build_grammar()
+                    grammar.streamline()
+                    _grammar = grammar
+        return _grammar
+
+    @classmethod
+    def _build_grammar(cls):
+        """Build the HOCON grammar
 
+        The grammar does not depend on a parse: its parse actions get the parser class and the base directory of the
+        parse in progress from the parse contexts of the current thread (includes are parsed while the including
+        content is being parsed).
+        """
         unescape_pattern = re.compile(r'\\.')
 
         def replace_escape_sequence(match):
             value = match.group(0)
-            return cls.REPLACEMENTS.get(value, value)
+            return _parse_contexts()[-1][0].REPLACEMENTS.get(value, value)
 
         def norm_string(value):
             return unescape_pattern.sub(replace_escape_sequence, value)
@@ -291,6 +646,7 @@ class ConfigParser(object):
             return ConfigQuotedString(value, ws, instring, loc)
 
         def include_config(instring, loc, token):
+            parser_cls, basedir = _parse_contexts()[-1]
             url = None
             file = None
             required = False
@@ -312,18 +668,20 @@ class ConfigParser(object):
                 if final_tokens[0] == 'url':
                     url = value
                 elif final_tokens[0] == 'package':
-                    file = cls.resolve_package_path(value)
+                    file = parser_cls.resolve_package_path(value)
                 else:
                     file = value
 
             if url is not None:
                 logger.debug('Loading config from url %s', url)
-                obj = ConfigFactory.parse_URL(
-                    url,
-                    resolve=False,
-                    required=required,
-                    unresolved_value=NO_SUBSTITUTION
-                )
+                with span('include', url=url) as attributes:
+                    obj = ConfigFactory.parse_URL(
+                        url,
+                        resolve=False,
+                        required=required,
+                        unresolved_value=NO_SUBSTITUTION
+                    )
+                    _add_size_attributes(attributes, obj)
             elif file is not None:
                 path = file if basedir is None else os.path.join(basedir, file)
 
@@ -335,12 +693,9 @@ class ConfigParser(object):
                 def _load(path):
                     _prefix = _make_prefix(path)
                     logger.debug('%s Loading config from file %r', _prefix, path)
-                    obj = ConfigFactory.parse_file(
-                        path,
-                        resolve=False,
-                        required=required,
-                        unresolved_value=NO_SUBSTITUTION
-                    )
+                    with span('include', path=path) as attributes:
+                        obj = ConfigFactory._parse_included_file(path, required)
+                        _add_size_attributes(attributes, obj)
                     logger.debug('%s Result: %s', _prefix, obj)
                     return obj
 
@@ -352,7 +707,7 @@ class ConfigParser(object):
                         if a is None or b is None:
                             return a or b
                         elif isinstance(a, ConfigTree) and isinstance(b, ConfigTree):
-                            return ConfigTree.merge_configs(a, b)
+                            return ConfigTree.merge_configs(a, b, history=False)
                         elif isinstance(a, list) and isinstance(b, list):
                             return a + b
                         else:
@@ -360,8 +715,10 @@ class ConfigParser(object):
                                                   a=type(a), b=type(b))
 
                     logger.debug('%s Loading following configs: %s', _prefix, paths)
-                    for p in paths:
-                        obj = _merge(obj, _load(p))
+                    with span('include', pattern=path, files=len(paths)) as attributes:
+                        for p in paths:
+                            obj = _merge(obj, _load(p))
+                        _add_size_attributes(attributes, obj)
                     logger.debug('%s Result: %s', _prefix, obj)
 
                 else:
@@ -451,19 +808,7 @@ class ConfigParser(object):
             config_expr = ZeroOrMore(comment_eol | eol) + (
                     list_expr | root_dict_expr | inside_root_dict_expr) + ZeroOrMore(
                 comment_eol | eol_comma)
-            config = config_expr.parseString(content, parseAll=True)[0]
-
-            if resolve:
-                allow_unresolved = resolve and unresolved_value is not DEFAULT_SUBSTITUTION \
-                                   and unresolved_value is not MANDATORY_SUBSTITUTION
-                has_unresolved = cls.resolve_substitutions(config, allow_unresolved)
-                if has_unresolved and unresolved_value is MANDATORY_SUBSTITUTION:
-                    raise ConfigSubstitutionException(
-                        'resolve cannot be set to True and unresolved_value to MANDATORY_SUBSTITUTION')
-
-            if unresolved_value is not NO_SUBSTITUTION and unresolved_value is not DEFAULT_SUBSTITUTION:
-                cls.unresolve_substitutions_to_value(config, unresolved_value)
-        return config
+        return config_expr
 
     @classmethod
     def _resolve_variable(cls, config, substitution):
@@ -477,7 +822,7 @@ class ConfigParser(object):
             return True, config.get(variable)
         except ConfigMissingException:
             # default to environment variable
-            value = os.environ.get(variable)
+            value = _getenv(variable)
 
             if value is None:
                 if substitution.optional:
@@ -502,9 +847,15 @@ class ConfigParser(object):
     def _fixup_self_references(cls, config, accept_unresolved=False):
         if isinstance(config, ConfigTree) and config.root:
             for key in config:  # Traverse history of element
-                history = config.history[key]
+                # configs merged without history only know about their current value
+                history = config.history.get(key) or [OrderedDict.get(config, key)]
                 previous_item = history[0]
-                for current_item in history[1:]:
+                for overridden_item, current_item in zip(history, history[1:]):
+                    if isinstance(current_item, ConfigValues) and current_item.overridden_value is overridden_item \
+                            and not isinstance(previous_item, ConfigValues):
+                        # the overridden value is already resolved: use it rather than walking the values it
+                        # overrides again for each link of a chain of self-references (a += ..., a = ${a} ...)
+                        current_item.overridden_value = previous_item
                     for substitution in cls._find_substitutions(current_item):
                         prop_path = ConfigTree.parse_key(substitution.variable)
                         if len(prop_path) > 1 and config.get(substitution.variable, None) is not None:
@@ -529,7 +880,7 @@ class ConfigParser(object):
                         if len(prop_path) > 1 and config.get(substitution.variable, None) is not None:
                             continue  # If value is present in latest version, don't do anything
                         if prop_path[0] == key:
-                            value = os.environ.get(key)
+                            value = _getenv(key)
                             if value is not None:
                                 cls._do_substitute(substitution, value)
                                 continue
@@ -619,16 +970,23 @@ class ConfigParser(object):
 
     @classmethod
     def resolve_substitutions(cls, config, accept_unresolved=False):
+        with span('resolve') as attributes:
+            return cls._resolve_substitutions(config, accept_unresolved, attributes)
+
+    @classmethod
+    def _resolve_substitutions(cls, config, accept_unresolved=False, attributes=None):
         has_unresolved = False
         cls._fixup_self_references(config, accept_unresolved)
-        substitutions = cls._find_substitutions(config)
+        substitutions = _PendingSubstitutions(cls._find_substitutions(config))
+        if attributes is not None:
+            attributes['substitutions'] = len(substitutions)
         if len(substitutions) > 0:
             any_unresolved = True
             _substitutions = []
             cache = {}
             while any_unresolved and len(substitutions) > 0 and set(substitutions) != set(_substitutions):
                 any_unresolved = False
-                _substitutions = substitutions[:]
+                _substitutions = substitutions.substitutions[:]
 
                 for substitution in _substitutions:
                     unresolved = False
@@ -637,7 +995,7 @@ class ConfigParser(object):
                         overridden_value = overridden_value.transform()
                     # If this substitution is an override, and the parent is still being processed,
                     # skip this entry, it will be processed on the next loop.
-                    if overridden_value in [s.parent for s in substitutions]:
+                    if substitutions.is_parent(overridden_value):
                         continue
 
                     is_optional_resolved, resolved_value = cls._resolve_variable(config, substitution)
@@ -666,7 +1024,7 @@ class ConfigParser(object):
 
                     if not isinstance(resolved_value, ConfigValues):
                         cache_values.append(substitution)
-                        overrides = [s for s in substitutions if s.parent.overridden_value == substitution.parent]
+                        overrides = substitutions.overriding(substitution.parent)
                         if len(overrides) > 0:
                             for o in overrides:
                                 values = cache.get(o) if cache.get(o) is not None else []
@@ -691,9 +1049,12 @@ class ConfigParser(object):
                     if len(cache_values) == 0:
                         any_unresolved = True
 
-            cls._final_fixup(config)
+            with span('fixup'):
+                cls._final_fixup(config)
             if any_unresolved:
                 has_unresolved = True
+                if attributes is not None:
+                    attributes['unresolved'] = len(substitutions)
                 if not accept_unresolved:
                     raise ConfigSubstitutionException("Cannot resolve {variables}. Check for cycles.".format(
                         variables=', '.join('${{{variable}}}: (line: {line}, col: {col})'.format(
@@ -701,9 +1062,69 @@ class ConfigParser(object):
                             line=lineno(substitution.loc, substitution.instring),
                             col=col(substitution.loc, substitution.instring)) for substitution in substitutions)))
 
-        cls._final_fixup(config)
+        with span('fixup'):
+            cls._final_fixup(config)
         return has_unresolved
 
+    @classmethod
+    def resolve_paths(cls, config, paths):
+        """Resolve only the substitutions needed to get the values at some paths
+
+        The root keys that the paths do not depend on (directly or through substitutions) are removed from the config,
+        which must be a root config parsed with resolve=False, and the remaining substitutions are resolved.
+
+        :param config: unresolved root config, modified in place
+        :type config: ConfigTree
+        :param paths: paths (dot separated) of the values to get
+        :type paths: list
+        :return: the config
+        :type return: ConfigTree
+        """
+        history = getattr(config, 'history', {})
+        needed = set()
+        pending = []
+        for path in paths:
+            key = ConfigTree.parse_key(path)[0]
+            if key not in needed:
+                needed.add(key)
+                pending.append(key)
+
+        while pending:
+            key = pending.pop()
+            values = list(history.get(key, [])) + [OrderedDict.get(config, key)]
+            for variable in cls._substitution_variables(values):
+                variable_key = ConfigTree.parse_key(variable)[0]
+                if variable_key not in needed and OrderedDict.__contains__(config, variable_key):
+                    needed.add(variable_key)
+                    pending.append(variable_key)
+
+        for key in list(OrderedDict.keys(config)):
+            if key not in needed:
+                OrderedDict.__delitem__(config, key)
+                history.pop(key, None)
+        cls.resolve_substitutions(config)
+        return config
+
+    @classmethod
+    def _substitution_variables(cls, values):
+        """Return the variables of all the substitutions found in values (including overridden values)"""
+        variables = []
+        stack = list(values)
+        while stack:
+            item = stack.pop()
+            if isinstance(item, ConfigSubstitution):
+                variables.append(item.variable)
+            elif isinstance(item, ConfigTree):
+                stack.extend(OrderedDict.values(item))
+            elif isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, ConfigValues):
+                stack.extend(item.tokens)
+                overridden_value = getattr(item, 'overridden_value', None)
+                if overridden_value is not None:
+                    stack.append(overridden_value)
+        return variables
+
     @classmethod
     def resolve_package_path(cls, package_path):
         """
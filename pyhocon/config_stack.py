@@ -0,0 +1,113 @@
+import copy
+from collections import OrderedDict
+
+from pyhocon.config_tree import ConfigGetterMixin, ConfigTree, NonExistentKey, UndefinedKey
+from pyhocon.exceptions import ConfigMissingException, ConfigWrongTypeException
+
+
+class ConfigStack(ConfigGetterMixin):
+    """Ordered layers of configs that are looked up without being merged
+
+    Layers are given from the lowest to the highest priority, i.e., in the order they would be chained with
+    with_fallback: ConfigStack([reference, application, environment, cli]) gives the same values as
+    cli.with_fallback(environment).with_fallback(application).with_fallback(reference).
+    The layers are expected to be resolved, use materialize() when substitutions span several layers.
+    """
+
+    def __init__(self, layers=None):
+        self._layers = list(layers or [])
+
+    @property
+    def layers(self):
+        """Layers from the lowest to the highest priority
+
+        :type return: tuple
+        """
+        return tuple(self._layers)
+
+    def push(self, config):
+        """Add a layer on top of the others
+
+        :param config: config overriding the current layers
+        :type config: ConfigTree
+        """
+        self._layers.append(config)
+
+    def set_layer(self, index, config):
+        """Replace a layer, the other layers are left untouched
+
+        :param index: index of the layer to replace (0 is the lowest priority)
+        :type index: int
+        :param config: new layer
+        :type config: ConfigTree
+        """
+        self._layers[index] = config
+
+    def get(self, key, default=UndefinedKey):
+        """Get a value from the top-most layer defining it
+
+        Objects found in several layers are merged (without modifying the layers) as long as no layer in between
+        overrides them with a value that is not an object.
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: object
+        :return: value in the stack located at key
+        """
+        key_path = ConfigTree.parse_key(key)
+        last_index = len(key_path) - 1
+        trees = []
+        for layer in reversed(self._layers):
+            elt = layer
+            for index, key_elt in enumerate(key_path):
+                elt = OrderedDict.get(elt, key_elt, UndefinedKey)
+                if elt is UndefinedKey or index == last_index or not isinstance(elt, ConfigTree):
+                    break
+
+            if elt is UndefinedKey:
+                continue
+            elif isinstance(elt, ConfigTree) and index == last_index:
+                trees.append(elt)
+                continue
+            elif trees:
+                # a value that is not an object hides the objects of the lower layers
+                break
+            elif index == last_index:
+                return layer._get(key_path, 0, default)
+            elif default is UndefinedKey:
+                raise ConfigWrongTypeException(
+                    u"{key} has type {type} rather than dict".format(key='.'.join(key_path[:index + 1]),
+                                                                     type=type(elt).__name__))
+            else:
+                return default
+
+        if not trees:
+            if default is UndefinedKey:
+                raise ConfigMissingException(u"No configuration setting found for key {key}".format(key=key))
+            return default
+
+        result = trees.pop()
+        while trees:
+            result = ConfigTree.merge_configs_persistent(result, trees.pop())
+        return result
+
+    def materialize(self):
+        """Merge copies of all the layers into a single resolved config
+
+        :return: merged config
+        :type return: ConfigTree
+        """
+        from pyhocon.config_parser import ConfigParser
+
+        result = ConfigTree(root=True)
+        for layer in self._layers:
+            result = ConfigTree.merge_configs(result, copy.deepcopy(layer))
+        ConfigParser.resolve_substitutions(result)
+        return result
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __contains__(self, item):
+        return self.get(item, NonExistentKey) is not NonExistentKey
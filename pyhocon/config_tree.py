@@ -1,8 +1,13 @@
 from collections import OrderedDict
-from pyparsing import col, lineno
 import re
 import copy
-from pyhocon.exceptions import ConfigException, ConfigWrongTypeException, ConfigMissingException
+from datetime import timedelta
+from pyhocon.exceptions import ConfigException, ConfigWrongTypeException, ConfigMissingException, ConfigReadOnlyException
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # pragma: no cover
+    from collections import Mapping, Sequence
 
 try:
     basestring
@@ -11,6 +16,16 @@ except NameError:  # pragma: no cover
     unicode = str
 
 
+# characters that keep the quotes around a key element
+KEY_SPECIAL_CHARACTERS = '$}[]:=+#`^?!@*&.'
+_KEY_SPECIAL_CHARACTERS_RE = re.compile('[' + re.escape(KEY_SPECIAL_CHARACTERS) + ']')
+
+
+def is_sequence(value):
+    """Return whether a value is a sequence converted to a list in configs (strings and bytes are not)"""
+    return isinstance(value, Sequence) and not isinstance(value, (basestring, bytes, bytearray))
+
+
 class UndefinedKey(object):
     pass
 
@@ -23,7 +38,137 @@ class NoneValue(object):
     pass
 
 
-class ConfigTree(OrderedDict):
+class ConfigGetterMixin(object):
+    """Typed getters for the classes exposing get(key, default)"""
+
+    def get_string(self, key, default=UndefinedKey):
+        """Return string representation of value found at key
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: basestring
+        :return: string value
+        :type return: basestring
+        """
+        value = self.get(key, default)
+        if value is None:
+            return None
+
+        string_value = unicode(value)
+        if isinstance(value, bool):
+            string_value = string_value.lower()
+        return string_value
+
+    def get_int(self, key, default=UndefinedKey):
+        """Return int representation of value found at key
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: int
+        :return: int value
+        :type return: int
+        """
+        value = self.get(key, default)
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            raise ConfigException(
+                u"{key} has type '{type}' rather than 'int'".format(key=key, type=type(value).__name__))
+
+    def get_float(self, key, default=UndefinedKey):
+        """Return float representation of value found at key
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: float
+        :return: float value
+        :type return: float
+        """
+        value = self.get(key, default)
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            raise ConfigException(
+                u"{key} has type '{type}' rather than 'float'".format(key=key, type=type(value).__name__))
+
+    def get_bool(self, key, default=UndefinedKey):
+        """Return boolean representation of value found at key
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: bool
+        :return: boolean value
+        :type return: bool
+        """
+
+        # String conversions as per API-recommendations:
+        # https://github.com/typesafehub/config/blob/master/HOCON.md#automatic-type-conversions
+        bool_conversions = {
+            None: None,
+            'true': True, 'yes': True, 'on': True,
+            'false': False, 'no': False, 'off': False
+        }
+        string_value = self.get_string(key, default)
+        if string_value is not None:
+            string_value = string_value.lower()
+        try:
+            return bool_conversions[string_value]
+        except KeyError:
+            raise ConfigException(
+                u"{key} does not translate to a Boolean value".format(key=key))
+
+    def get_list(self, key, default=UndefinedKey):
+        """Return list representation of value found at key
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: list
+        :return: list value
+        :type return: list
+        """
+        value = self.get(key, default)
+        if isinstance(value, list):
+            return value
+        elif isinstance(value, ConfigGetterMixin):
+            lst = []
+            for k, v in sorted(value.items(), key=lambda kv: kv[0]):
+                if re.match('^[1-9][0-9]*$|0', k):
+                    lst.append(v)
+                else:
+                    raise ConfigException(u"{key} does not translate to a list".format(key=key))
+            return lst
+        elif value is None:
+            return None
+        else:
+            raise ConfigException(
+                u"{key} has type '{type}' rather than 'list'".format(key=key, type=type(value).__name__))
+
+    def get_config(self, key, default=UndefinedKey):
+        """Return tree config representation of value found at key
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: config
+        :return: config value
+        :type return: ConfigTree
+        """
+        value = self.get(key, default)
+        if isinstance(value, (dict, ConfigGetterMixin)):
+            return value
+        elif value is None:
+            return None
+        else:
+            raise ConfigException(
+                u"{key} has type '{type}' rather than 'config'".format(key=key, type=type(value).__name__))
+
+
+class ConfigTree(ConfigGetterMixin, OrderedDict):
     KEY_SEP = '.'
 
     def __init__(self, *args, **kwds):
@@ -31,42 +176,111 @@ class ConfigTree(OrderedDict):
         if self.root:
             self.history = {}
         super(ConfigTree, self).__init__(*args, **kwds)
-        for key, value in self.items():
+        for key, value in OrderedDict.items(self):
             if isinstance(value, ConfigValues):
                 value.parent = self
                 value.index = key
 
     @staticmethod
-    def merge_configs(a, b, copy_trees=False):
+    def merge_configs(a, b, copy_trees=False, history=True):
         """Merge config b into a
 
+        Nested objects are merged level by level using an explicit stack, so the depth of the configs is not
+        bounded by the recursion limit.
+
         :param a: target config
         :type a: ConfigTree
         :param b: source config
         :type b: ConfigTree
+        :param copy_trees: copy the objects of a before merging into them instead of modifying them in place
+        :type copy_trees: bool
+        :param history: if a is a root config, append the overriding values to its history. It can be disabled
+            when the merged config is not used to resolve self-referencing substitutions
+        :type history: bool
         :return: merged config a
         """
-        for key, value in b.items():
-            # if key is in both a and b and both values are dictionary then merge it otherwise override it
-            if key in a and isinstance(a[key], ConfigTree) and isinstance(b[key], ConfigTree):
-                if copy_trees:
-                    a[key] = a[key].copy()
-                ConfigTree.merge_configs(a[key], b[key], copy_trees=copy_trees)
-            else:
+        stack = [(a, b)]
+        while stack:
+            target, source = stack.pop()
+            record_history = history and target.root
+            for key, value in OrderedDict.items(source):
+                if isinstance(value, NoneValue):
+                    value = None
+                current = OrderedDict.get(target, key)
+                # if key is in both a and b and both values are dictionary then merge it otherwise override it
+                if isinstance(current, ConfigTree) and isinstance(value, ConfigTree):
+                    if copy_trees:
+                        current = ConfigTree(OrderedDict.items(current))
+                        target[key] = current
+                    stack.append((current, value))
+                    continue
+
                 if isinstance(value, ConfigValues):
-                    value.parent = a
+                    value.parent = target
                     value.key = key
-                    if key in a:
-                        value.overridden_value = a[key]
-                a[key] = value
-                if a.root:
-                    if b.root:
-                        a.history[key] = a.history.get(key, []) + b.history.get(key, [value])
+                    if key in target:
+                        value.overridden_value = target[key]
+                target[key] = value
+                if record_history:
+                    hist = target._history_list(key)
+                    if source.root and key in source.history:
+                        hist.extend(source.history[key])
                     else:
-                        a.history[key] = a.history.get(key, []) + [value]
+                        hist.append(value)
 
         return a
 
+    @staticmethod
+    def merge_configs_persistent(a, b):
+        """Merge config b into a without modifying any of them
+
+        Only the objects present at the same path in a and b are re-created, every other subtree is shared
+        with a or b. Re-creating an object copies the references to its entries (and, for the root, its history
+        lists, which are shared), so the cost is proportional to the size of b plus the number of entries of the
+        objects of a that b overrides (at least the number of top-level keys of a) rather than to the size of a.
+        Both configs must be fully resolved and the result must be treated as read-only since it shares
+        its nodes with a and b.
+
+        :param a: fallback config
+        :type a: ConfigTree
+        :param b: overriding config
+        :type b: ConfigTree
+        :return: new merged config
+        :type return: ConfigTree
+        """
+        result = ConfigTree(root=a.root)
+        OrderedDict.update(result, OrderedDict.items(a))
+        if result.root:
+            # the history lists are shared with a, they are copied before being modified (see _history_list)
+            result.history = dict(a.history)
+            result._shared_history = set(a.history)
+
+        for key, value in OrderedDict.items(b):
+            if isinstance(value, ConfigValues):
+                raise ConfigException(u"Cannot merge unresolved value for key {key}".format(key=key))
+            current = OrderedDict.get(result, key)
+            if isinstance(current, ConfigTree) and isinstance(value, ConfigTree):
+                value = ConfigTree.merge_configs_persistent(current, value)
+            result[key] = value
+            if result.root:
+                result.history[key] = result.history.get(key, []) + (b.history.get(key, [value]) if b.root else [value])
+                result._shared_history.discard(key)
+
+        return result
+
+    @staticmethod
+    def _is_resolved(config):
+        """Return whether a config or list contains no unresolved values, without copying it"""
+        stack = [config]
+        while stack:
+            value = stack.pop()
+            for item in (OrderedDict.values(value) if isinstance(value, ConfigTree) else value):
+                if isinstance(item, ConfigValues):
+                    return False
+                if isinstance(item, (ConfigTree, list)):
+                    stack.append(item)
+        return True
+
     def resolve(self, other):
         """Merge config b into a
         :param self: target config
@@ -162,10 +376,21 @@ class ConfigTree(OrderedDict):
 
     def _push_history(self, key, value):
         if self.root:
-            hist = self.history.get(key)
-            if hist is None:
-                hist = self.history[key] = []
-            hist.append(value)
+            self._history_list(key).append(value)
+
+    def _history_list(self, key):
+        """Return the history list of a key that can be modified in place
+
+        The lists shared with other configs by merge_configs_persistent are copied the first time they are modified.
+        """
+        hist = self.history.get(key)
+        shared = getattr(self, '_shared_history', ())
+        if hist is None:
+            hist = self.history[key] = []
+        elif key in shared:
+            hist = self.history[key] = list(hist)
+            shared.discard(key)
+        return hist
 
     def _get(self, key_path, key_index=0, default=UndefinedKey):
         key_elt = key_path[key_index]
@@ -206,14 +431,23 @@ class ConfigTree(OrderedDict):
         :param str:
         :return:
         """
-        special_characters = '$}[]:=+#`^?!@*&.'
         tokens = re.findall(
-            r'"[^"]+"|[^{special_characters}]+'.format(special_characters=re.escape(special_characters)), string)
+            r'"[^"]+"|[^{special_characters}]+'.format(special_characters=re.escape(KEY_SPECIAL_CHARACTERS)), string)
+
+        return [token if _KEY_SPECIAL_CHARACTERS_RE.search(token) else token.strip('"') for token in tokens]
 
-        def contains_special_character(token):
-            return any((c in special_characters) for c in token)
+    @staticmethod
+    def quote_key(key):
+        """Return a single key element as it is stored in the tree, i.e., as parse_key returns it
 
-        return [token if contains_special_character(token) else token.strip('"') for token in tokens]
+        :param key: key element (not split on dots)
+        :type key: basestring
+        :return: key quoted if it contains any of the special characters: $}[]:=+#`^?!@*&.
+        :type return: basestring
+        """
+        if _KEY_SPECIAL_CHARACTERS_RE.search(key) is None:
+            return key
+        return '"' + key + '"'
 
     def put(self, key, value, append=False):
         """Put a value in the tree (dot separated)
@@ -235,25 +469,6 @@ class ConfigTree(OrderedDict):
         """
         return self._get(ConfigTree.parse_key(key), 0, default)
 
-    def get_string(self, key, default=UndefinedKey):
-        """Return string representation of value found at key
-
-        :param key: key to use (dot separated). E.g., a.b.c
-        :type key: basestring
-        :param default: default value if key not found
-        :type default: basestring
-        :return: string value
-        :type return: basestring
-        """
-        value = self.get(key, default)
-        if value is None:
-            return None
-
-        string_value = unicode(value)
-        if isinstance(value, bool):
-            string_value = string_value.lower()
-        return string_value
-
     def pop(self, key, default=UndefinedKey):
         """Remove specified key and return the corresponding value.
         If key is not found, default is returned if given, otherwise ConfigMissingException is raised
@@ -282,113 +497,6 @@ class ConfigTree(OrderedDict):
             self.__delitem__(child)
         return value
 
-    def get_int(self, key, default=UndefinedKey):
-        """Return int representation of value found at key
-
-        :param key: key to use (dot separated). E.g., a.b.c
-        :type key: basestring
-        :param default: default value if key not found
-        :type default: int
-        :return: int value
-        :type return: int
-        """
-        value = self.get(key, default)
-        try:
-            return int(value) if value is not None else None
-        except (TypeError, ValueError):
-            raise ConfigException(
-                u"{key} has type '{type}' rather than 'int'".format(key=key, type=type(value).__name__))
-
-    def get_float(self, key, default=UndefinedKey):
-        """Return float representation of value found at key
-
-        :param key: key to use (dot separated). E.g., a.b.c
-        :type key: basestring
-        :param default: default value if key not found
-        :type default: float
-        :return: float value
-        :type return: float
-        """
-        value = self.get(key, default)
-        try:
-            return float(value) if value is not None else None
-        except (TypeError, ValueError):
-            raise ConfigException(
-                u"{key} has type '{type}' rather than 'float'".format(key=key, type=type(value).__name__))
-
-    def get_bool(self, key, default=UndefinedKey):
-        """Return boolean representation of value found at key
-
-        :param key: key to use (dot separated). E.g., a.b.c
-        :type key: basestring
-        :param default: default value if key not found
-        :type default: bool
-        :return: boolean value
-        :type return: bool
-        """
-
-        # String conversions as per API-recommendations:
-        # https://github.com/typesafehub/config/blob/master/HOCON.md#automatic-type-conversions
-        bool_conversions = {
-            None: None,
-            'true': True, 'yes': True, 'on': True,
-            'false': False, 'no': False, 'off': False
-        }
-        string_value = self.get_string(key, default)
-        if string_value is not None:
-            string_value = string_value.lower()
-        try:
-            return bool_conversions[string_value]
-        except KeyError:
-            raise ConfigException(
-                u"{key} does not translate to a Boolean value".format(key=key))
-
-    def get_list(self, key, default=UndefinedKey):
-        """Return list representation of value found at key
-
-        :param key: key to use (dot separated). E.g., a.b.c
-        :type key: basestring
-        :param default: default value if key not found
-        :type default: list
-        :return: list value
-        :type return: list
-        """
-        value = self.get(key, default)
-        if isinstance(value, list):
-            return value
-        elif isinstance(value, ConfigTree):
-            lst = []
-            for k, v in sorted(value.items(), key=lambda kv: kv[0]):
-                if re.match('^[1-9][0-9]*$|0', k):
-                    lst.append(v)
-                else:
-                    raise ConfigException(u"{key} does not translate to a list".format(key=key))
-            return lst
-        elif value is None:
-            return None
-        else:
-            raise ConfigException(
-                u"{key} has type '{type}' rather than 'list'".format(key=key, type=type(value).__name__))
-
-    def get_config(self, key, default=UndefinedKey):
-        """Return tree config representation of value found at key
-
-        :param key: key to use (dot separated). E.g., a.b.c
-        :type key: basestring
-        :param default: default value if key not found
-        :type default: config
-        :return: config value
-        :type return: ConfigTree
-        """
-        value = self.get(key, default)
-        if isinstance(value, dict):
-            return value
-        elif value is None:
-            return None
-        else:
-            raise ConfigException(
-                u"{key} has type '{type}' rather than 'config'".format(key=key, type=type(value).__name__))
-
     def __getitem__(self, item):
         val = self.get(item)
         if val is UndefinedKey:
@@ -412,13 +520,29 @@ class ConfigTree(OrderedDict):
     def __contains__(self, item):
         return self._get(self.parse_key(item), default=NoneValue) is not NoneValue
 
-    def with_fallback(self, config, resolve=True):
+    def with_fallback(self, config, resolve=True, persistent=False):
         """
         return a new config with fallback on config
         :param config: config or filename of the config to fallback on
         :param resolve: resolve substitutions
+        :param persistent: share the subtrees that are not overridden with self and config instead of deep copying
+            both of them (see merge_configs_persistent). Both configs must be resolved, which is checked by walking them
+            without copying, resolve must be True and the result must not be mutated
         :return: new config with fallback on config
         """
+        if not isinstance(config, (ConfigTree, basestring)) and hasattr(config, 'materialize'):
+            # mapping adapter, snapshot, ...
+            config = config.materialize()
+        if persistent:
+            if not resolve:
+                raise ConfigException(u"A persistent fallback cannot be left unresolved, both configs must be resolved")
+            if not isinstance(config, ConfigTree):
+                from . import ConfigFactory
+                config = ConfigFactory.parse_file(config)
+            if not (ConfigTree._is_resolved(config) and ConfigTree._is_resolved(self)):
+                raise ConfigException(u"Cannot fall back persistently on a config with unresolved values")
+            return ConfigTree.merge_configs_persistent(config, self)
+
         if isinstance(config, ConfigTree):
             result = ConfigTree.merge_configs(copy.deepcopy(config), copy.deepcopy(self))
         else:
@@ -454,6 +578,284 @@ class ConfigTree(OrderedDict):
 
         return OrderedDict((key.strip('"'), plain_value(value)) for key, value in self.items())
 
+    def as_dict(self, timedelta_converter=None, relativedelta_converter=None):
+        """return a deep copy of this config as plain dicts and lists
+
+        The config tree should be fully resolved.
+
+        Like as_plain_ordered_dict, keys that contain dots are not surrounded with '"' but the result is made of plain
+        dicts (ordered on Python 3.7+) built with an explicit stack, which is faster to build and to serialize.
+
+        :param timedelta_converter: function applied to the timedelta values (e.g., timedelta.total_seconds)
+        :type timedelta_converter: function
+        :param relativedelta_converter: function applied to the relativedelta values
+        :type relativedelta_converter: function
+        :return: this config as a dict
+        :type return: dict
+        """
+        converters = []
+        if timedelta_converter is not None:
+            converters.append((timedelta, timedelta_converter))
+        if relativedelta_converter is not None:
+            from pyhocon.period_serializer import relativedelta_type
+            relativedelta = relativedelta_type()
+            if relativedelta is not None:
+                converters.append((relativedelta, relativedelta_converter))
+
+        result = {}
+        stack = [(self, result)]
+        while stack:
+            source, target = stack.pop()
+            is_tree = isinstance(source, ConfigTree)
+            for key, value in OrderedDict.items(source) if is_tree else enumerate(source):
+                if isinstance(value, ConfigTree):
+                    stack.append((value, {}))
+                    value = stack[-1][1]
+                elif isinstance(value, list):
+                    stack.append((value, [None] * len(value)))
+                    value = stack[-1][1]
+                elif isinstance(value, NoneValue):
+                    value = None
+                elif isinstance(value, ConfigValues):
+                    raise ConfigException("The config tree contains unresolved elements")
+                else:
+                    for period_type, converter in converters:
+                        if isinstance(value, period_type):
+                            value = converter(value)
+                            break
+
+                if is_tree:
+                    # strip the quotes of the dotted keys, only when there are some
+                    target[key.strip('"') if '"' in key else key] = value
+                else:
+                    target[key] = value
+        return result
+
+    def get_view(self, key=None):
+        """Return a read-only view of the config found at key, without copying it
+
+        :param key: key to use (dot separated). E.g., a.b.c. If not specified, view of the whole config
+        :type key: basestring
+        :return: read-only view
+        :type return: ConfigView
+        """
+        return ConfigView(self, key)
+
+    @staticmethod
+    def wrap(mapping):
+        """Expose the config API over a mapping (e.g., nested dicts and lists) without converting it
+
+        :param mapping: mapping to wrap, keys are taken literally and it is never modified
+        :type mapping: Mapping
+        :return: config adapter converting the mapping only if it is mutated or merged
+        :type return: ConfigMapping
+        """
+        return ConfigMapping(mapping)
+
+
+class ConfigView(ConfigGetterMixin, Mapping):
+    """Read-only view of a config tree (or of one of its subtrees) sharing its nodes
+
+    The view keeps a reference to the config and the path of the subtree so it is never copied.
+    Objects returned by the view are views themselves and every mutation raises ConfigReadOnlyException.
+    Views hold no state of their own so they can be shared between threads as long as the underlying
+    config is not modified.
+    """
+
+    def __init__(self, config, key=None):
+        self._config = config
+        self._path = [] if key is None else ConfigTree.parse_key(key)
+        tree = self._tree()
+        if not isinstance(tree, ConfigTree):
+            raise ConfigException(
+                u"{key} has type '{type}' rather than 'config'".format(key=key, type=type(tree).__name__))
+
+    @classmethod
+    def _from_path(cls, config, path):
+        view = cls.__new__(cls)
+        view._config = config
+        view._path = path
+        return view
+
+    def _tree(self):
+        return self._config._get(self._path) if self._path else self._config
+
+    def _wrap(self, value, path=None):
+        if isinstance(value, ConfigTree):
+            return ConfigView._from_path(self._config, path) if path is not None else ConfigView(value)
+        elif isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        return value
+
+    def get(self, key, default=UndefinedKey):
+        """Get a value from the view
+
+        :param key: key to use (dot separated) relative to the view. E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: object
+        :return: value located at key, objects are returned as views
+        """
+        path = self._path + ConfigTree.parse_key(key)
+        value = self._config._get(path, 0, default)
+        if value is default:
+            return value
+        return self._wrap(value, path)
+
+    def materialize(self):
+        """Return a copy of the viewed config that can be modified
+
+        :return: deep copy of the viewed config
+        :type return: ConfigTree
+        """
+        return copy.deepcopy(self._tree())
+
+    def as_plain_ordered_dict(self):
+        """return a deep copy of the viewed config as a plain OrderedDict
+
+        :return: viewed config as an OrderedDict
+        :type return: OrderedDict
+        """
+        return self._tree().as_plain_ordered_dict()
+
+    def put(self, key, value, append=False):
+        raise ConfigReadOnlyException(u"Cannot put {key}: ConfigView is read-only".format(key=key))
+
+    def pop(self, key, default=UndefinedKey):
+        raise ConfigReadOnlyException(u"Cannot pop {key}: ConfigView is read-only".format(key=key))
+
+    def __setitem__(self, key, value):
+        raise ConfigReadOnlyException(u"Cannot set {key}: ConfigView is read-only".format(key=key))
+
+    def __delitem__(self, key):
+        raise ConfigReadOnlyException(u"Cannot delete {key}: ConfigView is read-only".format(key=key))
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __contains__(self, item):
+        return self.get(item, NonExistentKey) is not NonExistentKey
+
+    def __iter__(self):
+        return iter(self._tree())
+
+    def __len__(self):
+        return len(self._tree())
+
+    def __repr__(self):  # pragma: no cover
+        return '[ConfigView: ' + '.'.join(self._path) + ']'
+
+
+class ConfigMapping(ConfigGetterMixin, Mapping):
+    """Config read API over an existing mapping (e.g., nested dicts and lists loaded from JSON) without converting it
+
+    Keys of the mapping are taken literally (a key containing dots is a single key, as quoted keys in a config tree).
+    Nested mappings and lists are wrapped when they are accessed. The mapping is never modified: the first mutation
+    converts it into a ConfigTree that is used from then on (mutating a wrapped nested mapping does not change the
+    adapter it was obtained from), and with_fallback merges a converted copy.
+    """
+
+    def __init__(self, mapping, root=True):
+        self._mapping = mapping
+        self._root = root
+        self._tree = None
+
+    def _wrap(self, value):
+        if isinstance(value, Mapping) and not isinstance(value, (ConfigTree, ConfigMapping)):
+            return ConfigMapping(value, root=False)
+        elif is_sequence(value):
+            return [self._wrap(item) for item in value]
+        return value
+
+    def get(self, key, default=UndefinedKey):
+        """Get a value from the mapping
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: object
+        :return: value located at key, mappings are returned wrapped
+        """
+        if self._tree is not None:
+            return self._tree.get(key, default)
+
+        key_path = ConfigTree.parse_key(key)
+        value = self._mapping
+        for index, key_elt in enumerate(key_path):
+            if not isinstance(value, Mapping):
+                if default is UndefinedKey:
+                    raise ConfigWrongTypeException(
+                        u"{key} has type {type} rather than dict".format(key='.'.join(key_path[:index]),
+                                                                         type=type(value).__name__))
+                return default
+            if len(key_elt) > 1 and key_elt[0] == '"' and key_elt[-1] == '"':
+                key_elt = key_elt[1:-1]
+            value = value.get(key_elt, UndefinedKey)
+            if value is UndefinedKey:
+                if default is UndefinedKey:
+                    raise ConfigMissingException(
+                        u"No configuration setting found for key {key}".format(key='.'.join(key_path[:index + 1])))
+                return default
+        return self._wrap(value)
+
+    def materialize(self):
+        """Convert the mapping into a ConfigTree, the mapping is left untouched
+
+        :return: new config tree
+        :type return: ConfigTree
+        """
+        if self._tree is not None:
+            return copy.deepcopy(self._tree)
+        from pyhocon.config_parser import ConfigFactory
+        return ConfigFactory.from_dict(self._mapping, root=self._root, literal_keys=True)
+
+    def as_plain_ordered_dict(self):
+        """return a deep copy of the mapping as a plain OrderedDict, see ConfigTree.as_plain_ordered_dict
+
+        :return: mapping as an OrderedDict
+        :type return: OrderedDict
+        """
+        return (self._tree if self._tree is not None else self.materialize()).as_plain_ordered_dict()
+
+    def _writable_tree(self):
+        if self._tree is None:
+            self._tree = self.materialize()
+            self._mapping = None
+        return self._tree
+
+    def with_fallback(self, config, resolve=True, persistent=False):
+        """Return a new config with fallback on config, see ConfigTree.with_fallback"""
+        return self.materialize().with_fallback(config, resolve, persistent)
+
+    def put(self, key, value, append=False):
+        self._writable_tree().put(key, value, append)
+
+    def pop(self, key, default=UndefinedKey):
+        return self._writable_tree().pop(key, default)
+
+    def __setitem__(self, key, value):
+        self._writable_tree()[key] = value
+
+    def __delitem__(self, key):
+        del self._writable_tree()[key]
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __contains__(self, item):
+        return self.get(item, NonExistentKey) is not NonExistentKey
+
+    def __iter__(self):
+        if self._tree is not None:
+            return iter(self._tree)
+        return (ConfigTree.quote_key(key) for key in self._mapping)
+
+    def __len__(self):
+        return len(self._tree if self._tree is not None else self._mapping)
+
+    def __repr__(self):  # pragma: no cover
+        return '[ConfigMapping: ' + repr(self._tree if self._tree is not None else self._mapping) + ']'
+
 
 class ConfigList(list):
     def __init__(self, iterable=[]):
@@ -538,6 +940,7 @@ class ConfigValues(object):
         for index, token in enumerate(tokens[1:]):
             tok_type = determine_type(token)
             if first_tok_type is not tok_type:
+                from pyparsing import col, lineno
                 raise ConfigWrongTypeException(
                     "Token '{token}' of type {tok_type} (index {index}) must be of type {req_tok_type} (line: {line}, col: {col})".format(
                         token=token,
@@ -555,9 +958,10 @@ class ConfigValues(object):
                     if isinstance(node, ConfigValues):
                         value = node.transform()
                         if isinstance(value, ConfigTree):
+                            # the transformed value already merges the values it overrides (walking them again
+                            # for each link of a chain of self-references is exponential)
                             child.append(value)
-                        else:
-                            break
+                        break
                     elif isinstance(node, ConfigTree):
                         child.append(node)
                     else:
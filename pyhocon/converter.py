@@ -1,14 +1,22 @@
+import binascii
+import contextlib
 import json
+import os
 import re
+import shutil
 import sys
+from collections import OrderedDict
+from datetime import timedelta
 
-from pyhocon import ConfigFactory
 from pyhocon.config_tree import ConfigQuotedString
 from pyhocon.config_tree import ConfigSubstitution
 from pyhocon.config_tree import ConfigTree
 from pyhocon.config_tree import ConfigValues
+from pyhocon.config_tree import ConfigView
 from pyhocon.config_tree import NoneValue
-from pyhocon.period_serializer import timedelta_to_str, is_timedelta_like, timedelta_to_hocon
+from pyhocon.exceptions import ConfigException
+from pyhocon.period_serializer import timedelta_to_str, is_timedelta_like, timedelta_to_hocon, relativedelta_type
+from pyhocon.tracing import span
 
 try:
     basestring
@@ -17,9 +25,342 @@ except NameError:
     unicode = str
 
 try:
-    from dateutil.relativedelta import relativedelta
-except Exception:
-    relativedelta = None
+    replace_file = os.replace
+except AttributeError:  # pragma: no cover
+    # python 2: rename overwrites the destination atomically on POSIX
+    replace_file = os.rename
+
+
+@contextlib.contextmanager
+def atomic_output(output_file):
+    """Open a temporary file renamed to output_file once the block completes
+
+    Readers never see a partial output and an error in the block (e.g., an unresolved value) leaves the previous
+    output file intact.
+
+    :param output_file: output file
+    :type output_file: basestring
+    :return: temporary file opened for writing
+    """
+    directory, name = os.path.split(os.path.abspath(output_file))
+    tmp_path = os.path.join(directory, '.{name}.{pid}.{suffix}.tmp'.format(
+        name=name, pid=os.getpid(), suffix=binascii.hexlify(os.urandom(4)).decode('ascii')))
+    # same permissions as a file created by open(), or as the file replaced
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            yield tmp_file
+        if os.path.exists(output_file):
+            shutil.copymode(output_file, tmp_path)
+        replace_file(tmp_path, output_file)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+# marks the end of the children of a node when converting with an explicit stack
+_END = object()
+
+_JSON_ESCAPED_CHARS = re.compile(r'[\x00-\x1F"\\]')
+_JSON_SCALAR_TYPES = (basestring, int, float, type(None))
+
+# same escape sequences as json.dumps, used for JSON and HOCON strings
+_STRING_ESCAPES = dict((code, u'\\u%04x' % code) for code in range(0x20))
+_STRING_ESCAPES.update({
+    ord('\b'): u'\\b',
+    ord('\t'): u'\\t',
+    ord('\n'): u'\\n',
+    ord('\f'): u'\\f',
+    ord('\r'): u'\\r',
+    ord('"'): u'\\"',
+    ord('\\'): u'\\\\',
+})
+
+_PROPERTIES_ESCAPED_CHARS = re.compile(r'[=!#\n]')
+_PROPERTIES_ESCAPES = {
+    ord('='): u'\\=',
+    ord('!'): u'\\!',
+    ord('#'): u'\\#',
+    ord('\n'): u'\\\n',
+}
+
+
+def _as_tree(config):
+    """Return the config tree of a config object that is not one (view, mapping adapter, snapshot, ...)"""
+    if isinstance(config, ConfigView):
+        # the viewed tree is only read, no need to copy it
+        return config._tree()
+    if not isinstance(config, (ConfigTree, list)) and hasattr(config, 'materialize'):
+        return config.materialize()
+    return config
+
+
+def _is_timedelta_type(value_type):
+    relativedelta = relativedelta_type()
+    return issubclass(value_type, timedelta) or relativedelta is not None and issubclass(value_type, relativedelta)
+
+
+def _format_str(emitter, value, level):
+    return str(value)
+
+
+def _format_null(emitter, value, level):
+    return 'null'
+
+
+def _format_bool(emitter, value, level):
+    return 'true' if value else 'false'
+
+
+def _format_timedelta(emitter, value, level):
+    return timedelta_to_str(value)
+
+
+class _Emitter(object):
+    """Output format written by HOCONConverter._walk
+
+    Containers are opened into frames [iterator, kind, level, first] that the walk goes through, scalars are formatted
+    by a function looked up by type. Subclasses define the chunks written around containers and entries.
+    """
+
+    # value type -> formatter, filled the first time a type is seen (subclasses have their own)
+    formatters = None
+
+    def __init__(self, compact=False, indent=2):
+        self.compact = compact
+        self.indent = indent
+
+    def resolve(self, value_type):
+        """Return the formatter of values of a type"""
+        raise NotImplementedError()
+
+    def scalar(self, value, level):
+        value_type = type(value)
+        formatter = self.formatters.get(value_type)
+        if formatter is None:
+            formatter = self.formatters[value_type] = self.resolve(value_type)
+        return formatter(self, value, level)
+
+    def open(self, value, level):
+        """Return the chunk opening a value and the frame of its children (None for scalars)"""
+        if isinstance(value, ConfigTree):
+            return self.open_tree(value, level)
+        elif isinstance(value, list):
+            return self.open_list(value, level)
+        return self.scalar(value, level), None
+
+    def open_tree(self, tree, level):
+        raise NotImplementedError()
+
+    def open_list(self, items, level):
+        raise NotImplementedError()
+
+    def entry(self, frame, item):
+        """Return the chunk written before a child, the child and its level"""
+        raise NotImplementedError()
+
+    def close(self, frame):
+        """Return the chunk closing a container"""
+        return ''
+
+
+class _JsonEmitter(_Emitter):
+    formatters = {}
+
+    def resolve(self, value_type):
+        if _is_timedelta_type(value_type):
+            return _format_timedelta
+        elif issubclass(value_type, basestring):
+            return _JsonEmitter.format_string
+        elif value_type is type(None) or issubclass(value_type, NoneValue):
+            return _format_null
+        elif issubclass(value_type, bool):
+            return _format_bool
+        return _format_str
+
+    def format_string(self, value, level):
+        return '"' + HOCONConverter._escape_string(value) + '"'
+
+    def open_tree(self, tree, level):
+        if len(tree) == 0:
+            return '{}', None
+        return '{\n', [iter(OrderedDict.items(tree)), True, level, True]
+
+    def open_list(self, items, level):
+        if len(items) == 0:
+            return '[]', None
+        return '[\n', [iter(items), False, level, True]
+
+    def entry(self, frame, item):
+        _, is_tree, level, first = frame
+        separator = '' if first else ',\n'
+        if is_tree:
+            key, item = item
+            # for dotted keys enclosed with "" to not be interpreted as nested key
+            return separator + ' ' * ((level + 1) * self.indent) + '"' + key.strip('"') + '": ', item, level + 1
+        return separator + ' ' * ((level + 1) * self.indent), item, level + 1
+
+    def close(self, frame):
+        return '\n' + ' ' * (frame[2] * self.indent) + ('}' if frame[1] else ']')
+
+
+class _HoconEmitter(_Emitter):
+    formatters = {}
+
+    def resolve(self, value_type):
+        if issubclass(value_type, basestring):
+            return _HoconEmitter.format_string
+        elif issubclass(value_type, ConfigSubstitution):
+            return _HoconEmitter.format_substitution
+        elif issubclass(value_type, ConfigQuotedString):
+            return _HoconEmitter.format_quoted_string
+        elif _is_timedelta_type(value_type):
+            return _HoconEmitter.format_timedelta
+        elif value_type is type(None) or issubclass(value_type, NoneValue):
+            return _format_null
+        elif issubclass(value_type, bool):
+            return _format_bool
+        return _format_str
+
+    def format_string(self, value, level):
+        if '\n' in value and len(value) > 1:
+            return '"""' + value + '"""'  # multilines
+        return '"' + HOCONConverter._escape_string(value) + '"'
+
+    def format_quoted_string(self, value, level):
+        return self.format_string(value.value, level)
+
+    def format_substitution(self, value, level):
+        return '${' + ('?' if value.optional else '') + value.variable + '}' + value.ws
+
+    def format_timedelta(self, value, level):
+        return timedelta_to_hocon(value)
+
+    def open(self, value, level):
+        if isinstance(value, ConfigValues):
+            return '', [iter(value.tokens), 'values', level, True]
+        return _Emitter.open(self, value, level)
+
+    def open_tree(self, tree, level):
+        if len(tree) == 0:
+            return '{}', None
+        # don't display { at root level
+        return '{\n' if level > 0 else '', [iter(OrderedDict.items(tree)), 'tree', level, True]
+
+    def open_list(self, items, level):
+        if len(items) == 0:
+            return '[]', None
+        return '[\n', [iter(items), 'list', level, True]
+
+    def entry(self, frame, item):
+        _, kind, level, first = frame
+        separator = '' if first else '\n'
+        if kind == 'tree':
+            key, item = item
+            full_key = key
+            if self.compact:
+                while isinstance(item, ConfigTree) and len(item) == 1:
+                    key, item = next(iter(OrderedDict.items(item)))
+                    full_key += '.' + key
+            return separator + ' ' * (level * self.indent) + full_key + ('' if isinstance(item, dict) else ' =') + ' ', \
+                item, level + 1
+        elif kind == 'list':
+            return separator + ' ' * (level * self.indent), item, level + 1
+        # tokens of a concatenation are written next to each other at the same level
+        return '', item, level
+
+    def close(self, frame):
+        kind, level = frame[1], frame[2]
+        if kind == 'list':
+            return '\n' + ' ' * ((level - 1) * self.indent) + ']'
+        elif kind == 'tree' and level > 0:
+            return '\n' + ' ' * ((level - 1) * self.indent) + '}'
+        return ''
+
+
+class _YamlEmitter(_Emitter):
+    formatters = {}
+
+    def resolve(self, value_type):
+        if _is_timedelta_type(value_type):
+            return _format_timedelta
+        elif issubclass(value_type, basestring):
+            return _YamlEmitter.format_string
+        elif value_type is type(None) or issubclass(value_type, NoneValue):
+            return _format_null
+        elif issubclass(value_type, bool):
+            return _format_bool
+        return _format_str
+
+    def format_string(self, value, level):
+        # if it contains a \n then it's multiline
+        if '\n' not in value:
+            return value
+        return '|\n' + '\n'.join([line.rjust(level * self.indent, ' ') for line in value.split('\n')])
+
+    def open_tree(self, tree, level):
+        if len(tree) == 0:
+            return '', None
+        return '\n' if level > 0 else '', [iter(OrderedDict.items(tree)), True, level, True]
+
+    def open_list(self, items, level):
+        items = [item for item in items if item is not None]
+        if len(items) == 0:
+            return '[]', None
+        return '\n', [iter(items), False, level, True]
+
+    def entry(self, frame, item):
+        _, is_tree, level, first = frame
+        separator = '' if first else '\n'
+        if is_tree:
+            key, item = item
+            # for dotted keys enclosed with "" to not be interpreted as nested key
+            return separator + ' ' * (level * self.indent) + key.strip('"') + ': ', item, level + 1
+        return separator + ' ' * (level * self.indent) + '- ', item, level + 1
+
+
+class _PropertiesEmitter(_Emitter):
+    """Emits (dotted key, escaped value) entries, the level of a value is its dotted key (None at the root)"""
+
+    formatters = {}
+
+    def resolve(self, value_type):
+        if value_type is type(None) or issubclass(value_type, NoneValue):
+            return _PropertiesEmitter.format_null
+        elif _is_timedelta_type(value_type):
+            return _format_timedelta
+        elif issubclass(value_type, basestring):
+            return _PropertiesEmitter.format_string
+        elif issubclass(value_type, bool):
+            return _format_bool
+        return _format_str
+
+    def format_null(self, value, level):
+        return None
+
+    def format_string(self, value, level):
+        if _PROPERTIES_ESCAPED_CHARS.search(value) is None:
+            return value
+        if isinstance(value, unicode):
+            return value.translate(_PROPERTIES_ESCAPES)
+        return value.replace('=', '\\=').replace('!', '\\!').replace('#', '\\#').replace('\n', '\\\n')
+
+    def open(self, value, level):
+        if isinstance(value, ConfigTree):
+            return None, [((key.strip('"'), item) for key, item in OrderedDict.items(value)), True, level, True]
+        elif isinstance(value, list):
+            return None, [((str(index), item) for index, item in enumerate(value)), False, level, True]
+        value = self.scalar(value, level)
+        if value is None:
+            return None, None
+        return ('' if level is None else level, value), None
+
+    def entry(self, frame, item):
+        key, item = item
+        return None, item, key if frame[2] is None else frame[2] + '.' + key
+
+    def close(self, frame):
+        return None
 
 
 class HOCONConverter(object):
@@ -30,49 +371,63 @@ class HOCONConverter(object):
         :return: JSON string representation
         :type return: basestring
         """
-        lines = ""
-        if isinstance(config, ConfigTree):
-            if len(config) == 0:
-                lines += '{}'
-            else:
-                lines += '{\n'
-                bet_lines = []
-                for key, item in config.items():
-                    new_key = key.strip('"')  # for dotted keys enclosed with "" to not be interpreted as nested key
-                    new_value = cls.to_json(item, compact, indent, level + 1)
-                    bet_lines.append('{indent}"{key}": {value}'.format(
-                        indent=''.rjust((level + 1) * indent, ' '),
-                        key=new_key,
-                        value=new_value)
-                    )
-                lines += ',\n'.join(bet_lines)
-                lines += '\n{indent}}}'.format(indent=''.rjust(level * indent, ' '))
-        elif isinstance(config, list):
-            if len(config) == 0:
-                lines += '[]'
+        return ''.join(cls._walk(config, _JsonEmitter(compact, indent), level))
+
+    @classmethod
+    def to_json_fast(cls, config, compact=False, indent=2):
+        """Convert a resolved HOCON input into a JSON output using the json module
+
+        The config is converted into plain dicts and lists once and encoded with the json module which is much faster
+        than to_json and gives the same output. Configs that cannot give the same output that way (e.g., unresolved
+        values or keys that would need to be escaped) are converted with to_json.
+
+        :return: JSON string representation
+        :type return: basestring
+        """
+        obj = cls._as_json_obj(config)
+        if obj is None:
+            return cls.to_json(config, compact, indent)
+        return json.dumps(obj, ensure_ascii=False, indent=indent, default=cls._json_default)
+
+    @classmethod
+    def _as_json_obj(cls, config):
+        """Return config as plain dicts and lists if the json module gives the same output as to_json, None otherwise"""
+        config = _as_tree(config)
+        if not isinstance(config, ConfigTree):
+            return None
+        try:
+            obj = config.as_dict()
+        except ConfigException:
+            return None
+
+        # the json module encodes nested containers recursively
+        max_depth = sys.getrecursionlimit() // 4
+        stack = [(obj, 0)]
+        while stack:
+            value, depth = stack.pop()
+            if depth > max_depth:
+                return None
+            if isinstance(value, dict):
+                # to_json writes the keys as they are while the json module escapes them
+                if _JSON_ESCAPED_CHARS.search(''.join(value)):
+                    return None
+                children = value.values()
             else:
-                lines += '[\n'
-                bet_lines = []
-                for item in config:
-                    bet_lines.append('{indent}{value}'.format(
-                        indent=''.rjust((level + 1) * indent, ' '),
-                        value=cls.to_json(item, compact, indent, level + 1))
-                    )
-                lines += ',\n'.join(bet_lines)
-                lines += '\n{indent}]'.format(indent=''.rjust(level * indent, ' '))
-        elif is_timedelta_like(config):
-            lines += timedelta_to_str(config)
-        elif isinstance(config, basestring):
-            lines = json.dumps(config, ensure_ascii=False)
-        elif config is None or isinstance(config, NoneValue):
-            lines = 'null'
-        elif config is True:
-            lines = 'true'
-        elif config is False:
-            lines = 'false'
-        else:
-            lines = str(config)
-        return lines
+                children = value
+            for child in children:
+                if isinstance(child, (dict, list)):
+                    stack.append((child, depth + 1))
+                elif isinstance(child, float):
+                    # to_json writes inf and nan as they are
+                    if child != child or child in (float('inf'), float('-inf')):
+                        return None
+                elif not isinstance(child, _JSON_SCALAR_TYPES) and not is_timedelta_like(child):
+                    return None
+        return obj
+
+    @staticmethod
+    def _json_default(value):
+        return int(timedelta_to_str(value))
 
     @classmethod
     def to_hocon(cls, config, compact=False, indent=2, level=0):
@@ -81,73 +436,7 @@ class HOCONConverter(object):
         :return: JSON string representation
         :type return: basestring
         """
-        lines = ""
-        if isinstance(config, ConfigTree):
-            if len(config) == 0:
-                lines += '{}'
-            else:
-                if level > 0:  # don't display { at root level
-                    lines += '{\n'
-                bet_lines = []
-
-                for key, item in config.items():
-                    if compact:
-                        full_key = key
-                        while isinstance(item, ConfigTree) and len(item) == 1:
-                            key, item = next(iter(item.items()))
-                            full_key += '.' + key
-                    else:
-                        full_key = key
-
-                    bet_lines.append('{indent}{key}{assign_sign} {value}'.format(
-                        indent=''.rjust(level * indent, ' '),
-                        key=full_key,
-                        assign_sign='' if isinstance(item, dict) else ' =',
-                        value=cls.to_hocon(item, compact, indent, level + 1))
-                    )
-                lines += '\n'.join(bet_lines)
-
-                if level > 0:  # don't display { at root level
-                    lines += '\n{indent}}}'.format(indent=''.rjust((level - 1) * indent, ' '))
-        elif isinstance(config, list):
-            if len(config) == 0:
-                lines += '[]'
-            else:
-                lines += '[\n'
-                bet_lines = []
-                for item in config:
-                    bet_lines.append('{indent}{value}'.format(indent=''.rjust(level * indent, ' '),
-                                                              value=cls.to_hocon(item, compact, indent, level + 1)))
-                lines += '\n'.join(bet_lines)
-                lines += '\n{indent}]'.format(indent=''.rjust((level - 1) * indent, ' '))
-        elif isinstance(config, basestring):
-            if '\n' in config and len(config) > 1:
-                lines = '"""{value}"""'.format(value=config)  # multilines
-            else:
-                lines = '"{value}"'.format(value=cls._escape_string(config))
-        elif isinstance(config, ConfigValues):
-            lines = ''.join(cls.to_hocon(o, compact, indent, level) for o in config.tokens)
-        elif isinstance(config, ConfigSubstitution):
-            lines = '${'
-            if config.optional:
-                lines += '?'
-            lines += config.variable + '}' + config.ws
-        elif isinstance(config, ConfigQuotedString):
-            if '\n' in config.value and len(config.value) > 1:
-                lines = '"""{value}"""'.format(value=config.value)  # multilines
-            else:
-                lines = '"{value}"'.format(value=cls._escape_string(config.value))
-        elif is_timedelta_like(config):
-            lines += timedelta_to_hocon(config)
-        elif config is None or isinstance(config, NoneValue):
-            lines = 'null'
-        elif config is True:
-            lines = 'true'
-        elif config is False:
-            lines = 'false'
-        else:
-            lines = str(config)
-        return lines
+        return ''.join(cls._walk(config, _HoconEmitter(compact, indent), level))
 
     @classmethod
     def to_yaml(cls, config, compact=False, indent=2, level=0):
@@ -156,48 +445,7 @@ class HOCONConverter(object):
         :return: YAML string representation
         :type return: basestring
         """
-        lines = ""
-        if isinstance(config, ConfigTree):
-            if len(config) > 0:
-                if level > 0:
-                    lines += '\n'
-                bet_lines = []
-                for key, item in config.items():
-                    bet_lines.append('{indent}{key}: {value}'.format(
-                        indent=''.rjust(level * indent, ' '),
-                        key=key.strip('"'),  # for dotted keys enclosed with "" to not be interpreted as nested key,
-                        value=cls.to_yaml(item, compact, indent, level + 1))
-                    )
-                lines += '\n'.join(bet_lines)
-        elif isinstance(config, list):
-            config_list = [line for line in config if line is not None]
-            if len(config_list) == 0:
-                lines += '[]'
-            else:
-                lines += '\n'
-                bet_lines = []
-                for item in config_list:
-                    bet_lines.append('{indent}- {value}'.format(indent=''.rjust(level * indent, ' '),
-                                                                value=cls.to_yaml(item, compact, indent, level + 1)))
-                lines += '\n'.join(bet_lines)
-        elif is_timedelta_like(config):
-            lines += timedelta_to_str(config)
-        elif isinstance(config, basestring):
-            # if it contains a \n then it's multiline
-            lines = config.split('\n')
-            if len(lines) == 1:
-                lines = config
-            else:
-                lines = '|\n' + '\n'.join([line.rjust(level * indent, ' ') for line in lines])
-        elif config is None or isinstance(config, NoneValue):
-            lines = 'null'
-        elif config is True:
-            lines = 'true'
-        elif config is False:
-            lines = 'false'
-        else:
-            lines = str(config)
-        return lines
+        return ''.join(cls._walk(config, _YamlEmitter(compact, indent), level))
 
     @classmethod
     def to_properties(cls, config, compact=False, indent=2, key_stack=None):
@@ -207,47 +455,153 @@ class HOCONConverter(object):
         :type return: basestring
         :return:
         """
-        key_stack = key_stack or []
-
-        def escape_value(value):
-            return value.replace('=', '\\=').replace('!', '\\!').replace('#', '\\#').replace('\n', '\\\n')
-
-        stripped_key_stack = [key.strip('"') for key in key_stack]
-        lines = []
-        if isinstance(config, ConfigTree):
-            for key, item in config.items():
-                if item is not None:
-                    lines.append(cls.to_properties(item, compact, indent, stripped_key_stack + [key]))
-        elif isinstance(config, list):
-            for index, item in enumerate(config):
-                if item is not None:
-                    lines.append(cls.to_properties(item, compact, indent, stripped_key_stack + [str(index)]))
-        elif is_timedelta_like(config):
-            lines.append('.'.join(stripped_key_stack) + ' = ' + timedelta_to_str(config))
-        elif isinstance(config, basestring):
-            lines.append('.'.join(stripped_key_stack) + ' = ' + escape_value(config))
-        elif config is True:
-            lines.append('.'.join(stripped_key_stack) + ' = true')
-        elif config is False:
-            lines.append('.'.join(stripped_key_stack) + ' = false')
-        elif config is None or isinstance(config, NoneValue):
-            pass
+        prefix = '.'.join([key.strip('"') for key in key_stack]) if key_stack else None
+        return '\n'.join([key + ' = ' + value for key, value in cls._walk(config, _PropertiesEmitter(), prefix)])
+
+    @classmethod
+    def iter_properties(cls, config):
+        """Iterate over the .properties entries of a config
+
+        Entries are produced one by one from a single key stack, null values and empty objects or lists have no entry.
+
+        :param config: config to convert
+        :return: iterator of (dotted key, escaped value)
+        """
+        return cls._walk(config, _PropertiesEmitter(), None)
+
+    @classmethod
+    def _iter_properties_lines(cls, config, compact=False, indent=2):
+        separator = ''
+        for key, value in cls.iter_properties(config):
+            yield separator + key + ' = ' + value
+            separator = '\n'
+
+    @classmethod
+    def iter_json(cls, config, compact=False, indent=2, level=0):
+        """Convert HOCON input into JSON output chunks
+
+        Same output as to_json but produced chunk by chunk.
+
+        :return: iterator over the chunks of the JSON string representation
+        :type return: iterator
+        """
+        return cls._walk(config, _JsonEmitter(compact, indent), level)
+
+    @classmethod
+    def iter_hocon(cls, config, compact=False, indent=2, level=0):
+        """Convert HOCON input into HOCON output chunks
+
+        Same output as to_hocon but produced chunk by chunk.
+
+        :return: iterator over the chunks of the HOCON string representation
+        :type return: iterator
+        """
+        return cls._walk(config, _HoconEmitter(compact, indent), level)
+
+    @classmethod
+    def iter_yaml(cls, config, compact=False, indent=2, level=0):
+        """Convert HOCON input into YAML output chunks
+
+        Same output as to_yaml but produced chunk by chunk.
+
+        :return: iterator over the chunks of the YAML string representation
+        :type return: iterator
+        """
+        return cls._walk(config, _YamlEmitter(compact, indent), level)
+
+    @classmethod
+    def _walk(cls, config, emitter, level=0):
+        """Go through a config with an explicit stack (no recursion) and yield the output of an emitter"""
+        config = _as_tree(config)
+        output, frame = emitter.open(config, level)
+        if output:
+            yield output
+        stack = [frame] if frame else []
+        while stack:
+            frame = stack[-1]
+            item = next(frame[0], _END)
+            if item is _END:
+                stack.pop()
+                output = emitter.close(frame)
+                if output:
+                    yield output
+                continue
+
+            prefix, item, child_level = emitter.entry(frame, item)
+            frame[3] = False
+            output, child_frame = emitter.open(item, child_level)
+            if prefix is not None:
+                output = prefix + output
+            if output:
+                yield output
+            if child_frame:
+                stack.append(child_frame)
+
+    @classmethod
+    def write(cls, config, fd, output_format='json', indent=2, compact=False):
+        """Write HOCON input into a file-like object incrementally
+
+        :param config: config to convert
+        :param fd: file-like object to write to
+        :param output_format: json, properties, yaml or hocon
+        """
+        writers = {
+            'json': cls.iter_json,
+            'properties': cls._iter_properties_lines,
+            'yaml': cls.iter_yaml,
+            'hocon': cls.iter_hocon,
+        }
+
+        with span('convert', format=output_format) as attributes:
+            obj = cls._as_json_obj(config) if output_format == 'json' else None
+            if obj is not None:
+                chunks = json.JSONEncoder(ensure_ascii=False, indent=indent, default=cls._json_default).iterencode(obj)
+            elif output_format in writers:
+                chunks = writers[output_format](config, compact, indent)
+            else:
+                chunks = [cls.convert(config, output_format, indent, compact)]
+            length = 0
+            for chunk in chunks:
+                fd.write(chunk)
+                length += len(chunk)
+            if attributes is not None:
+                attributes['length'] = length
+
+    @classmethod
+    def to_snapshot(cls, config, output_file):
+        """Write a resolved config as a binary snapshot that can be loaded with ConfigFactory.load_snapshot
+
+        :param config: resolved config
+        :type config: ConfigTree
+        :param output_file: output filename or binary file-like object
+        """
+        from pyhocon.snapshot import dump_snapshot
+
+        if isinstance(output_file, basestring):
+            with open(output_file, 'wb') as fd:
+                dump_snapshot(config, fd)
         else:
-            lines.append('.'.join(stripped_key_stack) + ' = ' + str(config))
-        return '\n'.join([line for line in lines if len(line) > 0])
+            dump_snapshot(config, output_file)
 
     @classmethod
     def convert(cls, config, output_format='json', indent=2, compact=False):
         converters = {
-            'json': cls.to_json,
+            'json': cls.to_json_fast,
             'properties': cls.to_properties,
             'yaml': cls.to_yaml,
             'hocon': cls.to_hocon,
         }
 
-        if output_format in converters:
-            return converters[output_format](config, compact, indent)
-        else:
+        cls._check_format(output_format)
+        with span('convert', format=output_format) as attributes:
+            output = converters[output_format](config, compact, indent)
+            if attributes is not None:
+                attributes['length'] = len(output)
+            return output
+
+    @classmethod
+    def _check_format(cls, output_format):
+        if output_format not in ['json', 'properties', 'yaml', 'hocon']:
             raise Exception("Invalid format '{format}'. Format must be 'json', 'properties', 'yaml' or 'hocon'".format(
                 format=output_format))
 
@@ -260,6 +614,7 @@ class HOCONConverter(object):
         :param output_format: json, properties or yaml
         :return: json, properties or yaml string representation
         """
+        from pyhocon.config_parser import ConfigFactory
 
         if input_file is None:
             content = sys.stdin.read()
@@ -267,12 +622,15 @@ class HOCONConverter(object):
         else:
             config = ConfigFactory.parse_file(input_file)
 
-        res = cls.convert(config, output_format, indent, compact)
+        cls._check_format(output_format)
         if output_file is None:
-            print(res)
+            cls.write(config, sys.stdout, output_format, indent, compact)
+            sys.stdout.write('\n')
         else:
-            with open(output_file, "w") as fd:
-                fd.write(res)
+            # the output is streamed to a temporary file renamed once complete so that a conversion error (e.g., an
+            # unresolved value) does not leave a truncated output file
+            with atomic_output(output_file) as fd:
+                cls.write(config, fd, output_format, indent, compact)
 
     @classmethod
     def _escape_match(cls, match):
@@ -289,5 +647,8 @@ class HOCONConverter(object):
 
     @classmethod
     def _escape_string(cls, string):
-        return re.sub(r'[\x00-\x1F"\\]', cls._escape_match, string)
-
+        if _JSON_ESCAPED_CHARS.search(string) is None:
+            return string
+        if isinstance(string, unicode):
+            return string.translate(_STRING_ESCAPES)
+        return _JSON_ESCAPED_CHARS.sub(cls._escape_match, string)
@@ -1,7 +1,7 @@
-import itertools
+import re
 from datetime import timedelta
 
-from pyparsing import (Word, ZeroOrMore, alphanums, Or, nums, WordEnd, Combine, Literal)
+from pyparsing import ParseException, Regex
 
 period_type_map = {
     'nanoseconds': ['ns', 'nano', 'nanos', 'nanosecond', 'nanoseconds'],
@@ -28,15 +28,19 @@ except ImportError:
     period_impl = timedelta
 
 
-def convert_period(tokens):
-    period_value = int(tokens.value)
-    period_identifier = tokens.unit
+# unit alias -> unit (e.g., 'ms' -> 'milliseconds')
+period_units = dict((alias, unit) for unit, aliases in period_type_map.items() for alias in aliases)
+
+# number and unit alias (the longest aliases first) separated by spaces only (e.g., '10<TAB>weeks' is not a period)
+# and not followed by a letter or digit (e.g., 'weeks' is not 'w' and 'eeks')
+PERIOD_PATTERN = r'(?P<value>[0-9]+) *(?P<unit>{units})(?![a-zA-Z0-9])'.format(
+    units='|'.join(sorted(period_units, key=len, reverse=True)))
 
-    period_unit = next((single_unit for single_unit, values
-                        in period_type_map.items()
-                        if period_identifier in values))
+_period_re = re.compile(PERIOD_PATTERN)
 
-    return period(period_value, period_unit)
+
+def convert_period(tokens):
+    return period(int(tokens.value), period_units[tokens.unit])
 
 
 def period(period_value, period_unit):
@@ -53,19 +57,12 @@ def period(period_value, period_unit):
 
 
 def get_period_expr():
-    # Flatten the list of lists with unit strings.
-    period_types = list(itertools.chain(*period_type_map.values()))
-    # `Or()` tries to match the longest expression if more expressions
-    # are matching. We employ this to match e.g.: 'weeks' so that we
-    # don't end up with 'w' and 'eeks'. Note that 'weeks' but also 'w'
-    # are valid unit identifiers.
-    # Allow only spaces as a valid separator between value and unit.
-    # E.g. \t as a separator is invalid: '10<TAB>weeks'.
-    return Combine(
-            Word(nums)('value') + ZeroOrMore(Literal(" ")).suppress() + Or(period_types)('unit') + WordEnd(
-        alphanums).suppress()
-    ).setParseAction(convert_period)
+    return Regex(PERIOD_PATTERN).setParseAction(convert_period)
 
 
 def parse_period(content):
-    return get_period_expr().parseString(content, parseAll=True)[0]
+    content = content.strip(' \t\r\n')
+    match = _period_re.match(content)
+    if match is None or match.end() != len(content):
+        raise ParseException(content, 0, 'Expected a period')
+    return period(int(match.group('value')), period_units[match.group('unit')])
@@ -1,18 +1,46 @@
+import sys
 from datetime import timedelta
 
-try:
-    from dateutil.relativedelta import relativedelta
-except Exception:
-    relativedelta = None
+if sys.version_info < (3, 7):  # pragma: no cover
+    try:
+        from dateutil.relativedelta import relativedelta
+    except Exception:
+        relativedelta = None
+else:
+    def __getattr__(name):
+        # dateutil is only imported when the relativedelta attribute is used
+        if name == 'relativedelta':
+            try:
+                from dateutil.relativedelta import relativedelta
+            except Exception:
+                relativedelta = None
+            globals()['relativedelta'] = relativedelta
+            return relativedelta
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def relativedelta_type():
+    """Return the relativedelta class if dateutil was imported, None otherwise
+
+    Periods in months or years are parsed as relativedelta, which imports dateutil, so there cannot be any
+    relativedelta value before and dateutil does not need to be imported to check the type of values.
+    """
+    module = sys.modules.get('dateutil.relativedelta')
+    return None if module is None else module.relativedelta
+
+
+def is_relativedelta(config):
+    relativedelta = relativedelta_type()
+    return relativedelta is not None and isinstance(config, relativedelta)
 
 
 def is_timedelta_like(config):
-    return isinstance(config, timedelta) or relativedelta is not None and isinstance(config, relativedelta)
+    return isinstance(config, timedelta) or is_relativedelta(config)
 
 
 def timedelta_to_hocon(config):
     """:type config: timedelta|relativedelta"""
-    if relativedelta is not None and isinstance(config, relativedelta):
+    if is_relativedelta(config):
         if config.hours > 0:
             return str(config.hours) + ' hours'
         elif config.minutes > 0:
@@ -38,7 +66,7 @@ def relative_delta_to_timedelta(relative_delta):
 
 
 def timedelta_to_str(config):
-    if relativedelta is not None and isinstance(config, relativedelta):
+    if is_relativedelta(config):
         time_delta = relative_delta_to_timedelta(config)
     else:
         time_delta = config
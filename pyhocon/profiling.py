@@ -0,0 +1,226 @@
+"""Memory used to load a config, measured with tracemalloc
+
+profile_memory() loads (and optionally converts) a config while tracing the memory allocations and returns, for each
+phase (see pyhocon.tracing), the peak memory used during the phase and the memory still allocated at its end, with a
+breakdown of the objects retained by the loaded config:
+
+    profile = profile_memory('app.conf', output_format='json')
+    print(profile.format())
+
+The same report is printed by the conversion tool with --profile-memory.
+"""
+import gc
+import sys
+import types
+from collections import OrderedDict
+
+from pyhocon.config_tree import ConfigTree
+from pyhocon.exceptions import ConfigException
+from pyhocon.tracing import Tracer, tracing
+
+try:
+    basestring
+except NameError:  # pragma: no cover
+    basestring = str
+
+# objects shared by everything in the process rather than retained by a config
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+HISTORY = 'history'
+SOURCE_STRINGS = 'source strings'
+
+
+def _tracemalloc():
+    try:
+        import tracemalloc
+    except ImportError:  # pragma: no cover
+        raise ConfigException('Memory profiling requires tracemalloc (python 3.4+)')
+    return tracemalloc
+
+
+class PhaseMemory(object):
+    """Memory used by the calls of a phase"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        # highest memory allocated during a call above the memory allocated at its beginning (bytes)
+        self.peak = 0
+        # memory allocated by the calls and not released at their end (bytes)
+        self.retained = 0
+
+    def __repr__(self):  # pragma: no cover
+        return '[PhaseMemory: {name} calls={calls} peak={peak} retained={retained}]'.format(**self.__dict__)
+
+
+class MemoryTracer(Tracer):
+    """Tracer measuring the memory used by each phase, tracemalloc must be tracing
+
+    Phases are inclusive: the parse phase of a file includes the include phases of the files it includes. The memory
+    of a call nested in a call of the same phase (e.g., the parse of an included file) is counted by the outer call.
+    Memory is traced for the whole process, so other threads should not allocate while profiling.
+    Before python 3.9 the peak memory cannot be reset at the beginning of each phase and the peak of a phase is the
+    peak since the beginning of the profiling.
+    """
+
+    def __init__(self):
+        self.tracemalloc = _tracemalloc()
+        self.phases = OrderedDict()
+        # [phase, memory at the beginning, peak] of the phases in progress, the innermost last
+        self._frames = []
+
+    def _measure(self):
+        current, peak = self.tracemalloc.get_traced_memory()
+        for frame in self._frames:
+            frame[2] = max(frame[2], peak)
+        if hasattr(self.tracemalloc, 'reset_peak'):
+            self.tracemalloc.reset_peak()
+        return current
+
+    def begin(self, phase, attributes):
+        if phase not in self.phases:
+            self.phases[phase] = PhaseMemory(phase)
+        current = self._measure()
+        self._frames.append([phase, current, current])
+
+    def end(self, phase, attributes, error=None):
+        current = self._measure()
+        _, start, peak = self._frames.pop()
+        memory = self.phases[phase]
+        memory.calls += 1
+        if all(frame[0] != phase for frame in self._frames):
+            memory.peak = max(memory.peak, peak - start)
+            memory.retained += current - start
+
+
+class MemoryProfile(object):
+    """Memory used to load a config"""
+
+    def __init__(self, phases, objects, retained, peak, config, output=None):
+        """
+        :param phases: memory used by each phase
+        :type phases: list of PhaseMemory
+        :param objects: (count, size in bytes) of the objects retained by the config by category (type name, history
+            or source strings)
+        :type objects: dict
+        :param retained: memory allocated by the loading and not released (bytes)
+        :param peak: highest memory allocated during the loading and conversion (bytes)
+        :param config: loaded config
+        :param output: converted config
+        """
+        self.phases = phases
+        self.objects = objects
+        self.retained = retained
+        self.peak = peak
+        self.config = config
+        self.output = output
+
+    def format(self):
+        """Return the profile as a text report"""
+        lines = ['{phase:<24} {calls:>8} {peak:>12} {retained:>14}'.format(
+            phase='phase', calls='calls', peak='peak KiB', retained='retained KiB')]
+        for memory in self.phases:
+            lines.append('{phase:<24} {calls:>8} {peak:>12.1f} {retained:>14.1f}'.format(
+                phase=memory.name, calls=memory.calls, peak=memory.peak / 1024.0, retained=memory.retained / 1024.0))
+        lines.append('{phase:<24} {calls:>8} {peak:>12.1f} {retained:>14.1f}'.format(
+            phase='total', calls='', peak=self.peak / 1024.0, retained=self.retained / 1024.0))
+        lines.append('')
+        lines.append('{category:<24} {count:>8} {size:>12}'.format(category='retained by the config', count='objects',
+                                                                   size='KiB'))
+        for category, (count, size) in sorted(self.objects.items(), key=lambda item: -item[1][1]):
+            lines.append('{category:<24} {count:>8} {size:>12.1f}'.format(category=category, count=count,
+                                                                          size=size / 1024.0))
+        return '\n'.join(lines) + '\n'
+
+
+def retained_objects(config):
+    """Return the objects reachable from a config by category
+
+    Objects are categorized by type name except the history of the root config (the dict and the lists of overridden
+    values kept to resolve self-references) and the source strings (the parsed contents kept by the parsed values to
+    report the position of errors). The instance dict of an object is counted with the object.
+
+    :param config: config
+    :return: (number of objects, size in bytes) by category
+    :type return: dict
+    """
+    objects = {}
+    history = set()
+    sources = set()
+    stack = [config]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in objects or isinstance(obj, _SHARED_TYPES):
+            continue
+        size = sys.getsizeof(obj)
+        referents = gc.get_referents(obj)
+        attributes = obj.__dict__ if isinstance(getattr(obj, '__dict__', None), dict) else None
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+            referents = [referent for referent in referents if referent is not attributes]
+            referents.extend(attributes.values())
+            if isinstance(obj, ConfigTree) and isinstance(attributes.get('history'), dict):
+                history.add(id(attributes['history']))
+                history.update(id(values) for values in attributes['history'].values())
+            for name in ['instring', '_instring']:
+                if isinstance(attributes.get(name), basestring):
+                    sources.add(id(attributes[name]))
+        objects[id(obj)] = (obj, size)
+        stack.extend(referents)
+
+    categories = {}
+    for key, (obj, size) in objects.items():
+        if key in history:
+            category = HISTORY
+        elif key in sources:
+            category = SOURCE_STRINGS
+        else:
+            category = type(obj).__name__
+        count, total = categories.get(category, (0, 0))
+        categories[category] = (count + 1, total + size)
+    return categories
+
+
+def profile_memory(input_file=None, content=None, output_format=None, indent=2, compact=False, basedir=None):
+    """Load a config while tracing the memory allocations
+
+    :param input_file: file to load
+    :type input_file: basestring
+    :param content: content to parse if no file is given
+    :type content: basestring
+    :param output_format: format to convert the config to (json, properties, yaml or hocon), not converted if None
+    :type output_format: basestring
+    :param indent: indentation step of the output
+    :param compact: compact output
+    :param basedir: directory of the files included by content
+    :return: memory profile
+    :type return: MemoryProfile
+    """
+    from pyhocon.config_parser import ConfigFactory, ConfigParser
+    from pyhocon.converter import HOCONConverter
+
+    if input_file is None and content is None:
+        raise ConfigException('An input file or a content is required to profile the memory')
+    tracemalloc = _tracemalloc()
+    # the grammar is built once per process, it is not part of the memory used by a config
+    ConfigParser._get_grammar()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracer = MemoryTracer()
+        with tracing(tracer):
+            tracer.begin('total', {})
+            if input_file is not None:
+                config = ConfigFactory.parse_file(input_file)
+            else:
+                config = ConfigFactory.parse_string(content, basedir)
+            retained = tracemalloc.get_traced_memory()[0] - tracer._frames[0][1]
+            output = None if output_format is None else HOCONConverter.convert(config, output_format, indent, compact)
+            tracer.end('total', {})
+        total = tracer.phases.pop('total')
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    return MemoryProfile(list(tracer.phases.values()), retained_objects(config), retained, total.peak, config, output)
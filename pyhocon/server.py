@@ -0,0 +1,309 @@
+"""Serve a config to the processes of a host over a Unix domain socket
+
+The server parses and resolves the config once, reloads it when the file or one of its includes changes and answers
+queries from ConfigClient. Requests are UTF-8 lines:
+
+- ``get`` or ``get <path>``: value of the config or at a path
+- ``generation``: generation of the served config (incremented by each reload)
+
+Each response is a status byte and the length of the payload (little-endian unsigned 32-bit integer) followed by the
+payload. The payload of a value (status ``V``) is a snapshot (see pyhocon.snapshot), decoded lazily by the client.
+Errors have the status ``M`` (missing key), ``W`` (wrong type) or ``E`` and an UTF-8 message as payload.
+"""
+import errno
+import io
+import logging
+import os
+import socket
+import struct
+import threading
+from collections import OrderedDict
+
+try:
+    import socketserver
+except ImportError:  # pragma: no cover
+    # python 2
+    import SocketServer as socketserver
+
+from pyhocon.config_tree import ConfigGetterMixin, NonExistentKey, UndefinedKey
+from pyhocon.exceptions import ConfigException, ConfigMissingException, ConfigWrongTypeException
+from pyhocon.snapshot import decode_snapshot, dump_snapshot
+
+_RESPONSE = struct.Struct('<cI')
+
+STATUS_VALUE = b'V'
+STATUS_MISSING = b'M'
+STATUS_WRONG_TYPE = b'W'
+STATUS_ERROR = b'E'
+
+_ERRORS = {
+    STATUS_MISSING: ConfigMissingException,
+    STATUS_WRONG_TYPE: ConfigWrongTypeException,
+    STATUS_ERROR: ConfigException,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_value(value, generation):
+    fd = io.BytesIO()
+    dump_snapshot(value, fd, generation)
+    return _response(STATUS_VALUE, fd.getvalue())
+
+
+def _response(status, payload):
+    return _RESPONSE.pack(status, len(payload)) + payload
+
+
+def _error_response(status, exception):
+    # the message without the quotes added by KeyError.__str__ (ConfigMissingException)
+    message = exception.args[0] if exception.args else u''
+    return _response(status, u'{message}'.format(message=message).encode('utf-8'))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            self.wfile.write(self.server.config_server.respond(line.decode('utf-8').rstrip('\n')))
+
+
+class ConfigServer(object):
+    """Parse a config file once and answer the queries of ConfigClient over a Unix domain socket"""
+
+    def __init__(self, input_file, socket_path, interval=1.0, max_responses=1024):
+        """
+        :param input_file: config file to serve
+        :type input_file: basestring
+        :param socket_path: path of the Unix domain socket
+        :type socket_path: basestring
+        :param interval: seconds between two checks of the files for changes
+        :type interval: float
+        :param max_responses: highest number of encoded responses kept for the paths queried the most recently
+        :type max_responses: int
+        """
+        if not hasattr(socketserver, 'ThreadingUnixStreamServer'):  # pragma: no cover
+            raise ConfigException("Unix domain sockets are not supported on this platform")
+        self.input_file = input_file
+        self.socket_path = socket_path
+        self.interval = interval
+        self.max_responses = max_responses
+        self._stats = None
+        # (generation, config, encoded responses by path, least recently used first) replaced as a whole by reload()
+        self._state = (0, None, OrderedDict())
+        self._responses_lock = threading.Lock()
+        self._server = None
+        self._stopped = threading.Event()
+
+    @property
+    def generation(self):
+        """Generation of the served config (0 if it was never loaded)"""
+        return self._state[0]
+
+    @staticmethod
+    def _stat(filename):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size, stat.st_ino
+
+    def changed(self):
+        """Return True if the input file or one of the files it includes changed since the last reload"""
+        return self._stats is None or any(self._stat(filename) != stat for filename, stat in self._stats.items())
+
+    def reload(self):
+        """Parse the input file again if it changed
+
+        Exceptions raised by the parser are propagated and the previous config keeps being served.
+
+        :return: True if a new generation is served
+        :type return: boolean
+        """
+        from pyhocon.config_parser import ConfigFactory
+
+        if not self.changed():
+            return False
+        with ConfigFactory.record_files() as files:
+            try:
+                config = ConfigFactory.parse_file(self.input_file)
+            finally:
+                self._stats = dict((filename, self._stat(filename)) for filename in [self.input_file] + files)
+        self._state = (self.generation + 1, config, OrderedDict())
+        return True
+
+    def respond(self, request):
+        """Return the encoded response to a request"""
+        generation, config, responses = self._state
+        command, _, path = request.partition(' ')
+        if command == 'generation':
+            return _encode_value(generation, generation)
+        elif command != 'get':
+            return _error_response(STATUS_ERROR, ConfigException(u'Unknown command {command}'.format(command=command)))
+
+        with self._responses_lock:
+            response = responses.pop(path, None)
+            if response is not None:
+                responses[path] = response
+                return response
+        try:
+            value = config.get(path) if path else config
+        except ConfigMissingException as e:
+            return _error_response(STATUS_MISSING, e)
+        except ConfigWrongTypeException as e:
+            return _error_response(STATUS_WRONG_TYPE, e)
+        response = _encode_value(value, generation)
+        with self._responses_lock:
+            responses[path] = response
+            while len(responses) > self.max_responses:
+                responses.popitem(last=False)
+        return response
+
+    def start(self):
+        """Load the config, listen on the socket and serve in background threads
+
+        A stale socket file left by a server that is no longer running is replaced.
+        """
+        self.reload()
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except socket.error as e:
+                if e.errno not in (errno.ECONNREFUSED, errno.ENOENT):
+                    raise
+                os.remove(self.socket_path)
+            else:
+                raise ConfigException(u'A server is already listening on {path}'.format(path=self.socket_path))
+            finally:
+                probe.close()
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.config_server = self
+        self._stopped.clear()
+        for target in [self._server.serve_forever, self._watch]:
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                if self.reload():
+                    logger.info('Reloaded %s (generation %d)', self.input_file, self.generation)
+            except Exception as e:
+                logger.error('Cannot reload %s: %s: %s', self.input_file, type(e).__name__, e)
+
+    def serve_forever(self):  # pragma: no cover
+        """Start the server and block until shutdown() is called (e.g., from a signal handler)"""
+        self.start()
+        self._stopped.wait()
+
+    def shutdown(self):
+        """Stop serving and remove the socket file"""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+
+class ConfigClient(ConfigGetterMixin):
+    """Read-only config served by ConfigServer
+
+    Each get is a round-trip to the server over a connection kept open (and opened again if the server restarted).
+    Objects are returned as read-only SnapshotTree.
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        """
+        :param socket_path: path of the Unix domain socket of the server
+        :type socket_path: basestring
+        :param timeout: socket timeout in seconds
+        :type timeout: float
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except Exception:
+            sock.close()
+            raise
+        self._socket = sock
+
+    def _receive(self, size):
+        chunks = []
+        while size > 0:
+            chunk = self._socket.recv(min(size, 1 << 20))
+            if not chunk:
+                raise socket.error(errno.ECONNRESET, 'Connection closed by the server')
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def _request(self, request):
+        with self._lock:
+            for attempt in range(2):
+                if self._socket is None:
+                    self._connect()
+                try:
+                    self._socket.sendall(request.encode('utf-8') + b'\n')
+                    status, length = _RESPONSE.unpack(self._receive(_RESPONSE.size))
+                    payload = self._receive(length)
+                    break
+                except socket.error:
+                    self.close()
+                    if attempt:
+                        raise
+        if status != STATUS_VALUE:
+            raise _ERRORS.get(status, ConfigException)(payload.decode('utf-8'))
+        return decode_snapshot(payload)
+
+    @property
+    def generation(self):
+        """Generation of the config currently served"""
+        return self._request('generation')
+
+    def get(self, key, default=UndefinedKey):
+        """Get a value from the server
+
+        :param key: key to use (dot separated), the whole config if empty
+        :type key: basestring
+        :param default: default value if key not found (or if a key of the path is not an object)
+        :type default: object
+        :return: value in the tree located at key
+        """
+        try:
+            return self._request(u'get ' + key if key else 'get')
+        except (ConfigMissingException, ConfigWrongTypeException):
+            if default is UndefinedKey:
+                raise
+            return default
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __contains__(self, item):
+        return self.get(item, NonExistentKey) is not NonExistentKey
@@ -0,0 +1,166 @@
+import binascii
+import os
+import threading
+
+from pyhocon.config_tree import ConfigGetterMixin, ConfigTree, NonExistentKey, UndefinedKey
+from pyhocon.exceptions import ConfigException
+from pyhocon.snapshot import SnapshotTree, decode_snapshot, dump_snapshot, map_file
+
+try:
+    replace_file = os.replace
+except AttributeError:  # pragma: no cover
+    # python 2: rename overwrites the destination atomically on POSIX
+    replace_file = os.rename
+
+
+class SharedConfigPublisher(object):
+    """Publish resolved configs to processes sharing a snapshot file
+
+    Each published config is written as a snapshot next to the shared file and then renamed over it, so processes
+    attaching the file get either the previous or the new generation, never a partial one. Use a file on a memory
+    backed filesystem (e.g., /dev/shm) to keep the config out of the disk.
+    """
+
+    def __init__(self, path, mode=0o666):
+        """
+        :param path: path of the shared snapshot file
+        :type path: basestring
+        :param mode: permissions of the shared file, filtered by the umask like the files created by open(). The
+            default lets the workers running as other users attach the file unless the umask prevents it
+        :type mode: int
+        """
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._generation = None
+
+    @property
+    def generation(self):
+        """Generation of the last published config (0 if none was published yet)"""
+        if self._generation is None:
+            try:
+                with open(self.path, 'rb') as fd:
+                    self._generation = decode_snapshot(map_file(fd)).generation
+            except (IOError, OSError, ConfigException):
+                self._generation = 0
+        return self._generation
+
+    def publish(self, config):
+        """Publish a new generation of the config
+
+        :param config: resolved config
+        :type config: ConfigTree
+        :return: generation of the published config
+        :type return: int
+        """
+        if not isinstance(config, ConfigTree):
+            raise ConfigException(u"Only configs can be shared, got {type}".format(type=type(config).__name__))
+
+        with self._lock:
+            generation = self.generation + 1
+            directory, name = os.path.split(os.path.abspath(self.path))
+            tmp_path = os.path.join(directory, '.{name}.{pid}.{suffix}.tmp'.format(
+                name=name, pid=os.getpid(), suffix=binascii.hexlify(os.urandom(4)).decode('ascii')))
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), self.mode)
+            try:
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    dump_snapshot(config, tmp_file, generation)
+                replace_file(tmp_path, self.path)
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            self._generation = generation
+        return generation
+
+
+class SharedConfig(ConfigGetterMixin):
+    """Read-only config attached to a file published by SharedConfigPublisher
+
+    The file is mapped in memory so the processes attached to it share the same pages and only decode the values
+    they access. refresh() attaches the latest generation, configs returned by snapshot() before stay valid.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: path of the shared snapshot file
+        :type path: basestring
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._config = None
+        self._file_id = None
+        self.refresh()
+
+    @property
+    def generation(self):
+        """Generation of the attached config"""
+        return self._config.generation
+
+    def refresh(self):
+        """Attach the latest published generation if the shared file was replaced
+
+        :return: True if a new generation was attached
+        :type return: boolean
+        """
+        try:
+            file_id = self._stat(os.stat(self.path))
+        except OSError:
+            if self._config is None:
+                raise
+            return False
+        if file_id == self._file_id:
+            return False
+
+        with self._lock:
+            with open(self.path, 'rb') as fd:
+                # identify the file that was actually opened in case it was replaced after the stat
+                file_id = self._stat(os.fstat(fd.fileno()))
+                if file_id == self._file_id:
+                    return False
+                config = decode_snapshot(map_file(fd))
+            if not isinstance(config, SnapshotTree):
+                raise ConfigException(u"{path} does not contain a config".format(path=self.path))
+            self._config = config
+            self._file_id = file_id
+        return True
+
+    @staticmethod
+    def _stat(stat):
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime
+
+    def snapshot(self):
+        """Return the attached config, it is not changed by later refreshes
+
+        :type return: SnapshotTree
+        """
+        return self._config
+
+    def get(self, key, default=UndefinedKey):
+        return self._config.get(key, default)
+
+    def materialize(self):
+        """Decode the attached config into a config tree that can be modified
+
+        :type return: ConfigTree
+        """
+        return self._config.materialize()
+
+    def with_fallback(self, config, resolve=True, persistent=False):
+        """Return a new config with fallback on config, see ConfigTree.with_fallback"""
+        return self.materialize().with_fallback(config, resolve, persistent)
+
+    def as_plain_ordered_dict(self):
+        """Return the attached config as a plain OrderedDict, see ConfigTree.as_plain_ordered_dict"""
+        return self.materialize().as_plain_ordered_dict()
+
+    def __getitem__(self, item):
+        return self._config.get(item)
+
+    def __contains__(self, item):
+        return self._config.get(item, NonExistentKey) is not NonExistentKey
+
+    def __iter__(self):
+        return iter(self._config)
+
+    def __len__(self):
+        return len(self._config)
@@ -0,0 +1,326 @@
+"""Binary snapshots of resolved configs
+
+A snapshot starts with a header (magic, format version, flags, generation and the offset of the root value) followed by the
+encoded values. Objects and lists store the offsets of their children so that loading a snapshot only decodes the
+values that are accessed, directly from a read-only mmap of the file.
+
+Values are encoded as a one-byte tag followed by little-endian data:
+
+- ``N``, ``T``, ``F``: null, true, false
+- ``i``: 64-bit integer, ``I``: length and decimal digits of larger integers
+- ``f``: 64-bit float
+- ``s``: length and UTF-8 bytes of a string
+- ``d``: days, seconds and microseconds of a timedelta
+- ``r``: years, months, days, leapdays, hours, minutes, seconds and microseconds of a relativedelta
+- ``l``: number of elements and offset of each element
+- ``o``: number of entries and for each entry the length and UTF-8 bytes of its key and the offset of its value
+"""
+import copy
+import mmap
+import struct
+from collections import OrderedDict
+from datetime import timedelta
+
+from pyhocon.config_tree import (ConfigGetterMixin, ConfigList, ConfigMapping, ConfigTree, ConfigValues, NonExistentKey,
+                                 NoneValue, UndefinedKey)
+from pyhocon.exceptions import (ConfigException, ConfigMissingException, ConfigReadOnlyException,
+                                ConfigWrongTypeException)
+from pyhocon.period_serializer import is_relativedelta
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+try:
+    basestring
+except NameError:  # pragma: no cover
+    basestring = str
+
+MAGIC = b'PYHCSNAP'
+VERSION = 1
+FLAG_ROOT = 1
+
+_HEADER = struct.Struct('<8sHHIQ')
+_UINT32 = struct.Struct('<I')
+_UINT64 = struct.Struct('<Q')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+_TIMEDELTA = struct.Struct('<iii')
+_RELATIVEDELTA = struct.Struct('<8q')
+_RELATIVEDELTA_FIELDS = ('years', 'months', 'days', 'leapdays', 'hours', 'minutes', 'seconds', 'microseconds')
+
+_END = object()
+
+
+def dump_snapshot(config, fd, generation=0):
+    """Write a resolved config as a snapshot
+
+    :param config: resolved config (or list)
+    :type config: ConfigTree
+    :param fd: binary file-like object to write to
+    :param generation: generation number stored in the header
+    :type generation: int
+    """
+    if isinstance(config, ConfigMapping):
+        config = config.materialize()
+    buf = bytearray(_HEADER.size)
+    # children are written before their parent so that the parent can store their offsets
+    stack = [[config, None, [], None]]
+    root_offset = None
+    while stack:
+        frame = stack[-1]
+        value, iterator, entries, key = frame
+        if iterator is None:
+            if not isinstance(value, (ConfigTree, list)):
+                stack.pop()
+                root_offset = _write_scalar(buf, value)
+                continue
+            iterator = frame[1] = iter(OrderedDict.items(value) if isinstance(value, ConfigTree) else value)
+
+        item = next(iterator, _END)
+        if item is not _END:
+            child_key, child = item if isinstance(value, ConfigTree) else (None, item)
+            if isinstance(child, (ConfigTree, list)):
+                stack.append([child, None, [], child_key])
+            else:
+                entries.append((child_key, _write_scalar(buf, child)))
+            continue
+
+        stack.pop()
+        offset = len(buf)
+        if isinstance(value, ConfigTree):
+            buf += b'o' + _UINT32.pack(len(entries))
+            for entry_key, entry_offset in entries:
+                encoded_key = entry_key.encode('utf-8')
+                buf += _UINT32.pack(len(encoded_key)) + encoded_key + _UINT64.pack(entry_offset)
+        else:
+            buf += b'l' + _UINT32.pack(len(entries))
+            for _, entry_offset in entries:
+                buf += _UINT64.pack(entry_offset)
+
+        if stack:
+            stack[-1][2].append((key, offset))
+        else:
+            root_offset = offset
+
+    flags = FLAG_ROOT if isinstance(config, ConfigTree) and config.root else 0
+    buf[:_HEADER.size] = _HEADER.pack(MAGIC, VERSION, flags, generation, root_offset)
+    fd.write(buf)
+
+
+def _write_scalar(buf, value):
+    offset = len(buf)
+    if value is None or isinstance(value, NoneValue):
+        buf += b'N'
+    elif value is True:
+        buf += b'T'
+    elif value is False:
+        buf += b'F'
+    elif isinstance(value, basestring):
+        encoded = value.encode('utf-8')
+        buf += b's' + _UINT32.pack(len(encoded)) + encoded
+    elif isinstance(value, float):
+        buf += b'f' + _FLOAT64.pack(value)
+    elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        buf += b'i' + _INT64.pack(value)
+    elif isinstance(value, int):
+        encoded = str(value).encode('ascii')
+        buf += b'I' + _UINT32.pack(len(encoded)) + encoded
+    elif isinstance(value, timedelta):
+        buf += b'd' + _TIMEDELTA.pack(value.days, value.seconds, value.microseconds)
+    elif is_relativedelta(value):
+        buf += b'r' + _RELATIVEDELTA.pack(*[int(getattr(value, field)) for field in _RELATIVEDELTA_FIELDS])
+    elif isinstance(value, ConfigValues):
+        raise ConfigException("The config tree contains unresolved elements")
+    else:
+        raise ConfigException(u"Cannot write value of type {type} in a snapshot".format(type=type(value).__name__))
+    return offset
+
+
+def load_snapshot(filename):
+    """Load a snapshot, values are decoded from a read-only mmap of the file as they are accessed
+
+    :param filename: snapshot filename
+    :type filename: basestring
+    :return: lazily decoded config
+    :type return: SnapshotTree
+    """
+    with open(filename, 'rb') as fd:
+        return decode_snapshot(map_file(fd))
+
+
+def map_file(fd):
+    """Map a file opened in binary mode read-only in memory, the mapping stays valid once the file is closed"""
+    try:
+        return mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # empty files cannot be mapped
+        return fd.read()
+
+
+def decode_snapshot(buf):
+    """Decode the root value of a snapshot held in a buffer (bytes, mmap, ...)
+
+    :return: lazily decoded config
+    :type return: SnapshotTree
+    """
+    if len(buf) < _HEADER.size:
+        raise ConfigException("Invalid snapshot: file is too short")
+    magic, version, flags, generation, root_offset = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ConfigException("Invalid snapshot: wrong magic number")
+    if version != VERSION:
+        raise ConfigException(u"Unsupported snapshot version {version}".format(version=version))
+    value = _decode(buf, root_offset)
+    if isinstance(value, SnapshotTree):
+        value.root = bool(flags & FLAG_ROOT)
+        value.generation = generation
+    return value
+
+
+def _decode(buf, offset):
+    tag = buf[offset:offset + 1]
+    start = offset + 1
+    if tag == b'o':
+        return SnapshotTree(buf, offset)
+    elif tag == b's':
+        length, = _UINT32.unpack_from(buf, start)
+        return bytes(buf[start + 4:start + 4 + length]).decode('utf-8')
+    elif tag == b'i':
+        return _INT64.unpack_from(buf, start)[0]
+    elif tag == b'f':
+        return _FLOAT64.unpack_from(buf, start)[0]
+    elif tag == b'N':
+        return None
+    elif tag == b'T':
+        return True
+    elif tag == b'F':
+        return False
+    elif tag == b'l':
+        count, = _UINT32.unpack_from(buf, start)
+        return [_decode(buf, _UINT64.unpack_from(buf, start + 4 + 8 * index)[0]) for index in range(count)]
+    elif tag == b'I':
+        length, = _UINT32.unpack_from(buf, start)
+        return int(bytes(buf[start + 4:start + 4 + length]).decode('ascii'))
+    elif tag == b'd':
+        days, seconds, microseconds = _TIMEDELTA.unpack_from(buf, start)
+        return timedelta(days=days, seconds=seconds, microseconds=microseconds)
+    elif tag == b'r':
+        from dateutil.relativedelta import relativedelta as relativedelta_impl
+        return relativedelta_impl(**dict(zip(_RELATIVEDELTA_FIELDS, _RELATIVEDELTA.unpack_from(buf, start))))
+    raise ConfigException(u"Invalid snapshot: unknown tag {tag!r} at offset {offset}".format(tag=tag, offset=offset))
+
+
+class SnapshotTree(ConfigGetterMixin, Mapping):
+    """Read-only config object of a snapshot
+
+    The entries of the object are indexed the first time it is accessed and each value is decoded the first time it
+    is accessed. Every mutation raises ConfigReadOnlyException.
+    """
+
+    def __init__(self, buf, offset):
+        self._buf = buf
+        self._offset = offset
+        self._entries = None
+        self._values = {}
+        self.root = False
+        self.generation = 0
+
+    def _index(self):
+        if self._entries is None:
+            buf = self._buf
+            count, = _UINT32.unpack_from(buf, self._offset + 1)
+            entries = OrderedDict()
+            position = self._offset + 5
+            for _ in range(count):
+                length, = _UINT32.unpack_from(buf, position)
+                key = bytes(buf[position + 4:position + 4 + length]).decode('utf-8')
+                entries[key] = _UINT64.unpack_from(buf, position + 4 + length)[0]
+                position += 12 + length
+            self._entries = entries
+        return self._entries
+
+    def _value(self, key, default=UndefinedKey):
+        value = self._values.get(key, UndefinedKey)
+        if value is UndefinedKey:
+            offset = self._index().get(key)
+            if offset is None:
+                return default
+            value = self._values[key] = _decode(self._buf, offset)
+        return value
+
+    def get(self, key, default=UndefinedKey):
+        """Get a value from the snapshot
+
+        :param key: key to use (dot separated). E.g., a.b.c
+        :type key: basestring
+        :param default: default value if key not found
+        :type default: object
+        :return: value located at key, lists are returned as new lists
+        """
+        key_path = ConfigTree.parse_key(key)
+        node = self
+        for index, key_elt in enumerate(key_path):
+            if not isinstance(node, SnapshotTree):
+                if default is UndefinedKey:
+                    raise ConfigWrongTypeException(
+                        u"{key} has type {type} rather than dict".format(key='.'.join(key_path[:index]),
+                                                                         type=type(node).__name__))
+                return default
+            node = node._value(key_elt)
+            if node is UndefinedKey:
+                if default is UndefinedKey:
+                    raise ConfigMissingException(
+                        u"No configuration setting found for key {key}".format(key='.'.join(key_path[:index + 1])))
+                return default
+        return list(node) if isinstance(node, list) else node
+
+    def materialize(self):
+        """Decode the whole snapshot into a config tree
+
+        :return: decoded config
+        :type return: ConfigTree
+        """
+        result = ConfigTree(root=self.root)
+        stack = [(self, result)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in (source.items() if isinstance(source, SnapshotTree) else enumerate(source)):
+                if isinstance(value, SnapshotTree):
+                    child = ConfigTree()
+                    stack.append((value, child))
+                elif isinstance(value, list):
+                    child = ConfigList(value)
+                    stack.append((value, child))
+                else:
+                    child = copy.copy(value)
+                target[key] = child
+        return result
+
+    def put(self, key, value, append=False):
+        raise ConfigReadOnlyException(u"Cannot put {key}: snapshots are read-only".format(key=key))
+
+    def pop(self, key, default=UndefinedKey):
+        raise ConfigReadOnlyException(u"Cannot pop {key}: snapshots are read-only".format(key=key))
+
+    def __setitem__(self, key, value):
+        raise ConfigReadOnlyException(u"Cannot set {key}: snapshots are read-only".format(key=key))
+
+    def __delitem__(self, key):
+        raise ConfigReadOnlyException(u"Cannot delete {key}: snapshots are read-only".format(key=key))
+
+    def __getitem__(self, item):
+        return self.get(item)
+
+    def __contains__(self, item):
+        return self.get(item, NonExistentKey) is not NonExistentKey
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._index())
+
+    def __repr__(self):  # pragma: no cover
+        return '[SnapshotTree: offset ' + str(self._offset) + ']'
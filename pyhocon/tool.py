@@ -1,19 +1,386 @@
 import argparse
+import json
 import logging
+import os
+import re
+import signal
+import sys
+import time
 
-from pyhocon.converter import HOCONConverter
+from pyhocon.config_tree import ConfigTree
+from pyhocon.converter import HOCONConverter, atomic_output
+from pyhocon.exceptions import ConfigException
+from pyhocon.period_serializer import is_timedelta_like, timedelta_to_hocon
+
+# the parser and multiprocessing are imported by the functions using them so that the tool starts faster
+
+try:
+    basestring
+except NameError:  # pragma: no cover
+    basestring = str
 
 LOG_FORMAT = '%(asctime)s %(levelname)s: %(message)s'
 
+# extension of the output files in batch mode
+EXTENSIONS = {
+    'json': '.json',
+    'properties': '.properties',
+    'yaml': '.yaml',
+    'hocon': '.conf',
+}
+
+logger = logging.getLogger(__name__)
+
+
+def expand_inputs(patterns, manifest=None):
+    """Return the input files matching paths or glob patterns
+
+    :param patterns: paths or glob patterns (** matches any number of directories)
+    :type patterns: list
+    :param manifest: file listing one path or glob pattern per line (relative to the manifest directory), empty lines
+        and lines starting with # are ignored
+    :type manifest: basestring
+    :return: files without duplicates in the order they were matched, paths that are not glob patterns are kept as is
+    :type return: list
+    """
+    from pyhocon.config_parser import glob
+
+    patterns = list(patterns)
+    if manifest is not None:
+        manifest_dir = os.path.dirname(manifest)
+        with open(manifest) as fd:
+            for line in fd:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    patterns.append(os.path.join(manifest_dir, line))
+
+    files = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob(pattern, recursive=True)) if any(c in pattern for c in '*?[') else [pattern]
+        for filename in matches:
+            if filename not in seen:
+                seen.add(filename)
+                files.append(filename)
+    return files
+
+
+def common_directory(files):
+    """Return the deepest directory containing all the files"""
+    directories = [os.path.dirname(os.path.abspath(filename)) + os.sep for filename in files]
+    prefix = os.path.commonprefix(directories)
+    return prefix[:prefix.rindex(os.sep)] or os.sep
+
+
+def batch_convert(input_files, output_dir, output_format='json', indent=2, compact=False, jobs=1):
+    """Convert many files, keeping their layout relative to their common directory in output_dir
+
+    A failure to convert a file does not stop the conversion of the other files.
+
+    :param input_files: files to convert
+    :type input_files: list
+    :param output_dir: directory of the converted files
+    :type output_dir: basestring
+    :param jobs: number of worker processes (0 for one per CPU)
+    :type jobs: int
+    :return: (input file, output file, error message or None) for each input file
+    :type return: list
+    """
+    HOCONConverter._check_format(output_format)
+    if not input_files:
+        return []
+
+    base_dir = common_directory(input_files)
+    output_files = []
+    inputs_by_output = {}
+    for input_file in input_files:
+        name = os.path.splitext(os.path.relpath(os.path.abspath(input_file), base_dir))[0]
+        output_file = os.path.join(output_dir, name + EXTENSIONS[output_format])
+        output_files.append(output_file)
+        inputs_by_output.setdefault(os.path.normcase(os.path.abspath(output_file)), []).append(input_file)
+
+    # files with the same name but different extensions (e.g., a.conf and a.json) would overwrite each other
+    results = [None] * len(input_files)
+    tasks = []
+    for index, (input_file, output_file) in enumerate(zip(input_files, output_files)):
+        colliding = inputs_by_output[os.path.normcase(os.path.abspath(output_file))]
+        if len(colliding) > 1:
+            results[index] = (input_file, output_file, u'ConfigException: {output} would also be the output of {others}'.format(
+                output=output_file, others=', '.join(other for other in colliding if other != input_file)))
+        else:
+            tasks.append((index, (input_file, output_file, output_format, indent, compact)))
+
+    import multiprocessing
+
+    jobs = jobs or multiprocessing.cpu_count()
+    if jobs == 1 or len(tasks) <= 1:
+        converted = [_convert_file(task) for _, task in tasks]
+    else:
+        pool = multiprocessing.Pool(min(jobs, len(tasks)))
+        try:
+            converted = pool.map(_convert_file, [task for _, task in tasks], chunksize=max(1, len(tasks) // (jobs * 4)))
+        finally:
+            pool.close()
+            pool.join()
+
+    for (index, _), result in zip(tasks, converted):
+        results[index] = result
+    return results
+
+
+def _convert_file(task):
+    input_file, output_file, output_format, indent, compact = task
+    try:
+        output_dir = os.path.dirname(output_file)
+        if output_dir and not os.path.isdir(output_dir):
+            try:
+                os.makedirs(output_dir)
+            except OSError:
+                # created by another worker in the meantime
+                if not os.path.isdir(output_dir):
+                    raise
+        HOCONConverter.convert_from_file(input_file, output_file, output_format, indent, compact)
+        return input_file, output_file, None
+    except Exception as e:
+        return input_file, output_file, u'{type}: {message}'.format(type=type(e).__name__, message=e)
+
+
+class ConfigWatcher(object):
+    """Convert a file again each time it or one of the files it includes changes
+
+    Files are polled with os.stat and the output is only written when the converted config changes. Only the changed
+    files (and the files including them) are parsed again, the unresolved configs of the other included files are
+    reused (see ConfigFactory.reuse_included_files). The substitutions are resolved again over the whole config.
+    """
+
+    def __init__(self, input_file, output_file=None, output_format='json', indent=2, compact=False):
+        """
+        :param input_file: file to convert
+        :type input_file: basestring
+        :param output_file: output file, if not specified stdout
+        :type output_file: basestring
+        """
+        HOCONConverter._check_format(output_format)
+        self.input_file = input_file
+        self.output_file = output_file
+        self.output_format = output_format
+        self.indent = indent
+        self.compact = compact
+        self._stats = None
+        self._output = None
+        # unresolved configs of the included files, by path
+        self._fragments = {}
+
+    @staticmethod
+    def _stat(filename):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size, stat.st_ino
+
+    @property
+    def files(self):
+        """Files read by the last conversion (the input file and its includes)"""
+        return sorted(self._stats or [])
+
+    def changed(self):
+        """Return True if the input file or one of the files it includes changed since the last conversion"""
+        return self._stats is None or any(self._stat(filename) != stat for filename, stat in self._stats.items())
+
+    def poll(self):
+        """Convert the input file if it changed
+
+        Exceptions raised by the conversion are propagated, the file is converted again once it changes.
+
+        :return: True if the output was written
+        :type return: boolean
+        """
+        from pyhocon.config_parser import ConfigFactory
+
+        if not self.changed():
+            return False
+
+        with ConfigFactory.record_files() as files, ConfigFactory.reuse_included_files(self._fragments):
+            try:
+                config = ConfigFactory.parse_file(self.input_file)
+            finally:
+                self._stats = dict((filename, self._stat(filename)) for filename in [self.input_file] + files)
+                # forget the files that are not included anymore
+                for filename in set(self._fragments) - set(self._stats):
+                    del self._fragments[filename]
+
+        output = HOCONConverter.convert(config, self.output_format, self.indent, self.compact)
+        if output == self._output:
+            return False
+        if self.output_file is None:
+            sys.stdout.write(output + '\n')
+            sys.stdout.flush()
+        else:
+            with atomic_output(self.output_file) as fd:
+                fd.write(output)
+        self._output = output
+        return True
+
+    def watch(self, interval=1.0):  # pragma: no cover
+        """Poll the files forever
+
+        :param interval: seconds between two polls
+        :type interval: float
+        """
+        while True:
+            try:
+                if self.poll():
+                    logger.info('Converted %s', self.input_file)
+            except Exception as e:
+                sys.stderr.write(u'{input}: {type}: {message}\n'.format(
+                    input=self.input_file, type=type(e).__name__, message=e))
+            time.sleep(interval)
+
+
+def get_values(input_file, paths, socket_path=None):
+    """Parse a file and return the values at some paths, resolving only the substitutions they depend on
+
+    :param input_file: input file, if not specified stdin
+    :type input_file: basestring
+    :param paths: paths (dot separated) of the values
+    :type paths: list
+    :param socket_path: socket of a config server to query instead of parsing a file
+    :type socket_path: basestring
+    :return: values in the same order as paths
+    :type return: list
+    """
+    from pyhocon.config_parser import ConfigFactory, ConfigParser
+
+    if socket_path is not None:
+        from pyhocon.server import ConfigClient
+        from pyhocon.snapshot import SnapshotTree
+
+        with ConfigClient(socket_path) as client:
+            values = [client.get(path) for path in paths]
+        return [value.materialize() if isinstance(value, SnapshotTree) else value for value in values]
+    if input_file is None:
+        config = ConfigFactory.parse_string(sys.stdin.read(), resolve=False)
+    else:
+        config = ConfigFactory.parse_file(input_file, resolve=False)
+    ConfigParser.resolve_paths(config, paths)
+    return [config.get(path) for path in paths]
+
+
+def format_value(path, value, output_format='raw'):
+    """Format a value printed by pyhocon get
+
+    :param path: path of the value
+    :param value: resolved value
+    :param output_format: raw (strings without quotes, periods as HOCON durations, objects and lists as JSON), json or
+        shell (export statement of the raw value)
+    :return: formatted value
+    :type return: basestring
+    """
+    if output_format == 'json' or isinstance(value, (ConfigTree, list)):
+        text = json.dumps(ConfigTree([('value', value)]).as_dict()['value'], ensure_ascii=False,
+                          default=HOCONConverter._json_default)
+        if output_format == 'json':
+            return text
+    elif value is None:
+        text = 'null'
+    elif value is True or value is False:
+        text = 'true' if value else 'false'
+    elif is_timedelta_like(value):
+        text = timedelta_to_hocon(value)
+    elif isinstance(value, basestring):
+        text = value
+    else:
+        text = str(value)
+
+    if output_format == 'shell':
+        name = re.sub('[^A-Za-z0-9_]', '_', path.replace('"', '')).upper()
+        if name[:1].isdigit():
+            name = '_' + name
+        return 'export ' + name + "='" + text.replace("'", "'\\''") + "'"
+    return text
+
+
+def get_main(argv):  # pragma: no cover
+    parser = argparse.ArgumentParser(prog='pyhocon get',
+                                     description='print values of a config, resolving only the substitutions they need')
+    parser.add_argument('paths', nargs='+', help='paths (dot separated) of the values to print')
+    parser.add_argument('-i', '--input', help='input file')
+    parser.add_argument('-s', '--socket', help='socket of a config server (pyhocon serve) to query instead of the input')
+    parser.add_argument('-f', '--format', choices=['raw', 'json', 'shell'], default='raw',
+                        help='raw (default), json or shell (export statements)')
+    args = parser.parse_args(argv)
+    if args.input and args.socket:
+        parser.error('-i and -s cannot be used together')
+
+    try:
+        values = get_values(args.input, args.paths, args.socket)
+    except (ConfigException, IOError) as e:
+        sys.stderr.write(u'{type}: {message}\n'.format(type=type(e).__name__, message=e))
+        sys.exit(1)
+    for path, value in zip(args.paths, values):
+        sys.stdout.write(format_value(path, value, args.format) + '\n')
+
+
+def serve_main(argv):  # pragma: no cover
+    from pyhocon.server import ConfigServer
+
+    parser = argparse.ArgumentParser(prog='pyhocon serve',
+                                     description='serve a config to the processes of the host over a Unix domain socket')
+    parser.add_argument('-i', '--input', required=True, help='input file')
+    parser.add_argument('-s', '--socket', required=True, help='path of the Unix domain socket')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between two checks of the input files')
+    parser.add_argument('-v', '--verbosity', action='count', default=0, help='increase output verbosity')
+    args = parser.parse_args(argv)
+    logging.basicConfig(format=LOG_FORMAT, level=logging.INFO if args.verbosity else logging.WARNING)
+
+    server = ConfigServer(args.input, args.socket, args.interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.shutdown())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def profile_main(input_file, output_file, output_format, indent=2, compact=False):
+    """Convert a config like HOCONConverter.convert_from_file and print its memory profile to stderr"""
+    from pyhocon.profiling import profile_memory
+
+    content = sys.stdin.read() if input_file is None else None
+    profile = profile_memory(input_file, content, output_format, indent, compact)
+    if output_file is None:
+        sys.stdout.write(profile.output + '\n')
+    else:
+        with open(output_file, 'w') as fd:
+            fd.write(profile.output)
+    sys.stderr.write(profile.format())
+
 
 def main():  # pragma: no cover
+    if sys.argv[1:2] == ['get']:
+        return get_main(sys.argv[2:])
+    elif sys.argv[1:2] == ['serve']:
+        return serve_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description='pyhocon tool')
+    parser.add_argument('inputs', nargs='*', help='input files or glob patterns to convert in batch mode')
     parser.add_argument('-i', '--input', help='input file')
     parser.add_argument('-o', '--output', help='output file')
+    parser.add_argument('-m', '--manifest', help='file listing input files or glob patterns to convert in batch mode')
+    parser.add_argument('-d', '--output-dir', help='output directory in batch mode')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes in batch mode (0 for one per CPU, default is 1)')
+    parser.add_argument('-w', '--watch', action='store_true', default=False,
+                        help='convert the input file again each time it or a file it includes changes')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between two checks in watch mode')
     parser.add_argument('-c', '--compact', action='store_true', default=False, help='compact format')
     parser.add_argument('-f', '--format', help='output format: json, properties, yaml or hocon', default='json')
     parser.add_argument('-n', '--indent', help='indentation step (default is 2)', default=2, type=int)
     parser.add_argument('-v', '--verbosity', action='count', default=0, help='increase output verbosity')
+    parser.add_argument('--profile-memory', action='store_true', default=False,
+                        help='print the memory used by each phase of the loading and conversion to stderr')
     args = parser.parse_args()
 
     # Python 2.6 support
@@ -30,7 +397,31 @@ def main():  # pragma: no cover
         logger.setLevel(logging.INFO)
     elif args.verbosity >= 3:
         logger.setLevel(logging.DEBUG)
-    HOCONConverter.convert_from_file(args.input, args.output, args.format.lower(), args.indent, args.compact)
+
+    output_format = args.format.lower()
+    if args.inputs or args.manifest:
+        if args.input or args.output or args.watch or args.profile_memory:
+            parser.error('-i, -o, --watch and --profile-memory cannot be used in batch mode')
+        if not args.output_dir:
+            parser.error('--output-dir is required in batch mode')
+        results = batch_convert(expand_inputs(args.inputs, args.manifest), args.output_dir, output_format,
+                                args.indent, args.compact, args.jobs)
+        failures = [(input_file, error) for input_file, _, error in results if error is not None]
+        for input_file, error in failures:
+            sys.stderr.write(u'{input}: {error}\n'.format(input=input_file, error=error))
+        sys.stderr.write('{converted} converted, {failed} failed\n'.format(
+            converted=len(results) - len(failures), failed=len(failures)))
+        sys.exit(1 if failures else 0)
+    elif args.watch:
+        if args.input is None:
+            parser.error('--watch requires an input file (-i)')
+        if args.profile_memory:
+            parser.error('--watch and --profile-memory cannot be used together')
+        ConfigWatcher(args.input, args.output, output_format, args.indent, args.compact).watch(args.interval)
+    elif args.profile_memory:
+        profile_main(args.input, args.output, output_format, args.indent, args.compact)
+    else:
+        HOCONConverter.convert_from_file(args.input, args.output, output_format, args.indent, args.compact)
 
 
 if __name__ == '__main__':  # pragma: no cover
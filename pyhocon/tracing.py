@@ -0,0 +1,280 @@
+"""Hooks called at the beginning and at the end of the phases of loading and converting configs
+
+The phases and their attributes are:
+
+- ``parse_file``: loading a file (ConfigFactory.parse_file), ``path`` and ``keys`` (or ``items`` for a list)
+- ``parse_url``: loading a URL (ConfigFactory.parse_URL), ``url`` and ``keys`` (or ``items``)
+- ``read``: reading a file or a URL, ``path`` or ``url`` and ``bytes``
+- ``parse``: parsing a content with the HOCON grammar (tokenizing and building the config are done in the same pass),
+  ``length`` of the content and ``keys`` (or ``items``)
+- ``include``: loading an included file or URL (nested in the ``parse`` phase of the including content), ``path`` or
+  ``url`` and ``keys`` (or ``items``); the files matched by a glob are loaded in an ``include`` phase with the
+  ``pattern`` and the number of ``files``
+- ``resolve``: resolving the substitutions (ConfigParser.resolve_substitutions), number of ``substitutions`` and of
+  ``unresolved`` ones if any
+- ``fixup``: replacing the resolved values by their final value at the end of ``resolve``
+- ``convert``: converting a config with HOCONConverter.convert or HOCONConverter.write, ``format`` and ``length`` of
+  the output
+
+Phases are reported to the current tracer, which ignores them by default. Set one with set_tracer() or for a block:
+
+    with tracing(CollectingTracer()) as tracer:
+        config = ConfigFactory.parse_file('app.conf')
+    print(tracer.format())
+
+Phases of the same thread are nested: a phase ends before the phase it began in. CollectingTracer keeps the phases in
+memory with their duration and OpenTelemetryTracer reports them as OpenTelemetry spans.
+"""
+import contextlib
+import threading
+import time
+
+try:
+    _clock = time.perf_counter
+except AttributeError:  # pragma: no cover
+    _clock = time.time
+
+
+class Tracer(object):
+    """Tracer ignoring the phases, base class of the tracers"""
+
+    def begin(self, phase, attributes):
+        """Called when a phase begins
+
+        :param phase: name of the phase
+        :type phase: basestring
+        :param attributes: attributes of the phase (e.g., path), the same dict is passed to end()
+        :type attributes: dict
+        """
+
+    def end(self, phase, attributes, error=None):
+        """Called when a phase ends
+
+        :param phase: name of the phase
+        :type phase: basestring
+        :param attributes: attributes of the phase, including the ones added during the phase
+        :type attributes: dict
+        :param error: exception raised by the phase if it failed
+        """
+
+
+class _Span(object):
+    __slots__ = ('tracer', 'phase', 'attributes')
+
+    def __init__(self, tracer, phase, attributes):
+        self.tracer = tracer
+        self.phase = phase
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.tracer.begin(self.phase, self.attributes)
+        return self.attributes
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.end(self.phase, self.attributes, exc_value)
+
+
+class _NoSpan(object):
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_TRACER = Tracer()
+_NO_SPAN = _NoSpan()
+_tracer = _NO_TRACER
+
+
+def get_tracer():
+    """Return the current tracer"""
+    return _tracer
+
+
+def set_tracer(tracer):
+    """Set the tracer receiving the phases of all the threads
+
+    :param tracer: tracer, None to ignore the phases
+    :type tracer: Tracer
+    :return: previous tracer
+    """
+    global _tracer
+    previous = _tracer
+    _tracer = _NO_TRACER if tracer is None else tracer
+    return previous
+
+
+@contextlib.contextmanager
+def tracing(tracer):
+    """Set the tracer for a block and restore the previous one after"""
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def span(phase, **attributes):
+    """Context manager reporting a phase to the current tracer
+
+    It gives the attributes of the phase, to which attributes known at the end can be added, or None if the phases
+    are ignored (attributes that are costly to compute should only be computed if it is not None).
+    """
+    tracer = _tracer
+    if tracer is _NO_TRACER:
+        return _NO_SPAN
+    return _Span(tracer, phase, attributes)
+
+
+class CollectedSpan(object):
+    """Phase recorded by a CollectingTracer"""
+
+    def __init__(self, phase, attributes, start, parent=None):
+        self.phase = phase
+        self.attributes = attributes
+        self.start = start
+        self.end = None
+        self.error = None
+        self.parent = parent
+        self.children = []
+        self.thread = threading.current_thread().name
+
+    @property
+    def duration(self):
+        """Duration of the phase in seconds, None if it has not ended"""
+        return None if self.end is None else self.end - self.start
+
+    def __repr__(self):  # pragma: no cover
+        return '[CollectedSpan: {phase} {attributes} duration={duration}]'.format(
+            phase=self.phase, attributes=self.attributes, duration=self.duration)
+
+
+class CollectingTracer(Tracer):
+    """Tracer keeping the phases of all the threads in memory as trees of CollectedSpan"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, phase, attributes):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        collected = CollectedSpan(phase, attributes, _clock(), parent)
+        if parent is not None:
+            parent.children.append(collected)
+        with self._lock:
+            self.spans.append(collected)
+        stack.append(collected)
+
+    def end(self, phase, attributes, error=None):
+        collected = self._stack().pop()
+        collected.end = _clock()
+        collected.error = error
+
+    def roots(self):
+        """Return the phases that did not begin in another phase"""
+        with self._lock:
+            return [collected for collected in self.spans if collected.parent is None]
+
+    def totals(self):
+        """Return the number of calls and the total duration of each phase
+
+        A call nested in a call of the same phase (e.g., the parse of an included file) is counted but its duration is
+        already part of the outer call.
+
+        :return: (calls, seconds) by phase
+        :type return: dict
+        """
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for collected in spans:
+            calls, duration = totals.get(collected.phase, (0, 0.0))
+            ancestor = collected.parent
+            while ancestor is not None and ancestor.phase != collected.phase:
+                ancestor = ancestor.parent
+            if ancestor is None and collected.end is not None:
+                duration += collected.duration
+            totals[collected.phase] = (calls + 1, duration)
+        return totals
+
+    def format(self):
+        """Return the phases as an indented text tree with their duration and attributes"""
+        lines = []
+        stack = [(collected, 0) for collected in reversed(self.roots())]
+        while stack:
+            collected, level = stack.pop()
+            duration = '-' if collected.end is None else '{ms:.3f} ms'.format(ms=collected.duration * 1000)
+            attributes = ' '.join('{key}={value}'.format(key=key, value=value)
+                                  for key, value in sorted(collected.attributes.items()))
+            line = '{indent}{phase} {duration}'.format(indent='  ' * level, phase=collected.phase, duration=duration)
+            if attributes:
+                line += ' ' + attributes
+            if collected.error is not None:
+                line += ' error=' + type(collected.error).__name__
+            lines.append(line)
+            stack.extend((child, level + 1) for child in reversed(collected.children))
+        return '\n'.join(lines) + '\n'
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer reporting the phases as OpenTelemetry spans, requires the opentelemetry-api package
+
+    Spans are named ``pyhocon.<phase>``, their attributes are prefixed by ``pyhocon.`` and they are nested in the span
+    that is current when the phase begins.
+    """
+
+    def __init__(self, tracer=None):
+        """
+        :param tracer: OpenTelemetry tracer, the one of the global tracer provider if None
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError('OpenTelemetryTracer requires opentelemetry-api, install it with: pip install opentelemetry-api')
+        self._trace = trace
+        self.tracer = trace.get_tracer('pyhocon') if tracer is None else tracer
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @staticmethod
+    def _attributes(attributes):
+        converted = {}
+        for key, value in attributes.items():
+            if value is None:
+                continue
+            if not isinstance(value, (bool, int, float, str)):
+                value = str(value)
+            converted['pyhocon.' + key] = value
+        return converted
+
+    def begin(self, phase, attributes):
+        otel_span = self.tracer.start_span('pyhocon.' + phase, attributes=self._attributes(attributes))
+        scope = self._trace.use_span(otel_span, end_on_exit=False)
+        scope.__enter__()
+        self._stack().append((otel_span, scope))
+
+    def end(self, phase, attributes, error=None):
+        otel_span, scope = self._stack().pop()
+        try:
+            otel_span.set_attributes(self._attributes(attributes))
+            if error is not None:
+                otel_span.record_exception(error)
+                otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        finally:
+            scope.__exit__(None, None, None)
+            otel_span.end()
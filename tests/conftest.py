@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption('--scaling', action='store_true', default=False,
+                     help='run the scaling tests timing the hot paths (slow, also enabled by PYHOCON_SCALING=1)')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'scaling: wall-clock growth tests, run with --scaling or PYHOCON_SCALING=1')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--scaling') or os.environ.get('PYHOCON_SCALING') == '1':
+        return
+    skip = pytest.mark.skip(reason='scaling tests are slow and depend on the load of the machine, run with --scaling')
+    for item in items:
+        if 'scaling' in item.keywords:
+            item.add_marker(skip)
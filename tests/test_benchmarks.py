@@ -0,0 +1,31 @@
+import json
+
+from benchmarks.runner import compare, run
+
+
+class TestBenchmarks(object):
+
+    def test_run(self):
+        results = run(scale=0.02, repeat=1, verbose=False)
+        assert set(result['group'] for result in results['results']) == {'parse', 'resolve', 'lookup', 'merge', 'convert'}
+        assert all(result['best'] > 0 for result in results['results'])
+        assert json.loads(json.dumps(results)) == results
+
+    def test_run_keyword(self):
+        results = run(scale=0.02, repeat=1, keyword='convert.to_', verbose=False)
+        assert [result['name'] for result in results['results']] == ['to_json', 'to_hocon', 'to_yaml', 'to_properties']
+
+    def test_compare(self):
+        baseline = {'results': [
+            {'group': 'parse', 'name': 'a', 'best': 1.0},
+            {'group': 'parse', 'name': 'b', 'best': 1.0},
+            {'group': 'parse', 'name': 'removed', 'best': 1.0},
+        ]}
+        current = {'results': [
+            {'group': 'parse', 'name': 'a', 'best': 1.05},
+            {'group': 'parse', 'name': 'b', 'best': 1.5},
+            {'group': 'parse', 'name': 'added', 'best': 1.0},
+        ]}
+        rows, regressions = compare(baseline, current, threshold=0.1)
+        assert rows == [('parse.a', 1.0, 1.05, 1.05), ('parse.b', 1.0, 1.5, 1.5)]
+        assert regressions == ['parse.b']
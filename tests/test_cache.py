@@ -0,0 +1,138 @@
+import os
+
+import pytest
+
+from pyhocon import ConfigFactory, ConfigReadOnlyException, ConfigTree, ConfigView
+from pyhocon.cache import ParseCache, get_parse_cache, parse_cache, set_parse_cache
+
+
+class TestParseCache(object):
+
+    def test_hits_and_misses(self):
+        with parse_cache(ParseCache()) as cache:
+            first = ConfigFactory.parse_string('a = 1\nb = ${a}')
+            second = ConfigFactory.parse_string('a = 1\nb = ${a}')
+        assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+        assert cache.size > 0
+        assert first == second == {'a': 1, 'b': 1}
+        assert isinstance(second, ConfigTree)
+
+    def test_copies(self):
+        with parse_cache(ParseCache()):
+            config = ConfigFactory.parse_string('a { b = 1, c = [1, 2] }')
+            config.put('a.b', 2)
+            config['a']['c'].append(3)
+            assert ConfigFactory.parse_string('a { b = 1, c = [1, 2] }') == {'a': {'b': 1, 'c': [1, 2]}}
+            assert ConfigFactory.parse_string('[1, 2]') == [1, 2]
+
+    def test_readonly(self):
+        cache = ParseCache()
+        view = cache.parse_string('a { b = 1 }', readonly=True)
+        assert isinstance(view, ConfigView)
+        assert view.get_int('a.b') == 1
+        with pytest.raises(ConfigReadOnlyException):
+            view.put('a.b', 2)
+        assert cache.parse_string('a { b = 1 }')['a']['b'] == 1
+        assert cache.parse_string('[1]', readonly=True) == [1]
+
+    def test_options(self):
+        cache = ParseCache()
+        assert cache.parse_string('a = ${?b}', resolve=False)['a'].has_substitution()
+        assert cache.parse_string('a = ${?b}', resolve=True) == {}
+        assert cache.parse_string('a = ${?b}', basedir='/tmp') == {}
+        assert (cache.hits, cache.misses) == (0, 3)
+        # unhashable options are not cached
+        cache.parse_string('a = 1', unresolved_value=[1])
+        assert len(cache) == 3
+
+    def test_lru(self):
+        cache = ParseCache(max_entries=2)
+        cache.parse_string('a = 1')
+        cache.parse_string('b = 1')
+        cache.parse_string('a = 1')
+        cache.parse_string('c = 1')
+        assert (len(cache), cache.evictions) == (2, 1)
+        cache.parse_string('a = 1')
+        assert cache.hits == 2
+        cache.parse_string('b = 1')
+        assert cache.misses == 4
+
+    def test_max_size(self):
+        cache = ParseCache()
+        cache.parse_string('a = 1')
+        size = cache.size
+        cache = ParseCache(max_size=int(size * 2.5))
+        for key in 'abc':
+            cache.parse_string(key + ' = 1')
+        assert (len(cache), cache.evictions) == (2, 1)
+        assert cache.size <= cache.max_size
+        # larger than the cache
+        cache.parse_string('d = [' + ', '.join(str(index) for index in range(1000)) + ']')
+        assert len(cache) == 2
+        cache.clear()
+        assert (len(cache), cache.size) == (0, 0)
+
+    def test_includes(self, tmpdir):
+        included = tmpdir.join('included.conf')
+        included.write('b = 2')
+        content = 'include "included.conf"\ninclude "optional.conf"'
+        with parse_cache(ParseCache()) as cache:
+            with ConfigFactory.record_files() as files:
+                assert ConfigFactory.parse_string(content, str(tmpdir)) == {'b': 2}
+                assert ConfigFactory.parse_string(content, str(tmpdir)) == {'b': 2}
+            assert files == [str(included), str(tmpdir.join('optional.conf'))] * 2
+            assert cache.hits == 1
+
+            included.write('b = 30')
+            assert ConfigFactory.parse_string(content, str(tmpdir)) == {'b': 30}
+            tmpdir.join('optional.conf').write('c = 3')
+            assert ConfigFactory.parse_string(content, str(tmpdir)) == {'b': 30, 'c': 3}
+            assert (cache.hits, cache.misses) == (1, 3)
+            # the included files are not cached apart
+            assert len(cache) == 1
+
+    def test_environment(self):
+        os.environ['PH_CACHE_X'] = 'one'
+        os.environ.pop('PH_CACHE_Y', None)
+        try:
+            with parse_cache(ParseCache()) as cache:
+                content = 'a = ${PH_CACHE_X}\nb = ${?PH_CACHE_Y}\nc = ${?c}'
+                assert ConfigFactory.parse_string(content) == {'a': 'one'}
+                assert ConfigFactory.parse_string(content) == {'a': 'one'}
+                os.environ['PH_CACHE_X'] = 'two'
+                assert ConfigFactory.parse_string(content) == {'a': 'two'}
+                os.environ['PH_CACHE_Y'] = 'y'
+                assert ConfigFactory.parse_string(content) == {'a': 'two', 'b': 'y'}
+                os.environ['c'] = 'c'
+                assert ConfigFactory.parse_string(content) == {'a': 'two', 'b': 'y', 'c': 'c'}
+            assert (cache.hits, cache.misses) == (1, 4)
+        finally:
+            for name in ['PH_CACHE_X', 'PH_CACHE_Y', 'c']:
+                os.environ.pop(name, None)
+
+    def test_files(self, tmpdir):
+        fallback = tmpdir.join('fallback.conf')
+        fallback.write('a = 1\nb = 2')
+        with parse_cache(ParseCache()) as cache:
+            for value in range(3):
+                config = ConfigFactory.parse_string('a = {value}'.format(value=value)).with_fallback(str(fallback))
+                assert config == {'a': value, 'b': 2}
+            # with_fallback parses the file without resolving it
+            assert cache.hits == 2
+            assert ConfigFactory.parse_file(str(fallback)) == {'a': 1, 'b': 2}
+            assert ConfigFactory.parse_file(str(fallback)) == {'a': 1, 'b': 2}
+            fallback.write('a = 1\nb = 3')
+            assert ConfigFactory.parse_file(str(fallback)) == {'a': 1, 'b': 3}
+        assert cache.hits == 3
+
+    def test_set_parse_cache(self):
+        cache = ParseCache()
+        assert get_parse_cache() is None
+        assert set_parse_cache(cache) is None
+        try:
+            with parse_cache(None):
+                ConfigFactory.parse_string('a = 1')
+            assert get_parse_cache() is cache
+        finally:
+            assert set_parse_cache(None) is cache
+        assert cache.misses == 0
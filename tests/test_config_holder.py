@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+from pyhocon import ConfigFactory, ConfigHolder
+from pyhocon.exceptions import ConfigException
+
+
+class TestConfigHolder(object):
+
+    def counting_loader(self):
+        counter = [0]
+
+        def load():
+            counter[0] += 1
+            return ConfigFactory.parse_string(
+                """
+                version = {version}
+                service {{ version = ${{version}}, hosts = [{hosts}] }}
+                """.format(version=counter[0], hosts=', '.join(['h'] * counter[0])))
+        return load
+
+    def test_reload(self):
+        holder = ConfigHolder(self.counting_loader())
+        config = holder.snapshot()
+        assert config.get_int('version') == 1
+        assert holder.generation == 1
+
+        holder.reload()
+        assert holder.snapshot().get_int('version') == 2
+        assert holder.view('service').get_int('version') == 2
+        assert holder.generation == 2
+        # previous snapshots are left untouched
+        assert config.get_int('version') == 1
+
+    def test_not_loaded(self):
+        holder = ConfigHolder(self.counting_loader(), load=False)
+        assert holder.snapshot() is None
+        assert holder.generation == 0
+        with pytest.raises(ConfigException):
+            holder.view('service')
+        holder.reload()
+        assert holder.view('service').get_int('version') == 1
+
+    def test_reload_failure_keeps_config(self):
+        def failing_loader():
+            raise IOError('cannot read config')
+
+        holder = ConfigHolder(self.counting_loader())
+        config = holder.snapshot()
+        holder._loader = failing_loader
+        with pytest.raises(IOError):
+            holder.reload()
+        assert holder.snapshot() is config
+        assert holder.generation == 1
+
+    def test_reload_hooks(self):
+        calls = []
+
+        def failing_hook(old_config, new_config):
+            raise ValueError('hook failure')
+
+        holder = ConfigHolder(self.counting_loader())
+        holder.add_reload_hook(failing_hook)
+        holder.add_reload_hook(lambda old_config, new_config: calls.append(
+            (old_config.get_int('version'), new_config.get_int('version'))))
+        holder.reload()
+        holder.publish(ConfigFactory.parse_string('version = 10'))
+        assert calls == [(1, 2), (2, 10)]
+
+    def test_concurrent_readers(self):
+        holder = ConfigHolder(self.counting_loader())
+        errors = []
+        done = threading.Event()
+
+        def read():
+            try:
+                while not done.is_set():
+                    config = holder.snapshot()
+                    version = config.get_int('version')
+                    assert config.get_int('service.version') == version
+                    assert len(config.get_list('service.hosts')) == version
+                    time.sleep(0)
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        try:
+            for _ in range(20):
+                holder.reload()
+        finally:
+            done.set()
+            for reader in readers:
+                reader.join()
+
+        assert errors == []
+        assert holder.generation == 21
+        assert holder.snapshot().get_int('version') == 21
@@ -4,6 +4,7 @@ import json
 import os
 import shutil
 import tempfile
+import threading
 from collections import OrderedDict
 from datetime import timedelta
 
@@ -18,7 +19,7 @@ import mock
 import pytest
 from pyparsing import ParseBaseException, ParseException, ParseSyntaxException
 
-from pyhocon import (ConfigFactory, ConfigParser, ConfigSubstitutionException,
+from pyhocon import (ConfigFactory, ConfigList, ConfigParser, ConfigSubstitutionException,
                      ConfigTree, HOCONConverter)
 from pyhocon.exceptions import (ConfigException, ConfigMissingException,
                                 ConfigWrongTypeException)
@@ -1023,6 +1024,14 @@ class TestConfigParser(object):
                 """
             )
 
+    def test_self_ref_substitution_dict_chain(self):
+        # each link used to transform all the previous ones again (exponential time)
+        lines = ['a = ${{a}} {{ k{index} = {index} }}'.format(index=index) for index in range(60)]
+        lines.extend(['b += [1]', 'b += [2]', 'b += [3]'] * 20)
+        config = ConfigFactory.parse_string('\n'.join(['a { x = 1 }', 'b = []'] + lines))
+        assert config['a'] == dict([('x', 1)] + [('k{index}'.format(index=index), index) for index in range(60)])
+        assert config['b'] == [1, 2, 3] * 20
+
     def test_self_ref_substitution_dict_merge(self):
         """
         Example from HOCON spec
@@ -1227,6 +1236,23 @@ class TestConfigParser(object):
         assert 'Homer\'s favorite coffee' in names
         assert 'milk' in types
 
+    def test_parse_in_threads(self):
+        # the grammar is shared, each thread parses its files (and their includes) from its own base directory
+        files = ['samples/all_animals.conf', 'samples/all_bars.conf', 'samples/animals.conf', 'samples/database.conf']
+        expected = [ConfigFactory.parse_file(filename) for filename in files]
+        results = {}
+
+        def parse(index):
+            results[index] = [ConfigFactory.parse_file(files[index % len(files)]) for _ in range(5)]
+
+        threads = [threading.Thread(target=parse, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for index in range(8):
+            assert results[index] == [expected[index % len(files)]] * 5
+
     def test_list_of_dicts(self):
         config = ConfigFactory.parse_string(
             """
@@ -2312,6 +2338,69 @@ test2 = test
         config = ConfigFactory.from_dict(d)
         assert config == d
 
+    def test_from_dict_literal_keys(self):
+        d = OrderedDict()
+        d['a.b'] = {'c': [1, {'d.e': None}, [2]]}
+        d['f'] = 'g'
+        d['h'] = {}
+        config = ConfigFactory.from_dict(d, literal_keys=True)
+        assert list(config) == ['"a.b"', 'f', 'h']
+        assert config.get_list('"a.b".c')[1]['"d.e"'] is None
+        assert config.get_list('"a.b".c')[2] == [2]
+        assert config.get_config('h') == {}
+        assert not config.root
+        assert ConfigFactory.from_dict({'a.b': 1}) == {'a': {'b': 1}}
+
+        config = ConfigFactory.from_dict(d, root=True, literal_keys=True)
+        assert config.root
+        assert not config['"a.b"'].root
+        merged = ConfigFactory.parse_string('x = ${f}', resolve=False).with_fallback(config)
+        assert merged['x'] == 'g'
+
+    def test_from_dict_literal_keys_config(self):
+        source = ConfigFactory.parse_string('"a.b" { "c:d" = 1, e = [{ "f.g" = 2 }] }\nh = 3')
+        config = ConfigFactory.from_dict(source, literal_keys=True)
+        assert config == source
+        assert list(config) == ['"a.b"', 'h']
+        assert config.get_int('"a.b"."c:d"') == 1
+        assert config.get_list('"a.b".e')[0].get_int('"f.g"') == 2
+        assert config['"a.b"'] is not source['"a.b"']
+        # views and wrapped mappings also give quoted keys
+        assert ConfigFactory.from_dict(source.get_view(), literal_keys=True) == source
+        wrapped = ConfigTree.wrap({'a.b': {'c:d': 1}})
+        assert list(ConfigFactory.from_dict(wrapped, literal_keys=True)['"a.b"']) == ['"c:d"']
+
+    def test_from_dict_literal_keys_deep(self):
+        d = value = {}
+        for _ in range(5000):
+            value['a'] = {}
+            value = value['a']
+        value['b'] = [1]
+        config = ConfigFactory.from_dict(d, literal_keys=True)
+        for _ in range(5000):
+            config = config['a']
+        assert config['b'] == [1]
+
+    def test_resolve_paths(self):
+        source = """
+            a = ${b} ${c.d}
+            b = {x: 1}
+            c {d = {y: 2}}
+            e = ${missing}
+            f = abc
+            f = ${f}def
+            g = ${f}
+            h = ${g} ${?HOME}
+        """
+        config = ConfigParser.resolve_paths(ConfigFactory.parse_string(source, resolve=False), ['a.x', 'h'])
+        assert list(config) == ['a', 'b', 'c', 'f', 'g', 'h']
+        expected = ConfigFactory.parse_string(source.replace('${missing}', '1'))
+        for path in ['a', 'b', 'c', 'f', 'g', 'h']:
+            assert config[path] == expected[path]
+
+        with pytest.raises(ConfigSubstitutionException):
+            ConfigParser.resolve_paths(ConfigFactory.parse_string(source, resolve=False), ['e'])
+
     def test_object_concat(self):
         config = ConfigFactory.parse_string(
             """o1 = {
@@ -2698,6 +2787,93 @@ www.example-ö.com {
         assert config['foo'] == 'bar'
 
 
+class TestParseJson(object):
+    SOURCE = u"""
+    {
+        "a.b": 1,
+        "c": {"d": null, "e": [1, {"f": 2.5}, "s", true], "g$": false},
+        "h": "${x}",
+        "c": {"i": -1e3},
+        "j": 12345678901234567890,
+        "k": "tab\\t quote\\" newline\\n"
+    }
+    """
+
+    def test_same_as_parse_string(self):
+        expected = ConfigFactory.parse_string(self.SOURCE)
+        config = ConfigFactory.parse_json(self.SOURCE)
+        assert list(OrderedDict.items(config)) == list(OrderedDict.items(expected))
+        assert config.root
+        assert config.get_int('"a.b"') == 1
+        assert config.get('c.d') is None
+        assert config.get_bool('c."g$"') is False
+        assert config.get_list('c.e')[1]['f'] == 2.5
+        assert config.get_string('h') == '${x}'
+        assert config.get_float('c.i') == -1000.0
+        assert config.get_string('k') == 'tab\t quote" newline\n'
+
+    def test_duplicate_keys(self):
+        config = ConfigFactory.parse_json('{"a": {"b": 1}, "c": 1, "a": {"d": 2}, "c": {"e": 3}, "a": {"b": 4}}')
+        assert config == {'a': {'b': 4, 'd': 2}, 'c': {'e': 3}}
+        assert list(config) == ['a', 'c']
+
+    def test_merge_with_hocon(self):
+        config = ConfigFactory.parse_string('x = ${a.b}, a.c = 2', resolve=False)
+        config = config.with_fallback(ConfigFactory.parse_json('{"a": {"b": 1}}'))
+        assert config == {'x': 1, 'a': {'b': 1, 'c': 2}}
+
+    def test_list(self):
+        config = ConfigFactory.parse_json('[1, {"a.b": [null]}]')
+        assert isinstance(config, ConfigList)
+        assert config[1]['"a.b"'] == [None]
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            ConfigFactory.parse_json('{a: 1}')
+        with pytest.raises(ValueError):
+            ConfigFactory.parse_json('{"a": NaN}')
+        with pytest.raises(ConfigException):
+            ConfigFactory.parse_json('1')
+
+    def test_parse_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            json_file = os.path.join(tmpdir, 'config.json')
+            with open(json_file, 'w') as fd:
+                fd.write(self.SOURCE)
+            with mock.patch.object(ConfigParser, 'parse', side_effect=AssertionError('HOCON parser used')):
+                config = ConfigFactory.parse_file(json_file, json_fast_path=True)
+            assert config == ConfigFactory.parse_string(self.SOURCE)
+
+            # files that are not plain JSON are parsed as HOCON
+            with open(json_file, 'w') as fd:
+                fd.write('{"a": 1, "b": ${a} // comment\n}')
+            assert ConfigFactory.parse_file(json_file, json_fast_path=True) == {'a': 1, 'b': 1}
+
+            # the HOCON grammar is used by default
+            with open(json_file, 'w') as fd:
+                fd.write(r'{"k": "\u00e9\/"}')
+            assert ConfigFactory.parse_file(json_file) == {'k': r'\u00e9\/'}
+            assert ConfigFactory.parse_file(json_file, json_fast_path=True) == {'k': u'\u00e9/'}
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_differences_with_parse_string(self):
+        source = '{"a": 1, "a": {"b": 2}}'
+        with pytest.raises(ConfigWrongTypeException):
+            ConfigFactory.parse_string(source)
+        assert ConfigFactory.parse_json(source) == {'a': {'b': 2}}
+
+        source = r'{"k": "\u00e9\/"}'
+        assert ConfigFactory.parse_string(source)['k'] == r'\u00e9\/'
+        assert ConfigFactory.parse_json(source)['k'] == u'\u00e9/'
+
+        source = r'{"a\"b": 1}'
+        assert list(ConfigFactory.parse_string(source)) == ['a\\']
+        assert ConfigFactory.parse_string(source).get_int('"a\\".b') == 1
+        assert list(ConfigFactory.parse_json(source)) == ['a"b']
+
+
 try:
     from dateutil.relativedelta import relativedelta
 
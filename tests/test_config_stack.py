@@ -0,0 +1,86 @@
+import pytest
+from pyhocon import ConfigFactory, ConfigStack
+from pyhocon.exceptions import ConfigMissingException, ConfigWrongTypeException
+
+
+class TestConfigStack(object):
+    REFERENCE = """
+        service {
+            host = localhost
+            port = 8080
+            db { user = scott, pool = 4 }
+        }
+        features = [a, b]
+        timeout = 10
+    """
+
+    APPLICATION = """
+        service.db.pool = 8
+        service.name = app
+        timeout = { connect = 1 }
+    """
+
+    CLI = """
+        service.port = 9090
+    """
+
+    def layers(self):
+        return [ConfigFactory.parse_string(content) for content in [self.REFERENCE, self.APPLICATION, self.CLI]]
+
+    def test_lookups(self):
+        stack = ConfigStack(self.layers())
+        assert stack.get_int('service.port') == 9090
+        assert stack.get_string('service.host') == 'localhost'
+        assert stack['service.db.pool'] == 8
+        assert stack.get_list('features') == ['a', 'b']
+        assert stack.get_int('timeout.connect') == 1
+        assert stack.get('missing', 'default') == 'default'
+        assert 'service.db.user' in stack
+        assert 'service.missing' not in stack
+        with pytest.raises(ConfigMissingException):
+            stack.get('service.missing')
+
+    def test_object_merge(self):
+        reference, application, cli = self.layers()
+        stack = ConfigStack([reference, application, cli])
+        assert stack.get_config('service') == {
+            'host': 'localhost',
+            'port': 9090,
+            'db': {'user': 'scott', 'pool': 8},
+            'name': 'app'
+        }
+        # objects are overridden by a value from a higher layer
+        assert stack.get_config('timeout') == {'connect': 1}
+        # layers are not modified
+        assert reference.get_int('service.port') == 8080
+        assert 'name' not in reference['service']
+
+    def test_shadowed_path(self):
+        stack = ConfigStack([ConfigFactory.parse_string('a { b = 1 }'), ConfigFactory.parse_string('a = 2')])
+        assert stack.get('a') == 2
+        assert stack.get('a.b', None) is None
+        with pytest.raises(ConfigWrongTypeException):
+            stack.get('a.b')
+
+    def test_materialize(self):
+        layers = self.layers()
+        stack = ConfigStack(layers)
+        expected = layers[2].with_fallback(layers[1]).with_fallback(layers[0])
+        assert stack.materialize() == expected
+
+    def test_materialize_substitutions_across_layers(self):
+        stack = ConfigStack([
+            ConfigFactory.parse_string('host = localhost'),
+            ConfigFactory.parse_string('url = "http://"${host}', resolve=False)
+        ])
+        assert stack.materialize().get_string('url') == 'http://localhost'
+
+    def test_set_layer(self):
+        reference, application, cli = self.layers()
+        stack = ConfigStack([reference, application])
+        stack.push(cli)
+        assert stack.get_int('service.port') == 9090
+        stack.set_layer(2, ConfigFactory.parse_string('service.port = 7070'))
+        assert stack.get_int('service.port') == 7070
+        assert stack.layers[:2] == (reference, application)
+        assert stack.layers[0] is reference
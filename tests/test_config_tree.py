@@ -1,11 +1,33 @@
 import pytest
+from datetime import timedelta
 from collections import OrderedDict
-from pyhocon.config_tree import ConfigTree, NoneValue
+from pyhocon.config_tree import ConfigMapping, ConfigTree, ConfigView, NoneValue
 from pyhocon.exceptions import (
-    ConfigMissingException, ConfigWrongTypeException, ConfigException)
-from pyhocon.config_parser import ConfigFactory
+    ConfigMissingException, ConfigWrongTypeException, ConfigException, ConfigReadOnlyException)
+from pyhocon.config_parser import ConfigFactory, ConfigParser
 from pyhocon.tool import HOCONConverter
 
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+
+class FrozenMapping(Mapping):
+    """Read-only mapping that is not a dict (e.g., like types.MappingProxyType)"""
+
+    def __init__(self, *args, **kwargs):
+        self._data = OrderedDict(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
 
 class TestConfigTree(object):
 
@@ -350,3 +372,256 @@ class TestConfigTree(object):
         assert result.get_string('nested.value.a') == "string"
         assert result.get_int('nested.value.b') == 10
         assert config != result
+
+    def test_with_fallback_persistent(self):
+        base = ConfigFactory.parse_string(
+            """
+            a { b = 1, c = 2 }
+            d { e = [1, 2] }
+            f = 3
+            """
+        )
+        override = ConfigFactory.parse_string(
+            """
+            a.c = 4
+            g = 5
+            """
+        )
+        result = override.with_fallback(base, persistent=True)
+        assert result == override.with_fallback(base)
+        assert result == {'a': {'b': 1, 'c': 4}, 'd': {'e': [1, 2]}, 'f': 3, 'g': 5}
+        # untouched subtrees are shared, merged objects are new
+        assert result['d'] is base['d']
+        assert result['a'] is not base['a']
+        # inputs are left untouched
+        assert base == {'a': {'b': 1, 'c': 2}, 'd': {'e': [1, 2]}, 'f': 3}
+        assert override == {'a': {'c': 4}, 'g': 5}
+        assert result.history['a'] == base.history['a'] + override.history['a']
+        # the history of the keys that are not overridden is shared, the one of the overridden keys is new
+        assert result.history['d'] is base.history['d']
+        assert result.history['a'] is not base.history['a']
+        assert len(base.history['a']) == 1
+
+    def test_with_fallback_persistent_history(self):
+        base = ConfigFactory.parse_string('x = 2')
+        override = ConfigFactory.parse_string('y = 1')
+        result = override.with_fallback(base, persistent=True)
+        ConfigTree.merge_configs(result, ConfigFactory.parse_string('x = 3, y = 4'))
+        result.put('x', 5)
+        assert result.history == {'x': [2, 3, 5], 'y': [1, 4]}
+        # the history lists shared with the inputs are copied before being modified
+        assert base.history == {'x': [2]}
+        assert override.history == {'y': [1]}
+
+    def test_with_fallback_persistent_unresolved(self):
+        base = ConfigFactory.parse_string("a = 1")
+        override = ConfigFactory.parse_string("b = ${a}", resolve=False)
+        with pytest.raises(ConfigException):
+            override.with_fallback(base, persistent=True)
+        # unresolved values in the fallback or deep in the overriding config
+        with pytest.raises(ConfigException):
+            base.with_fallback(override, persistent=True)
+        nested = ConfigFactory.parse_string("c { d = [1, {e = ${a}}] }", resolve=False)
+        with pytest.raises(ConfigException):
+            nested.with_fallback(base, persistent=True)
+        with pytest.raises(ConfigException):
+            base.with_fallback(base, resolve=False, persistent=True)
+
+    def test_config_view(self):
+        config = ConfigFactory.parse_string(
+            """
+            service {
+                db { host = localhost, port = 5432, "a.b" = 1 }
+                hosts = [{ name = h1 }]
+            }
+            """
+        )
+        view = config.get_view('service.db')
+        assert view.get_string('host') == 'localhost'
+        assert view.get_int('port') == 5432
+        assert view['"a.b"'] == 1
+        assert view.get('missing', 'default') == 'default'
+        assert 'port' in view
+        assert 'missing' not in view
+        assert list(view) == ['host', 'port', '"a.b"']
+        assert len(view) == 3
+        assert view == {'host': 'localhost', 'port': 5432, '"a.b"': 1}
+        with pytest.raises(ConfigMissingException):
+            view.get('missing')
+
+        service = config.get_view('service')
+        assert isinstance(service.get_config('db'), ConfigView)
+        assert service.get_config('db').get_int('port') == 5432
+        assert isinstance(service.get_list('hosts')[0], ConfigView)
+
+        # views are live
+        config.put('service.db.port', 5433)
+        assert view.get_int('port') == 5433
+
+    def test_config_view_read_only(self):
+        config = ConfigFactory.parse_string("a { b = 1 }")
+        view = config.get_view()
+        for mutate in [
+            lambda: view.put('a.b', 2),
+            lambda: view.pop('a.b'),
+            lambda: view.__setitem__('a', 2),
+            lambda: view.__delitem__('a'),
+            lambda: view['a'].put('b', 2)
+        ]:
+            with pytest.raises(ConfigReadOnlyException):
+                mutate()
+        assert config == {'a': {'b': 1}}
+
+        copied = view.materialize()
+        copied.put('a.b', 2)
+        assert config.get_int('a.b') == 1
+
+    def test_config_view_convert(self):
+        config = ConfigFactory.parse_string("a { b = 1, c = [1, { d = 2 }] }\ne = 3")
+        view = config.get_view('a')
+        for output_format in ['json', 'hocon', 'yaml', 'properties']:
+            assert HOCONConverter.convert(view, output_format) == HOCONConverter.convert(config['a'], output_format)
+        assert HOCONConverter.to_json(view) == HOCONConverter.to_json(config['a'])
+        assert HOCONConverter.to_hocon(config.get_view()) == HOCONConverter.to_hocon(config)
+        assert config == {'a': {'b': 1, 'c': [1, {'d': 2}]}, 'e': 3}
+
+    def test_config_view_not_config(self):
+        config = ConfigFactory.parse_string("a = 1")
+        with pytest.raises(ConfigException):
+            config.get_view('a')
+
+    def test_merge_configs_deep(self):
+        depth = 5000
+
+        def deep_config(value):
+            config = root = ConfigTree()
+            for _ in range(depth):
+                child = ConfigTree()
+                config['k'] = child
+                config = child
+            config['v' + str(value)] = value
+            return root
+
+        merged = ConfigTree.merge_configs(deep_config(1), deep_config(2))
+        node = merged
+        for _ in range(depth):
+            node = node['k']
+        assert node == {'v1': 1, 'v2': 2}
+
+    def test_merge_configs_history(self):
+        config = ConfigTree(root=True)
+        fragments = []
+        for index in range(3):
+            fragment = ConfigFactory.parse_string('a = {index}'.format(index=index))
+            fragments.append(fragment)
+            ConfigTree.merge_configs(config, fragment)
+        assert config.history['a'] == [0, 1, 2]
+        # history of merged configs is not modified
+        assert [fragment.history['a'] for fragment in fragments] == [[0], [1], [2]]
+
+        config = ConfigTree(root=True)
+        ConfigTree.merge_configs(config, fragments[0], history=False)
+        assert config == {'a': 0}
+        assert config.history == {}
+
+    def test_merge_configs_without_history_resolve(self):
+        config = ConfigTree(root=True)
+        ConfigTree.merge_configs(config, ConfigFactory.parse_string('a = 1, b = ${a}', resolve=False), history=False)
+        ConfigParser.resolve_substitutions(config)
+        assert config == {'a': 1, 'b': 1}
+
+    def test_as_dict(self):
+        config = ConfigFactory.parse_string(
+            """
+            "a.b" = 5
+            a { "b.c" = [{ "c.d" = 1 }, 2, [3, null]] }
+            e = null
+            f = 10 milliseconds
+            """
+        )
+        d = config.as_dict()
+        assert type(d) is dict and type(d['a']) is dict and type(d['a']['b.c']) is list
+        assert d == {
+            'a.b': 5,
+            'a': {'b.c': [{'c.d': 1}, 2, [3, None]]},
+            'e': None,
+            'f': timedelta(milliseconds=10)
+        }
+        assert list(d) == ['a.b', 'a', 'e', 'f']
+
+    def test_as_dict_converters(self):
+        config = ConfigFactory.parse_string("a = 10 ms, b = [500 ms], c = 2 months")
+        d = config.as_dict(timedelta_converter=timedelta.total_seconds, relativedelta_converter=str)
+        assert d['a'] == 0.01
+        assert d['b'] == [0.5]
+        assert d['c'] == 'relativedelta(months=+2)'
+
+    def test_as_dict_unresolved(self):
+        config = ConfigFactory.parse_string("a = ${b}", resolve=False)
+        with pytest.raises(ConfigException):
+            config.as_dict()
+
+    def test_wrap(self):
+        data = {'a': {'b': 1, 'c.d': [1, {'e': 'x'}, None]}, 'f': None, 'g': '5'}
+        config = ConfigTree.wrap(data)
+        assert isinstance(config, ConfigMapping)
+        assert config.get_int('a.b') == 1
+        assert config.get_int('g') == 5
+        assert config.get('f') is None
+        assert config.get_list('a."c.d"')[1].get_string('e') == 'x'
+        assert config.get_list('a."c.d"')[2] is None
+        assert isinstance(config.get_config('a'), ConfigMapping)
+        assert sorted(config.get_config('a')) == ['"c.d"', 'b']
+        assert len(config) == 3
+        assert 'a.b' in config
+        assert 'a.z' not in config
+        assert config.get('a.z', 2) == 2
+        with pytest.raises(ConfigMissingException):
+            config.get('a.z')
+        with pytest.raises(ConfigWrongTypeException):
+            config.get('g.z')
+
+    def test_wrap_copy_on_write(self):
+        data = {'a': {'b': 1}}
+        config = ConfigTree.wrap(data)
+        config.put('a.c', 2)
+        config['d'] = 3
+        assert config.get_int('a.c') == 2
+        assert config.get_int('d') == 3
+        assert config.pop('a.b') == 1
+        assert data == {'a': {'b': 1}}
+
+    def test_wrap_mapping(self):
+        data = FrozenMapping([('a', FrozenMapping([('b', 1), ('c', (1, FrozenMapping(d=2)))])), ('e', 'xy')])
+        config = ConfigTree.wrap(data)
+        config.put('x', 1)
+        assert config.as_plain_ordered_dict() == {'a': {'b': 1, 'c': [1, {'d': 2}]}, 'e': 'xy', 'x': 1}
+        assert isinstance(config.get_config('a'), ConfigTree)
+        expected = ConfigFactory.parse_string('a { b = 1, c = [1, { d = 2 }] }\ne = xy')
+        assert HOCONConverter.to_json(ConfigTree.wrap(data)) == HOCONConverter.to_json(expected)
+        assert HOCONConverter.convert(ConfigTree.wrap(data), 'json') == HOCONConverter.convert(expected, 'json')
+        assert ConfigFactory.from_dict(data, literal_keys=True)['a']['c'][1].get_int('d') == 2
+
+    def test_wrap_tuple_of_mappings(self):
+        data = {'a': ({'b': 1}, FrozenMapping(c=(2, 3))), 'd': 'xy'}
+        config = ConfigTree.wrap(data)
+        items = config.get_list('a')
+        assert isinstance(items, list)
+        assert items[0].get_int('b') == 1
+        assert items[1].get_list('c') == [2, 3]
+        assert config.get('a')[1]['c'] == [2, 3]
+        assert config.get_string('d') == 'xy'
+        # same values as the materialized config
+        assert config.get_list('a') == config.materialize().get_list('a')
+
+    def test_wrap_with_fallback_and_convert(self):
+        data = {'a': {'b': 1, 'c.d': 2}}
+        config = ConfigFactory.parse_string('x = ${a.b}, a.e = 3', resolve=False).with_fallback(ConfigTree.wrap(data))
+        assert config == {'x': 1, 'a': {'b': 1, '"c.d"': 2, 'e': 3}}
+        config = ConfigTree.wrap(data).with_fallback(ConfigFactory.parse_string('a.f = 4'))
+        assert config == {'a': {'b': 1, '"c.d"': 2, 'f': 4}}
+        assert data == {'a': {'b': 1, 'c.d': 2}}
+
+        expected = ConfigFactory.from_dict(data, literal_keys=True)
+        assert HOCONConverter.to_hocon(ConfigTree.wrap(data)) == HOCONConverter.to_hocon(expected)
+        assert HOCONConverter.convert(ConfigTree.wrap(data), 'json') == HOCONConverter.to_json(expected)
@@ -1,7 +1,8 @@
 # -*- encoding: utf-8 -*-
 from datetime import timedelta
+from io import StringIO
 
-from pyhocon import ConfigTree
+from pyhocon import ConfigFactory, ConfigTree
 from pyhocon.converter import HOCONConverter
 
 
@@ -128,3 +129,32 @@ class TestConverterToHocon(object):
                                             (relativedelta(hours=2), 'td = 2 hours'),
                                             (relativedelta(minutes=43), 'td = 43 minutes'),):
             assert expected_result == to_hocon({'td': time_delta})
+
+
+class TestConverterToJsonFast(object):
+    def test_same_as_to_json(self):
+        config = ConfigFactory.parse_string(u"""
+            a = {b: 1, c: [1, 2.5, {d: null}], e: {}}
+            f = []
+            "g.h" = "quote \\" and \\u00e9"
+            i = true, j = false, k = null
+            l = 10 ms, m = 4 days
+            n = \"\"\"multi
+            line\"\"\"
+            o = -1e10
+        """)
+        for indent in [0, 2, 4]:
+            assert HOCONConverter.to_json_fast(config, indent=indent) == HOCONConverter.to_json(config, indent=indent)
+
+    def test_fallback_to_json(self):
+        for config in [
+            ConfigTree({'a\\b': 1}),
+            ConfigTree({'a': float('inf')}),
+            ConfigTree({'a': [object()]}),
+            ConfigFactory.parse_string('a = ${b}', resolve=False),
+            ConfigFactory.parse_string('[1, 2]'),
+        ]:
+            assert HOCONConverter.to_json_fast(config) == HOCONConverter.to_json(config)
+            output = StringIO()
+            HOCONConverter.write(config, output, 'json')
+            assert output.getvalue() == HOCONConverter.to_json(config)
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+import pyhocon
+
+
+def imported_modules(code):
+    """Return the modules imported by some code run in a new interpreter"""
+    output = subprocess.check_output([sys.executable, '-c', code + '\nimport sys\nprint(" ".join(sys.modules))'])
+    return set(output.decode('ascii').split())
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='pyhocon is imported eagerly')
+class TestImports(object):
+    # modules that are slow to import and only needed to parse configs
+    PARSER_MODULES = {'pyparsing', 'dateutil', 'urllib.request', 'socket', 'pyhocon.config_parser'}
+
+    def test_import_pyhocon(self):
+        assert not imported_modules('import pyhocon') & (self.PARSER_MODULES | {'pyhocon.config_tree', 'json'})
+
+    def test_build_and_convert(self):
+        code = ('from pyhocon import ConfigTree, HOCONConverter\n'
+                'config = ConfigTree()\n'
+                'config.put("a.b", [1, 2])\n'
+                'HOCONConverter.to_json(config)\n'
+                'HOCONConverter.to_hocon(config)')
+        assert not imported_modules(code) & self.PARSER_MODULES
+
+    def test_tool(self):
+        assert not imported_modules('import pyhocon.tool') & (self.PARSER_MODULES | {'multiprocessing'})
+
+    def test_parse(self):
+        modules = imported_modules('from pyhocon import ConfigFactory\nConfigFactory.parse_string("a = 1")')
+        assert 'pyparsing' in modules
+        assert 'urllib.request' not in modules
+
+    def test_lazy_attributes(self):
+        from pyhocon.config_parser import ConfigFactory
+        assert pyhocon.ConfigFactory is ConfigFactory
+        assert 'ConfigFactory' in dir(pyhocon)
+        assert set(pyhocon.__all__) <= set(dir(pyhocon))
+        with pytest.raises(AttributeError):
+            pyhocon.Missing
+
+    def test_submodule_attributes(self):
+        code = ('import pyhocon\n'
+                'assert pyhocon.config_tree.ConfigTree is pyhocon.ConfigTree\n'
+                'assert pyhocon.config_parser.ConfigFactory is pyhocon.ConfigFactory\n'
+                'assert pyhocon.converter.HOCONConverter is pyhocon.HOCONConverter\n'
+                'assert "config_tree" in dir(pyhocon) and "tool" in dir(pyhocon)')
+        assert 'pyhocon.config_parser' in imported_modules(code)
+        assert not imported_modules('import pyhocon\ndir(pyhocon)') & self.PARSER_MODULES
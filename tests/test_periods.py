@@ -1,7 +1,9 @@
 from datetime import timedelta
 
 import pytest
+from pyparsing import ParseException
 
+from pyhocon import ConfigFactory
 from pyhocon.period_parser import parse_period
 from pyhocon.period_serializer import timedelta_to_hocon
 
@@ -102,3 +104,10 @@ def test_format_time_delta():
                                         (timedelta(seconds=51), '51 seconds'),
                                         (timedelta(microseconds=786), '786 microseconds')):
         assert expected_result == timedelta_to_hocon(time_delta)
+
+
+def test_non_ascii_digits():
+    with pytest.raises(ParseException):
+        parse_period(u'٣ days')
+    config = ConfigFactory.parse_string(u'a = ٣ days')
+    assert config['a'] == u'٣ days'
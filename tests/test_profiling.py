@@ -0,0 +1,55 @@
+import pytest
+
+from pyhocon import ConfigFactory
+from pyhocon.exceptions import ConfigException
+from pyhocon.profiling import HISTORY, SOURCE_STRINGS, profile_memory, retained_objects
+from pyhocon.tool import profile_main
+
+
+class TestProfiling(object):
+
+    def test_profile_memory(self, tmpdir):
+        tmpdir.join('included.conf').write('included { ' + ', '.join('k{0} = {0}'.format(i) for i in range(100)) + ' }')
+        tmpdir.join('main.conf').write('include "included.conf"\na = ${included.k1}\nb = [1]\nb += [2]')
+        profile = profile_memory(str(tmpdir.join('main.conf')), output_format='json')
+        phases = dict((phase.name, phase) for phase in profile.phases)
+        assert sorted(phases) == ['convert', 'fixup', 'include', 'parse', 'parse_file', 'read', 'resolve']
+        assert phases['read'].calls == 2
+        assert phases['parse'].calls == 2
+        assert phases['parse'].retained > 0
+        assert phases['parse'].peak >= phases['include'].peak > 0
+        assert profile.peak >= phases['parse'].peak
+        assert profile.retained > 0
+        assert profile.config['a'] == 1
+        assert '"a": 1' in profile.output
+        assert profile.objects['ConfigTree'][0] == 2
+        assert HISTORY in profile.objects
+        report = profile.format()
+        assert report.splitlines()[0].split() == ['phase', 'calls', 'peak', 'KiB', 'retained', 'KiB']
+        assert 'ConfigTree' in report
+
+    def test_profile_memory_content(self):
+        profile = profile_memory(content='a = 1', output_format=None)
+        assert [phase.name for phase in profile.phases] == ['parse', 'resolve', 'fixup']
+        assert profile.output is None
+
+    def test_profile_memory_no_input(self):
+        with pytest.raises(ConfigException):
+            profile_memory()
+
+    def test_retained_objects(self):
+        config = ConfigFactory.parse_string('a { b = 1 }\na = ${a} { c = "x" }')
+        objects = retained_objects(config)
+        # root, a, and the objects merged into a kept by its history
+        assert objects['ConfigTree'][0] >= 3
+        assert objects[HISTORY][0] == 2
+        # the history keeps the parsed values referring to the content
+        assert objects[SOURCE_STRINGS][0] == 1
+        assert all(size > 0 for _, size in objects.values())
+
+    def test_profile_main(self, tmpdir, capsys):
+        tmpdir.join('main.conf').write('a = 1')
+        profile_main(str(tmpdir.join('main.conf')), None, 'yaml')
+        out, err = capsys.readouterr()
+        assert out == 'a: 1\n'
+        assert err.startswith('phase')
@@ -0,0 +1,180 @@
+"""Growth of the time of the hot paths with the size of the config
+
+Each operation is timed at sizes n, 2n, 4n and 8n and the exponent of its growth (slope of log(time) against
+log(size)) must stay within the complexity budget of the operation: about 1 for linear operations, about 2 for the
+ones that are quadratic by design (each step of a chain of self-references builds a new copy of the value).
+
+These tests take about a minute and need an idle machine (no coverage), they are skipped unless pytest is run with
+--scaling (or PYHOCON_SCALING=1) from the root of the repository, where the benchmarks package is.
+"""
+import copy
+import math
+import timeit
+
+import pytest
+
+from pyhocon import ConfigFactory, ConfigParser, ConfigTree, HOCONConverter
+
+pytestmark = pytest.mark.scaling
+
+generators = pytest.importorskip('benchmarks.generators')
+
+LINEAR = 1.35
+QUADRATIC = 2.35
+
+
+def growth_exponent(prepare, sizes, repeat=3):
+    """Return the exponent of the growth of the time of an operation with its size
+
+    :param prepare: function returning (setup, func) for a size, setup being called before each timing of func
+    :param sizes: sizes to time func at
+    :return: slope of the least squares fit of log(time) against log(size)
+    """
+    points = []
+    for size in sizes:
+        setup, func = prepare(size)
+        best = min(timeit.Timer(func, setup).repeat(repeat=repeat, number=1))
+        points.append((math.log(size), math.log(best)))
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+
+def parsing(source):
+    def prepare(size):
+        content = source(size)
+        return (lambda: None), (lambda: ConfigFactory.parse_string(content, resolve=False))
+    return prepare
+
+
+def resolving(source):
+    def prepare(size):
+        content = source(size)
+        state = {}
+
+        def setup():
+            state['config'] = ConfigFactory.parse_string(content, resolve=False)
+
+        return setup, (lambda: ConfigParser.resolve_substitutions(state['config']))
+    return prepare
+
+
+def fixing_self_references(source):
+    def prepare(size):
+        content = source(size)
+        state = {}
+
+        def setup():
+            state['config'] = ConfigFactory.parse_string(content, resolve=False)
+
+        return setup, (lambda: ConfigParser._fixup_self_references(state['config']))
+    return prepare
+
+
+def merging(source):
+    def prepare(size):
+        config = ConfigFactory.from_dict(source(size, 'key'))
+        overrides = ConfigFactory.from_dict(source(size, 'key1'))
+        state = {}
+
+        def setup():
+            state['config'] = copy.deepcopy(config)
+
+        return setup, (lambda: ConfigTree.merge_configs(state['config'], overrides))
+    return prepare
+
+
+# configs converted by the converter scenarios, parsed once for all the formats
+_configs = {}
+
+
+def converting(source, output_format):
+    def prepare(size):
+        if (source, size) not in _configs:
+            _configs[source, size] = ConfigFactory.parse_string(source(size))
+        config = _configs[source, size]
+        return (lambda: None), (lambda: HOCONConverter.convert(config, output_format))
+    return prepare
+
+
+def wide_dict(size, prefix):
+    return dict(('{prefix}{index}'.format(prefix=prefix, index=index), index) for index in range(size))
+
+
+def deep_dict(size, prefix, depth=5):
+    tree = wide_dict(size, prefix)
+    for level in range(depth):
+        tree = {'level{level}'.format(level=level): tree, 'value': level}
+    return tree
+
+
+def dotted_keys(size):
+    return '\n'.join('a.b.key{index} = {index}'.format(index=index) for index in range(size))
+
+
+def nested_lists(size):
+    return 'lists = [' + ', '.join('[{index}, {{ key = [{index}] }}]'.format(index=index) for index in range(size)) + ']'
+
+
+def self_referencing_object(size):
+    return '\n'.join(['a { x = 1 }'] + ['a = ${{a}} {{ key{index} = {index} }}'.format(index=index) for index in range(size)])
+
+
+def forward_references(size):
+    return '\n'.join(['key0 = 1'] + ['key{index} = ${{key{previous}}}'.format(index=index, previous=index - 1)
+                                     for index in range(1, size)])
+
+
+def backward_references(size):
+    lines = ['key{index} = ${{key{next}}}'.format(index=index, next=index + 1) for index in range(size)]
+    return '\n'.join(lines + ['key{size} = 1'.format(size=size)])
+
+
+def optional_references(size):
+    return '\n'.join('key{index} = ${{?undefined{index}}}'.format(index=index) for index in range(size))
+
+
+def overrides(size):
+    return '\n'.join('key{index} = 1\nkey{index} = ${{key{index}}}'.format(index=index) for index in range(size))
+
+
+SCENARIOS = [
+    # ConfigTreeParser.postParse and ListParser.postParse
+    ('parse wide object', parsing(generators.wide_object), [100, 200, 400, 800], LINEAR),
+    ('parse large list', parsing(generators.large_list), [200, 400, 800, 1600], LINEAR),
+    ('parse substitutions', parsing(generators.dense_substitutions), [100, 200, 400, 800], LINEAR),
+    # each reopening of a root object copies it into the history used to resolve self-references
+    ('parse dotted keys', parsing(dotted_keys), [100, 200, 400, 800], QUADRATIC),
+
+    ('resolve substitutions', resolving(generators.dense_substitutions), [100, 200, 400, 800], LINEAR),
+    ('resolve forward references', resolving(forward_references), [100, 200, 400, 800], LINEAR),
+    ('resolve optional references', resolving(optional_references), [100, 200, 400, 800], LINEAR),
+    # one pass over the substitutions for each link of the chain
+    ('resolve backward references', resolving(backward_references), [25, 50, 100, 200], QUADRATIC),
+
+    ('fixup overrides', fixing_self_references(overrides), [100, 200, 400, 800], LINEAR),
+    # each link copies the object (or list) built by the previous ones, this was exponential
+    ('fixup self-referencing object', fixing_self_references(self_referencing_object), [20, 40, 80, 160], QUADRATIC),
+    ('fixup += chain', fixing_self_references(generators.append_chain), [50, 100, 200, 400], QUADRATIC),
+
+    ('merge_configs wide', merging(wide_dict), [4000, 8000, 16000, 32000], LINEAR),
+    ('merge_configs deep', merging(deep_dict), [4000, 8000, 16000, 32000], LINEAR),
+]
+
+SCENARIOS.extend(('to_{output_format} {name}'.format(output_format=output_format, name=name),
+                  converting(source, output_format), sizes, LINEAR)
+                 for output_format in ['json', 'hocon', 'yaml', 'properties']
+                 for name, source, sizes in [('wide object', generators.wide_object, [250, 500, 1000, 2000]),
+                                             ('nested lists', nested_lists, [100, 200, 400, 800])])
+
+
+class TestScaling(object):
+
+    @pytest.mark.parametrize('name, prepare, sizes, budget', SCENARIOS, ids=[scenario[0] for scenario in SCENARIOS])
+    def test_growth(self, name, prepare, sizes, budget):
+        exponent = growth_exponent(prepare, sizes)
+        if exponent > budget:
+            # measured again in case a timing was disturbed by another process
+            exponent = min(exponent, growth_exponent(prepare, sizes))
+        assert exponent <= budget, '{name} grows as n^{exponent:.2f}, the budget is n^{budget}'.format(
+            name=name, exponent=exponent, budget=budget)
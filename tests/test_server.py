@@ -0,0 +1,133 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pytest
+from pyhocon import ConfigClient, ConfigServer
+from pyhocon.exceptions import ConfigException, ConfigMissingException, ConfigReadOnlyException, ConfigWrongTypeException
+from pyhocon.tool import get_values
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='requires Unix domain sockets')
+
+
+class TestConfigServer(object):
+
+    @pytest.fixture
+    def directory(self):
+        # short path: the path of a Unix domain socket is limited to about 100 characters
+        directory = tempfile.mkdtemp()
+        yield directory
+        shutil.rmtree(directory)
+
+    @pytest.fixture
+    def server(self, directory):
+        self.write(directory, 'common.conf', 'timeout = 10 seconds')
+        self.write(directory, 'app.conf', 'include "common.conf"\nservice {name = api, port = 8080, hosts = [a, b]}\n'
+                                          'url = "http://"${service.name}":"${service.port}')
+        server = ConfigServer(os.path.join(directory, 'app.conf'), os.path.join(directory, 'sock'), interval=60)
+        server.start()
+        yield server
+        server.shutdown()
+
+    @staticmethod
+    def write(directory, name, content, mtime=None):
+        filename = os.path.join(directory, name)
+        with open(filename, 'w') as fd:
+            fd.write(content)
+        if mtime is not None:
+            os.utime(filename, (mtime, mtime))
+
+    def test_get(self, server):
+        with ConfigClient(server.socket_path) as client:
+            assert client.generation == 1
+            assert client.get('url') == 'http://api:8080'
+            assert client.get_int('service.port') == 8080
+            assert client['service.hosts'] == ['a', 'b']
+            assert client.get_list('service.hosts') == ['a', 'b']
+            assert client.get('timeout').seconds == 10
+            assert client.get_config('service').get_string('name') == 'api'
+            assert client.get('').get('service.port') == 8080
+            assert 'service.name' in client
+            assert 'service.missing' not in client
+            assert client.get('service.missing', None) is None
+            with pytest.raises(ConfigMissingException) as e:
+                client.get('service.missing')
+            assert e.value.args[0] == 'No configuration setting found for key service.missing'
+            with pytest.raises(ConfigWrongTypeException):
+                client.get('service.name.first')
+            # same as ConfigTree.get
+            assert client.get('service.name.first', None) is None
+            assert 'service.name.first' not in client
+            with pytest.raises(ConfigReadOnlyException):
+                client.get('service').put('port', 8081)
+
+    def test_reload(self, server, directory):
+        client = ConfigClient(server.socket_path)
+        assert client.get('service.port') == 8080
+        assert not server.reload()
+
+        # included file changed
+        self.write(directory, 'common.conf', 'timeout = 20 seconds', 2000)
+        assert server.reload()
+        assert client.generation == 2
+        assert client.get('timeout').seconds == 20
+
+        # the previous config is still served if the file cannot be parsed
+        self.write(directory, 'app.conf', 'service = ${missing}', 3000)
+        with pytest.raises(ConfigException):
+            server.reload()
+        assert client.generation == 2
+        assert client.get('service.port') == 8080
+        client.close()
+
+    def test_max_responses(self, directory):
+        self.write(directory, 'app.conf', 'a { ' + ', '.join('k{0} = {0}'.format(index) for index in range(10)) + ' }')
+        server = ConfigServer(os.path.join(directory, 'app.conf'), os.path.join(directory, 'sock'), max_responses=3)
+        server.reload()
+        for index in range(10):
+            server.respond('get a.k{0}'.format(index))
+        server.respond('get a.k7')
+        server.respond('get a.missing')
+        responses = server._state[2]
+        assert list(responses) == ['a.k8', 'a.k9', 'a.k7']
+        assert server.respond('get a.k8') is responses['a.k8']
+
+    def test_concurrent_clients(self, server):
+        results = []
+
+        def query():
+            with ConfigClient(server.socket_path) as client:
+                results.append([client.get_int('service.port') for _ in range(50)])
+
+        threads = [threading.Thread(target=query) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [[8080] * 50] * 8
+
+    def test_client_reconnects(self, server):
+        client = ConfigClient(server.socket_path)
+        assert client.get('service.port') == 8080
+        server.shutdown()
+        assert not os.path.exists(server.socket_path)
+        server.start()
+        assert client.get('service.port') == 8080
+        client.close()
+
+    def test_stale_socket(self, server, directory):
+        with pytest.raises(ConfigException):
+            ConfigServer(server.input_file, server.socket_path).start()
+        server.shutdown()
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(server.socket_path)
+        stale.close()
+        server.start()
+        assert ConfigClient(server.socket_path).get('service.name') == 'api'
+
+    def test_get_values(self, server):
+        assert get_values(None, ['service.port', 'service'], server.socket_path) == [
+            8080, {'name': 'api', 'port': 8080, 'hosts': ['a', 'b']}]
@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import pytest
+from pyhocon import ConfigFactory, HOCONConverter, SharedConfig, SharedConfigPublisher
+from pyhocon.exceptions import ConfigException, ConfigMissingException, ConfigReadOnlyException
+
+
+def read_shared_config(path, queue):
+    config = SharedConfig(path)
+    queue.put((config.generation, config.get_int('a.b')))
+
+
+class TestSharedConfig(object):
+
+    @pytest.fixture
+    def path(self):
+        directory = tempfile.mkdtemp()
+        yield os.path.join(directory, 'config.snapshot')
+        shutil.rmtree(directory)
+
+    def test_publish_and_attach(self, path):
+        publisher = SharedConfigPublisher(path)
+        assert publisher.generation == 0
+        assert publisher.publish(ConfigFactory.parse_string('a {b: 1, c: [1, 2]}')) == 1
+
+        config = SharedConfig(path)
+        assert config.generation == 1
+        assert config.get_int('a.b') == 1
+        assert config['a.c'] == [1, 2]
+        assert 'a.b' in config
+        assert list(config) == ['a']
+        assert config.materialize() == {'a': {'b': 1, 'c': [1, 2]}}
+        with pytest.raises(ConfigMissingException):
+            config.get('a.d')
+        with pytest.raises(ConfigReadOnlyException):
+            config.snapshot().put('a.b', 2)
+        assert not config.refresh()
+
+    def test_config_tree_api(self, path):
+        source = ConfigFactory.parse_string('a {b: 1, c: [1, 2]}\n"d.e" = x')
+        SharedConfigPublisher(path).publish(source)
+        config = SharedConfig(path)
+        for output_format in ['json', 'hocon', 'yaml', 'properties']:
+            assert HOCONConverter.convert(config, output_format) == HOCONConverter.convert(source, output_format)
+        assert HOCONConverter.to_json(config) == HOCONConverter.to_json(source)
+        assert config.as_plain_ordered_dict() == source.as_plain_ordered_dict()
+        merged = ConfigFactory.parse_string('a.b = 2\nf = ${a.c}', resolve=False).with_fallback(config)
+        assert merged.as_plain_ordered_dict() == {'a': {'b': 2, 'c': [1, 2]}, 'd.e': 'x', 'f': [1, 2]}
+        assert config.with_fallback(ConfigFactory.parse_string('g = 3'))['g'] == 3
+
+    @pytest.mark.skipif(os.name != 'posix', reason='POSIX permissions')
+    def test_permissions(self, path):
+        umask = os.umask(0o022)
+        try:
+            SharedConfigPublisher(path).publish(ConfigFactory.parse_string('a = 1'))
+            assert os.stat(path).st_mode & 0o777 == 0o644
+            SharedConfigPublisher(path, mode=0o640).publish(ConfigFactory.parse_string('a = 2'))
+            assert os.stat(path).st_mode & 0o777 == 0o640
+        finally:
+            os.umask(umask)
+        assert os.listdir(os.path.dirname(path)) == ['config.snapshot']
+
+    def test_new_generation(self, path):
+        publisher = SharedConfigPublisher(path)
+        publisher.publish(ConfigFactory.parse_string('a.b = 1'))
+        config = SharedConfig(path)
+        old_snapshot = config.snapshot()
+
+        assert publisher.publish(ConfigFactory.parse_string('a.b = 2')) == 2
+        assert config.get_int('a.b') == 1
+        assert config.refresh()
+        assert config.generation == 2
+        assert config.get_int('a.b') == 2
+        # configs taken before the refresh are still readable
+        assert old_snapshot.get_int('a.b') == 1
+        assert os.listdir(os.path.dirname(path)) == ['config.snapshot']
+
+    def test_generation_survives_publisher_restart(self, path):
+        SharedConfigPublisher(path).publish(ConfigFactory.parse_string('a.b = 1'))
+        publisher = SharedConfigPublisher(path)
+        assert publisher.generation == 1
+        assert publisher.publish(ConfigFactory.parse_string('a.b = 2')) == 2
+
+    def test_publish_invalid_config(self, path):
+        publisher = SharedConfigPublisher(path)
+        with pytest.raises(ConfigException):
+            publisher.publish([1, 2])
+        with pytest.raises(ConfigException):
+            publisher.publish(ConfigFactory.parse_string('a = ${b}, b = 1', resolve=False))
+        assert os.listdir(os.path.dirname(path)) == []
+
+    def test_missing_file(self, path):
+        with pytest.raises(OSError):
+            SharedConfig(path)
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_worker_processes(self, path):
+        publisher = SharedConfigPublisher(path)
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        for value in [1, 2]:
+            publisher.publish(ConfigFactory.parse_string('a.b = {value}'.format(value=value)))
+            workers = [context.Process(target=read_shared_config, args=(path, queue)) for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            results = [queue.get(timeout=30) for _ in workers]
+            for worker in workers:
+                worker.join()
+            assert results == [(value, value)] * len(workers)
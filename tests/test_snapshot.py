@@ -0,0 +1,159 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from pyhocon import ConfigFactory, ConfigTree
+from pyhocon.converter import HOCONConverter
+from pyhocon.exceptions import (ConfigException, ConfigMissingException, ConfigReadOnlyException,
+                                ConfigWrongTypeException)
+from pyhocon.snapshot import SnapshotTree, decode_snapshot
+
+
+class TestSnapshot(object):
+    CONFIG_STRING = u"""
+        a = {b: 1, c: [1, {d: "x"}, [2, 3]]}
+        e = "héllo"
+        f = 1.5
+        g = true
+        h = false
+        i = null
+        j = 123456789012345678901234567890
+        k = 10 ms
+        "l.m" = 2
+        n = {}
+        o = []
+        p = ${a.b}
+    """
+
+    @pytest.fixture
+    def snapshot_file(self):
+        with tempfile.NamedTemporaryFile('wb', delete=False) as fd:
+            pass
+        HOCONConverter.to_snapshot(ConfigFactory.parse_string(self.CONFIG_STRING), fd.name)
+        yield fd.name
+        os.remove(fd.name)
+
+    def test_load(self, snapshot_file):
+        config = ConfigFactory.load_snapshot(snapshot_file)
+        assert isinstance(config, SnapshotTree)
+        assert config.root
+        assert list(config) == ['a', 'e', 'f', 'g', 'h', 'i', 'j', 'k', '"l.m"', 'n', 'o', 'p']
+        assert config.get_int('a.b') == 1
+        assert config['a.c'][1]['d'] == 'x'
+        assert config.get_list('a.c')[2] == [2, 3]
+        assert config.get_string('e') == u'héllo'
+        assert config.get_float('f') == 1.5
+        assert config.get_bool('g') is True
+        assert config.get_bool('h') is False
+        assert config.get('i') is None
+        assert config.get_int('j') == 123456789012345678901234567890
+        assert config.get('k') == timedelta(milliseconds=10)
+        assert config.get_int('"l.m"') == 2
+        assert len(config.get_config('n')) == 0
+        assert config.get_list('o') == []
+        assert config.get_int('p') == 1
+        assert 'a.b' in config
+        assert 'a.z' not in config
+
+    def test_materialize(self, snapshot_file):
+        expected = ConfigFactory.parse_string(self.CONFIG_STRING)
+        config = ConfigFactory.load_snapshot(snapshot_file).materialize()
+        assert isinstance(config, ConfigTree)
+        assert config.root
+        assert config.as_dict() == expected.as_dict()
+        assert HOCONConverter.to_hocon(config) == HOCONConverter.to_hocon(expected)
+
+    def test_convert(self, snapshot_file):
+        expected = ConfigFactory.parse_string(self.CONFIG_STRING)
+        config = ConfigFactory.load_snapshot(snapshot_file)
+        for output_format in ['json', 'hocon', 'yaml', 'properties']:
+            assert HOCONConverter.convert(config, output_format) == HOCONConverter.convert(expected, output_format)
+        assert HOCONConverter.to_json(config) == HOCONConverter.to_json(expected)
+        assert HOCONConverter.to_properties(config) == HOCONConverter.to_properties(expected)
+
+    def test_with_fallback(self, snapshot_file):
+        snapshot = ConfigFactory.load_snapshot(snapshot_file)
+        config = ConfigFactory.parse_string('a.b = 2\nq = ${a.b}').with_fallback(snapshot)
+        assert config.get_int('a.b') == 2
+        assert config.get_int('q') == 2
+        assert config['a.c'][1]['d'] == 'x'
+        assert config.get_string('e') == u'héllo'
+        assert ConfigFactory.parse_string('e = x').with_fallback(snapshot, persistent=True)['f'] == 1.5
+
+    def test_lazy_decoding(self, snapshot_file):
+        config = ConfigFactory.load_snapshot(snapshot_file)
+        assert config._entries is None
+        config.get('e')
+        assert list(config._values) == ['e']
+        assert config.get_config('a')._entries is None
+
+    def test_missing_and_wrong_type(self, snapshot_file):
+        config = ConfigFactory.load_snapshot(snapshot_file)
+        with pytest.raises(ConfigMissingException):
+            config.get('a.z')
+        with pytest.raises(ConfigWrongTypeException):
+            config.get('e.z')
+        assert config.get('a.z', 5) == 5
+        assert config.get('e.z', None) is None
+
+    def test_read_only(self, snapshot_file):
+        config = ConfigFactory.load_snapshot(snapshot_file)
+        with pytest.raises(ConfigReadOnlyException):
+            config.put('a.b', 2)
+        with pytest.raises(ConfigReadOnlyException):
+            config['x'] = 2
+        with pytest.raises(ConfigReadOnlyException):
+            del config['a']
+        with pytest.raises(ConfigReadOnlyException):
+            config.pop('a')
+        # returned lists are copies
+        config.get_list('a.c').append(4)
+        assert len(config.get_list('a.c')) == 3
+
+    def test_file_object_and_top_level_values(self):
+        for value in [ConfigFactory.parse_string('[1, {a: 2}]'), ConfigFactory.parse_string('{}')]:
+            output = BytesIO()
+            HOCONConverter.to_snapshot(value, output)
+            decoded = decode_snapshot(output.getvalue())
+            if isinstance(value, ConfigTree):
+                assert len(decoded) == 0
+            else:
+                assert decoded[0] == 1
+                assert decoded[1]['a'] == 2
+
+    def test_deep_config(self):
+        depth = 5000
+        config = root = ConfigTree()
+        for _ in range(depth):
+            config['a'] = ConfigTree()
+            config = config['a']
+        config['b'] = 1
+
+        output = BytesIO()
+        HOCONConverter.to_snapshot(root, output)
+        decoded = decode_snapshot(output.getvalue())
+        assert decoded.get_int('.'.join(['a'] * depth + ['b'])) == 1
+        config = decoded.materialize()
+        for _ in range(depth):
+            config = config['a']
+        assert config['b'] == 1
+
+    def test_unresolved_config(self):
+        config = ConfigFactory.parse_string('a = ${b}, b = 1', resolve=False)
+        with pytest.raises(ConfigException):
+            HOCONConverter.to_snapshot(config, BytesIO())
+
+    def test_invalid_snapshot(self):
+        with pytest.raises(ConfigException):
+            decode_snapshot(b'')
+        with pytest.raises(ConfigException):
+            decode_snapshot(b'NOTASNAP' + b'\0' * 16)
+
+        output = BytesIO()
+        HOCONConverter.to_snapshot(ConfigFactory.parse_string('a = 1'), output)
+        data = bytearray(output.getvalue())
+        data[8] = 99
+        with pytest.raises(ConfigException):
+            decode_snapshot(bytes(data))
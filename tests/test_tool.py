@@ -1,8 +1,18 @@
+import json
 import os
+import shutil
 import tempfile
+
+try:
+    from StringIO import StringIO
+except ImportError:  # pragma: no cover
+    from io import StringIO
+
 import pytest
-from pyhocon import ConfigFactory
+from pyhocon import ConfigFactory, ConfigTree
 from pyhocon.converter import HOCONConverter
+from pyhocon.tool import ConfigWatcher, batch_convert, expand_inputs, format_value, get_values
+from pyhocon.tracing import CollectingTracer, tracing
 
 
 class TestHOCONConverter(object):
@@ -182,6 +192,34 @@ class TestHOCONConverter(object):
         with pytest.raises(Exception):
             self._test_convert_from_file(TestHOCONConverter.CONFIG_STRING, TestHOCONConverter.EXPECTED_PROPERTIES, 'invalid')
 
+    def test_convert_from_file_error(self, tmpdir, monkeypatch):
+        input_file = str(tmpdir.join('app.conf'))
+        output_file = str(tmpdir.join('app.yaml'))
+        with open(input_file, 'w') as fd:
+            fd.write('a = 1')
+        with open(output_file, 'w') as fd:
+            fd.write('previous')
+
+        def failing_iter_yaml(config, compact=False, indent=2, level=0):
+            yield 'a: '
+            raise ValueError('conversion failed')
+
+        monkeypatch.setattr(HOCONConverter, 'iter_yaml', failing_iter_yaml)
+        with pytest.raises(ValueError):
+            HOCONConverter.convert_from_file(input_file, output_file, 'yaml')
+        # the output file is left untouched and the temporary file is removed
+        with open(output_file) as fd:
+            assert fd.read() == 'previous'
+        assert sorted(os.listdir(str(tmpdir))) == ['app.conf', 'app.yaml']
+
+        monkeypatch.undo()
+        os.chmod(output_file, 0o640)
+        HOCONConverter.convert_from_file(input_file, output_file, 'yaml')
+        with open(output_file) as fd:
+            assert fd.read() == 'a: 1'
+        assert os.stat(output_file).st_mode & 0o777 == 0o640
+        assert sorted(os.listdir(str(tmpdir))) == ['app.conf', 'app.yaml']
+
 
 def test_substitutions_conversions():
     config_string = """
@@ -203,3 +241,254 @@ def test_substitutions_conversions():
     line1_tokens = [line.strip() for line in converted1.split('\n') if line.strip()]
     line2_tokens = [line.strip() for line in converted2.split('\n') if line.strip()]
     assert line1_tokens == line2_tokens
+
+
+class TestHOCONConverterStreaming(object):
+    CONFIG_STRING = TestHOCONConverter.CONFIG_STRING + u"""
+            j = [{a: 1, b: [1, [2, {c: {}}]]}, [], {}, null]
+            k.l.m = "multi\\nline"
+            n = 10 ms
+        """
+
+    def configs(self):
+        return [
+            ConfigFactory.parse_string(self.CONFIG_STRING),
+            ConfigFactory.parse_string(u"""
+                a = ${b} {c: 1}
+                b = {d: [1, 2]}
+                e = ${?b.d} [3] "x"
+            """, resolve=False),
+            ConfigFactory.parse_string('{}'),
+            ConfigFactory.parse_string('[1, [2, {a: 3}]]'),
+        ]
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_iter_same_as_to(self, compact):
+        for config in self.configs():
+            for indent in [2, 4]:
+                assert ''.join(HOCONConverter.iter_hocon(config, compact, indent)) == \
+                    HOCONConverter.to_hocon(config, compact, indent)
+                assert ''.join(HOCONConverter.iter_json(config, compact, indent)) == \
+                    HOCONConverter.to_json(config, compact, indent)
+                assert ''.join(HOCONConverter.iter_yaml(config, compact, indent)) == \
+                    HOCONConverter.to_yaml(config, compact, indent)
+                output = StringIO()
+                HOCONConverter.write(config, output, 'properties', indent, compact)
+                assert output.getvalue() == HOCONConverter.to_properties(config, compact, indent)
+
+    def test_write_deep_config(self):
+        depth = 5000
+        config = root = ConfigTree()
+        for _ in range(depth):
+            config['a'] = ConfigTree()
+            config = config['a']
+        config['b'] = [1]
+
+        for output_format in ['json', 'hocon', 'yaml', 'properties']:
+            output = StringIO()
+            HOCONConverter.write(root, output, output_format)
+            assert output.getvalue().count('a') == depth
+
+    def test_iter_properties(self):
+        config = ConfigFactory.parse_string(u"""
+            a {b: 1, "c.d": "x=y"}
+            e = [true, null, {f: [], g: {}}, 2.5]
+            h = null
+            i = 10 ms
+        """)
+        assert list(HOCONConverter.iter_properties(config)) == [
+            ('a.b', '1'),
+            ('a.c.d', 'x\\=y'),
+            ('e.0', 'true'),
+            ('e.3', '2.5'),
+            ('i', '10'),
+        ]
+        assert list(HOCONConverter.iter_properties(ConfigFactory.parse_string('{}'))) == []
+
+
+class TestBatchConvert(object):
+
+    @pytest.fixture
+    def tmpdir(self):
+        directory = tempfile.mkdtemp()
+        yield directory
+        shutil.rmtree(directory)
+
+    def write(self, path, content):
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as fd:
+            fd.write(content)
+
+    def test_expand_inputs(self, tmpdir):
+        for name in ['a.conf', 'sub/b.conf', 'sub/deeper/c.conf', 'sub/d.txt']:
+            self.write(os.path.join(tmpdir, name), 'x = 1')
+        manifest = os.path.join(tmpdir, 'manifest.txt')
+        self.write(manifest, '# services\n\nsub/*.conf\nmissing.conf\n')
+
+        assert expand_inputs([os.path.join(tmpdir, '**', '*.conf')]) == [
+            os.path.join(tmpdir, name) for name in ['a.conf', 'sub/b.conf', 'sub/deeper/c.conf']]
+        assert expand_inputs([os.path.join(tmpdir, 'sub', 'b.conf')], manifest) == [
+            os.path.join(tmpdir, 'sub', 'b.conf'), os.path.join(tmpdir, 'missing.conf')]
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_batch_convert(self, tmpdir, jobs):
+        self.write(os.path.join(tmpdir, 'in', 'a.conf'), 'a = 1')
+        self.write(os.path.join(tmpdir, 'in', 'sub', 'b.conf'), 'include "../a.conf"\nb = ${a}')
+        self.write(os.path.join(tmpdir, 'in', 'sub', 'bad.conf'), 'c = ${missing}')
+        inputs = expand_inputs([os.path.join(tmpdir, 'in', '**', '*.conf')]) + [os.path.join(tmpdir, 'in', 'none.conf')]
+        output_dir = os.path.join(tmpdir, 'out')
+
+        results = batch_convert(inputs, output_dir, 'properties', jobs=jobs)
+        assert [(os.path.relpath(output_file, output_dir), error is None) for _, output_file, error in results] == [
+            ('a.properties', True),
+            (os.path.join('sub', 'b.properties'), True),
+            (os.path.join('sub', 'bad.properties'), False),
+            ('none.properties', False),
+        ]
+        assert 'ConfigSubstitutionException' in results[2][2]
+        with open(os.path.join(output_dir, 'sub', 'b.properties')) as fd:
+            assert fd.read() == 'a = 1\nb = 1'
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_batch_convert_colliding_outputs(self, tmpdir, jobs):
+        self.write(os.path.join(tmpdir, 'in', 'a.conf'), 'a = 1')
+        self.write(os.path.join(tmpdir, 'in', 'a.json'), '{"a": 2}')
+        self.write(os.path.join(tmpdir, 'in', 'b.conf'), 'b = 1')
+        self.write(os.path.join(tmpdir, 'in', 'c.conf'), 'c = 1')
+        inputs = [os.path.join(tmpdir, 'in', name) for name in ['a.conf', 'b.conf', 'a.json', 'c.conf']]
+        output_dir = os.path.join(tmpdir, 'out')
+
+        results = batch_convert(inputs, output_dir, 'json', jobs=jobs)
+        assert [input_file for input_file, _, _ in results] == inputs
+        assert [error is None for _, _, error in results] == [False, True, False, True]
+        assert inputs[2] in results[0][2]
+        assert inputs[0] in results[2][2]
+        assert sorted(os.listdir(output_dir)) == ['b.json', 'c.json']
+
+    def test_invalid_format(self, tmpdir):
+        with pytest.raises(Exception):
+            batch_convert([], tmpdir, 'xml')
+
+
+class TestConfigWatcher(object):
+
+    @pytest.fixture
+    def tmpdir(self):
+        directory = tempfile.mkdtemp()
+        yield directory
+        shutil.rmtree(directory)
+
+    def write(self, path, content, mtime):
+        with open(path, 'w') as fd:
+            fd.write(content)
+        os.utime(path, (mtime, mtime))
+
+    def test_poll(self, tmpdir):
+        main_file = os.path.join(tmpdir, 'app.conf')
+        include_file = os.path.join(tmpdir, 'common.conf')
+        output_file = os.path.join(tmpdir, 'app.json')
+        self.write(include_file, 'a = 1', 1000)
+        self.write(main_file, 'include "common.conf"\nb = ${a}', 1000)
+
+        watcher = ConfigWatcher(main_file, output_file, 'hocon')
+        assert watcher.poll()
+        assert watcher.files == [main_file, include_file]
+        with open(output_file) as fd:
+            assert fd.read() == 'a = 1\nb = 1'
+
+        # nothing changed
+        assert not watcher.poll()
+
+        # included file changed
+        self.write(include_file, 'a = 2', 2000)
+        assert watcher.poll()
+        with open(output_file) as fd:
+            assert fd.read() == 'a = 2\nb = 2'
+
+        # changed but same output
+        self.write(main_file, 'include "common.conf"\nb = ${a} // comment', 3000)
+        assert not watcher.poll()
+        assert not watcher.changed()
+
+        # errors are raised and the file is converted again once fixed
+        self.write(main_file, 'b = ${missing}', 4000)
+        with pytest.raises(Exception):
+            watcher.poll()
+        assert not watcher.changed()
+        self.write(main_file, 'b = 3', 5000)
+        assert watcher.poll()
+        assert watcher.files == [main_file]
+        with open(output_file) as fd:
+            assert fd.read() == 'b = 3'
+
+    def test_poll_replaces_output(self, tmpdir):
+        main_file = os.path.join(tmpdir, 'app.conf')
+        output_file = os.path.join(tmpdir, 'app.json')
+        self.write(main_file, 'a = 1', 1000)
+        watcher = ConfigWatcher(main_file, output_file, 'hocon')
+        assert watcher.poll()
+        os.chmod(output_file, 0o640)
+
+        # the output is written to a temporary file renamed over the previous output, which is never truncated
+        self.write(main_file, 'a = 2', 2000)
+        with open(output_file) as previous:
+            assert watcher.poll()
+            assert previous.read() == 'a = 1'
+        with open(output_file) as fd:
+            assert fd.read() == 'a = 2'
+        assert os.stat(output_file).st_mode & 0o777 == 0o640
+        assert sorted(os.listdir(tmpdir)) == ['app.conf', 'app.json']
+
+    def test_poll_reuses_unchanged_includes(self, tmpdir):
+        main_file = os.path.join(tmpdir, 'app.conf')
+        paths = dict((name, os.path.join(tmpdir, name + '.conf')) for name in 'abc')
+        self.write(paths['a'], 'a = 1\nx = [1]', 1000)
+        self.write(paths['b'], 'include "c.conf"\nb = ${c}', 1000)
+        self.write(paths['c'], 'c = 1', 1000)
+        self.write(main_file, 'include "a.conf"\ninclude "b.conf"\nx += [2]', 1000)
+
+        def poll():
+            with tracing(CollectingTracer()) as tracer:
+                watcher.poll()
+            return sorted(os.path.basename(span.attributes['path']) for span in tracer.spans if span.phase == 'read')
+
+        watcher = ConfigWatcher(main_file, None, 'json')
+        assert poll() == ['a.conf', 'app.conf', 'b.conf', 'c.conf']
+        assert watcher.files == sorted([main_file] + list(paths.values()))
+
+        self.write(paths['c'], 'c = 2', 2000)
+        assert poll() == ['app.conf', 'b.conf', 'c.conf']
+        assert watcher._output == HOCONConverter.convert(ConfigFactory.parse_file(main_file), 'json')
+        assert '"b": 2' in watcher._output
+        assert watcher.files == sorted([main_file] + list(paths.values()))
+
+        # reused configs are copies: the including config is merged with them
+        self.write(main_file, 'include "a.conf"\ninclude "b.conf"\nx += [3]', 3000)
+        assert poll() == ['app.conf']
+        assert json.loads(watcher._output)['x'] == [1, 3]
+
+        self.write(main_file, 'include "a.conf"', 4000)
+        assert poll() == ['app.conf']
+        assert sorted(watcher._fragments) == [paths['a']]
+
+
+class TestGet(object):
+
+    def test_get_values(self, tmpdir):
+        config_file = tmpdir.join('app.conf')
+        config_file.write('service {name = api, port = ${port}}\nport = 8080\nbroken = ${missing}')
+        assert get_values(str(config_file), ['service.port', 'service']) == [8080, {'name': 'api', 'port': 8080}]
+
+    def test_format_value(self):
+        config = ConfigFactory.parse_string('a {b = "it\'s", c = [1, null]}, d = true, e = 10 minutes, f = null')
+        assert format_value('a.b', config['a.b']) == "it's"
+        assert format_value('a', config['a']) == '{"b": "it\'s", "c": [1, null]}'
+        assert format_value('d', config['d']) == 'true'
+        assert format_value('e', config['e']) == '10 minutes'
+        assert format_value('f', config['f']) == 'null'
+        assert format_value('a.b', config['a.b'], 'json') == '"it\'s"'
+        assert format_value('e', config['e'], 'json') == '600000'
+        assert format_value('a.b', config['a.b'], 'shell') == "export A_B='it'\\''s'"
+        assert format_value('a."b-c".1', 'x', 'shell') == "export A_B_C_1='x'"
+        assert format_value('1a', 2, 'shell') == "export _1A='2'"
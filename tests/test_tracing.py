@@ -0,0 +1,154 @@
+import threading
+
+import pytest
+
+from pyhocon import ConfigFactory, HOCONConverter
+from pyhocon.exceptions import ConfigSubstitutionException
+from pyhocon.tracing import CollectingTracer, OpenTelemetryTracer, Tracer, get_tracer, set_tracer, span, tracing
+
+
+class RecordingTracer(Tracer):
+
+    def __init__(self):
+        self.events = []
+
+    def begin(self, phase, attributes):
+        self.events.append(('begin', phase))
+
+    def end(self, phase, attributes, error=None):
+        self.events.append(('end', phase, None if error is None else type(error).__name__))
+
+
+class TestTracing(object):
+
+    def test_no_tracer(self):
+        assert type(get_tracer()) is Tracer
+        with span('parse', size=1) as attributes:
+            assert attributes is None
+
+    def test_phases(self, tmpdir):
+        tmpdir.join('included.conf').write('b = 2')
+        tmpdir.join('main.conf').write('include "included.conf"\na = ${b}')
+        with tracing(RecordingTracer()) as tracer:
+            config = ConfigFactory.parse_file(str(tmpdir.join('main.conf')))
+            HOCONConverter.convert(config, 'json')
+        assert type(get_tracer()) is Tracer
+        assert tracer.events == [
+            ('begin', 'parse_file'),
+            ('begin', 'read'), ('end', 'read', None),
+            ('begin', 'parse'),
+            ('begin', 'include'),
+            ('begin', 'parse_file'),
+            ('begin', 'read'), ('end', 'read', None),
+            ('begin', 'parse'), ('end', 'parse', None),
+            ('end', 'parse_file', None),
+            ('end', 'include', None),
+            ('end', 'parse', None),
+            ('begin', 'resolve'),
+            ('begin', 'fixup'), ('end', 'fixup', None),
+            ('begin', 'fixup'), ('end', 'fixup', None),
+            ('end', 'resolve', None),
+            ('end', 'parse_file', None),
+            ('begin', 'convert'), ('end', 'convert', None),
+        ]
+
+    def test_error(self):
+        tracer = RecordingTracer()
+        previous = set_tracer(tracer)
+        try:
+            with pytest.raises(ConfigSubstitutionException):
+                ConfigFactory.parse_string('a = ${missing}')
+        finally:
+            set_tracer(previous)
+        assert tracer.events[-1] == ('end', 'resolve', 'ConfigSubstitutionException')
+
+
+class TestCollectingTracer(object):
+
+    def test_attributes(self, tmpdir):
+        tmpdir.join('a.conf').write('a = 1')
+        tmpdir.join('b.conf').write('b = 2')
+        tmpdir.join('main.conf').write('include required(file("{pattern}"))\nc = ${{a}}\nd = ${{?e}}'.format(
+            pattern=tmpdir.join('*.conf')))
+        tmpdir.join('main.conf').rename(tmpdir.mkdir('main').join('main.conf'))
+        with tracing(CollectingTracer()) as tracer:
+            config = ConfigFactory.parse_file(str(tmpdir.join('main', 'main.conf')))
+            HOCONConverter.convert(config, 'json')
+
+        root, convert = tracer.roots()
+        assert root.phase == 'parse_file'
+        assert root.attributes['keys'] == 3
+        assert root.duration >= 0
+        assert [child.phase for child in root.children] == ['read', 'parse', 'resolve']
+        read, parse, resolve = root.children
+        assert read.attributes['bytes'] == len(tmpdir.join('main', 'main.conf').read())
+        assert parse.attributes['length'] == read.attributes['bytes']
+        assert resolve.attributes == {'substitutions': 2}
+
+        include, = parse.children
+        assert include.attributes == {'pattern': str(tmpdir.join('*.conf')), 'files': 2, 'keys': 2}
+        assert [child.attributes['keys'] for child in include.children] == [1, 1]
+        assert all(child.children[0].phase == 'parse_file' for child in include.children)
+
+        assert convert.attributes == {'format': 'json', 'length': len(HOCONConverter.convert(config, 'json'))}
+
+        totals = tracer.totals()
+        assert totals['parse_file'][0] == 3
+        assert totals['parse'][0] == 3
+        assert totals['parse_file'][1] == root.duration
+        assert tracer.format().startswith('parse_file ')
+        assert '\n    include ' in tracer.format()
+
+    def test_error(self):
+        with tracing(CollectingTracer()) as tracer:
+            with pytest.raises(ConfigSubstitutionException):
+                ConfigFactory.parse_string('a = ${b}\nb = ${a}')
+        parse, resolve = tracer.roots()
+        assert resolve.attributes == {'substitutions': 2, 'unresolved': 2}
+        assert isinstance(resolve.error, ConfigSubstitutionException)
+        assert tracer.format().splitlines()[1].endswith('error=ConfigSubstitutionException')
+
+    def test_threads(self):
+        def parse():
+            ConfigFactory.parse_string('a = 1')
+
+        with tracing(CollectingTracer()) as tracer:
+            threads = [threading.Thread(target=parse) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        # the phases of the threads are interleaved, each thread parses then resolves
+        phases = {}
+        for collected in tracer.roots():
+            phases.setdefault(collected.thread, []).append(collected.phase)
+        assert list(phases.values()) == [['parse', 'resolve']] * 4
+
+
+class TestOpenTelemetryTracer(object):
+
+    def test_spans(self, tmpdir):
+        sdk_trace = pytest.importorskip('opentelemetry.sdk.trace')
+        export = pytest.importorskip('opentelemetry.sdk.trace.export')
+        in_memory = pytest.importorskip('opentelemetry.sdk.trace.export.in_memory_span_exporter')
+
+        exporter = in_memory.InMemorySpanExporter()
+        provider = sdk_trace.TracerProvider()
+        provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+        tmpdir.join('main.conf').write('a = 1\nb = ${a}')
+        with tracing(OpenTelemetryTracer(provider.get_tracer('test'))):
+            ConfigFactory.parse_file(str(tmpdir.join('main.conf')))
+            with pytest.raises(ConfigSubstitutionException):
+                ConfigFactory.parse_string('a = ${missing}')
+
+        spans = dict((otel_span.name, otel_span) for otel_span in exporter.get_finished_spans()
+                     if otel_span.name != 'pyhocon.resolve' or otel_span.status.is_ok)
+        parse_file = spans['pyhocon.parse_file']
+        assert parse_file.parent is None
+        assert dict(parse_file.attributes) == {'pyhocon.path': str(tmpdir.join('main.conf')), 'pyhocon.keys': 2}
+        assert spans['pyhocon.read'].parent.span_id == parse_file.context.span_id
+        assert spans['pyhocon.resolve'].attributes['pyhocon.substitutions'] == 1
+
+        failed = [otel_span for otel_span in exporter.get_finished_spans() if not otel_span.status.is_ok]
+        assert [otel_span.name for otel_span in failed] == ['pyhocon.resolve']
+        assert failed[0].events[0].name == 'exception'